@@ -0,0 +1,562 @@
+"""
+Benchmarks for generate_uvm_tb.py.
+Usage: python benchmark_uvm_tb.py <benchmark> [options]
+Run with -h for the list of benchmarks.
+"""
+import sys
+import os
+import re
+import time
+import timeit
+import argparse
+import importlib.util
+import tempfile
+import subprocess
+import json
+import random
+import shutil
+import platform
+import resource
+
+import generate_uvm_tb as uvm
+
+def legacy_design_scan(filename):
+    """
+    The regex based design_scan of the previous releases. Kept as the reference for the parser benchmark.
+    parameters:
+    filename: The sv design file.
+    """
+    with open(filename, 'r') as file:
+        sv_file = file.read()
+    module_name = re.search(r'\bmodule\s+(\w+)', sv_file).group(1)
+    module_ports = re.findall(r'\b(input|output|inout)\s+(?:reg\s+|logic\s+|wire\s+)?(\[[^]]*\])?\s*(\w+);', sv_file)
+    port_lst = []
+    for direction, width, name in module_ports:
+        port_lst.append((direction, width, name))
+    interface_name_match = re.search(r'\binterface\s+(\w+)', sv_file)
+    interface_name = interface_name_match.group(1) if interface_name_match else None
+    return module_name, port_lst, interface_name
+
+def sample_style_design(n_ports, width=4):
+    """
+    Function to return a design in the style of sample_design.sv (non-ANSI ports, one declaration per line) with n_ports ports.
+    parameters:
+    n_ports: The number of ports.
+    width: The width of every port.
+    """
+    names = [f"p{i}" for i in range(n_ports)]
+    lines = [f"module dut({', '.join(names)});", ""]
+    for i, name in enumerate(names):
+        direction = "output" if i == n_ports - 1 else "input"
+        lines.append(f"    {direction} [{width - 1}:0] {name};")
+    lines += ["", "    assign p0 = p1;", "endmodule", "", "/" * 62, "interface dut_if();"]
+    lines += [f"    logic [{width - 1}:0] {name};" for name in names]
+    lines.append("endinterface")
+    return "\n".join(lines) + "\n"
+
+def best_of(funcs, arg, repeat):
+    """
+    Function to return the best wall time in seconds of a call of every func(arg).
+    The samples of the functions are interleaved so load changes on the machine hit all of them alike.
+    Every sample loops the call for about 0.2 s, so tiny inputs are not dominated by timer noise.
+    parameters:
+    funcs: The functions to time.
+    arg: The argument of the functions.
+    repeat: The number of samples per function.
+    """
+    timers = [timeit.Timer(lambda func=func: func(arg)) for func in funcs]
+    numbers = [timer.autorange()[0] for timer in timers]
+    best = [float("inf")] * len(funcs)
+    for _ in range(repeat):
+        for i, timer in enumerate(timers):
+            best[i] = min(best[i], timer.timeit(numbers[i]) / numbers[i])
+    return best
+
+def bench_parse(args):
+    """
+    Benchmark of design_scan against the legacy regex scan on sample_design.sv style inputs.
+    Fails if the single pass parser is slower than the regex path by more than the tolerance or returns something else.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    cases = [("sample_design.sv", os.path.join(here, "sample_design.sv"))]
+    slower = False
+    # The synthetic designs are removed with their directory when the benchmark is done
+    with tempfile.TemporaryDirectory(prefix="uvmgen_bench_") as tmp_dir:
+        for n_ports in args.ports:
+            path = os.path.join(tmp_dir, f"dut_{n_ports}.sv")
+            with open(path, 'w') as file:
+                file.write(sample_style_design(n_ports))
+            cases.append((f"{n_ports} ports ({os.path.getsize(path)} bytes)", path))
+
+        print(f"{'input':<32} {'legacy regex':>14} {'design_scan':>14} {'speedup':>8}")
+        for label, path in cases:
+            if legacy_design_scan(path) != uvm.design_scan(path):
+                print(f"{label}: design_scan and the legacy regex scan disagree")
+                slower = True
+            legacy, current = best_of([legacy_design_scan, uvm.design_scan], path, args.repeat)
+            print(f"{label:<32} {legacy * 1e6:>12.1f}us {current * 1e6:>12.1f}us {legacy / current:>7.2f}x")
+            if current > legacy * (1 + args.tolerance):
+                slower = True
+    return 1 if slower else 0
+
+def import_times(module):
+    """
+    Function to import a module in a fresh interpreter with -X importtime.
+    Returns a dict mapping every imported module to its cumulative import time in microseconds.
+    parameters:
+    module: The module to import.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=here, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        fields = line.split("|")
+        if len(fields) == 3 and fields[1].strip().isdigit():
+            times[fields[2].strip()] = int(fields[1])
+    return times
+
+def bench_import(args):
+    """
+    Benchmark of the import time of generate_uvm_tb.
+    Fails if a heavy reporting backend is imported at module import time. The import time is only reported against the budget:
+    it depends on the machine and on whether the bytecode of the module is cached, so it makes a flaky gate.
+    """
+    samples = [import_times("generate_uvm_tb") for _ in range(args.repeat)]
+    best = min(samples, key=lambda times: times.get("generate_uvm_tb", 0))
+    total = best.get("generate_uvm_tb", 0) / 1000
+    heavy = sorted(name for name in best if name.split(".")[0] in args.forbidden)
+
+    print(f"generate_uvm_tb import time: {total:.1f} ms (budget {args.max_ms:.1f} ms{', over budget' if total > args.max_ms else ''})")
+    slowest = sorted(best.items(), key=lambda item: item[1], reverse=True)[1:6]
+    for name, cumulative in slowest:
+        print(f"  {cumulative / 1000:>8.1f} ms  {name}")
+    if heavy:
+        print("Heavy modules imported at import time: " + ", ".join(heavy))
+    return 1 if heavy else 0
+
+def synthetic_ports(n_ports, width=8):
+    """
+    Function to return a port list of n_ports ports, three quarters of them inputs.
+    parameters:
+    n_ports: The number of ports.
+    width: The width of every port.
+    """
+    return [("output" if i % 4 == 3 else "input", f"[{width - 1}:0]", f"p{i}") for i in range(n_ports)]
+
+def measure_component(component, n_ports):
+    """
+    Function to render one component for a synthetic design and return its wall time and peak RSS.
+    Meant to run in a fresh process (see bench_ports) so the peak RSS belongs to this component alone.
+    parameters:
+    component: The component name, a key of COMPONENT_GENERATORS.
+    n_ports: The number of ports of the synthetic design.
+    """
+    design = {'module_name': "dut", 'port_lst': synthetic_ports(n_ports), 'design_type': "adder", 'interface_name': "dut_if"}
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    sv_file = uvm.COMPONENT_GENERATORS[component](design)
+    elapsed = time.perf_counter() - start
+    rss_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux
+    return {'component': component, 'ports': n_ports, 'seconds': elapsed, 'bytes': len(sv_file),
+            'peak_rss_kb': rss_peak, 'rss_growth_kb': rss_peak - rss_before}
+
+def bench_ports(args):
+    """
+    Benchmark of every component generator over a sweep of port counts.
+    Reports the wall time and the peak RSS of each (component, port count), each measured in a fresh process.
+    """
+    if args.child:
+        print(json.dumps(measure_component(args.child, args.ports[0])))
+        return 0
+
+    components = uvm.select_components(args.only)
+    print(f"{'component':<14} {'ports':>8} {'time':>12} {'output':>12} {'peak RSS':>10} {'RSS growth':>11}")
+    for component in components:
+        for n_ports in args.ports:
+            result = subprocess.run([sys.executable, os.path.abspath(__file__), "ports", "--child", component, "--ports", str(n_ports)],
+                                    capture_output=True, text=True, check=True)
+            r = json.loads(result.stdout)
+            print(f"{component:<14} {n_ports:>8} {r['seconds'] * 1e3:>10.2f}ms {r['bytes'] / 1e6:>10.2f}MB "
+                  f"{r['peak_rss_kb'] / 1024:>8.1f}MB {r['rss_growth_kb'] / 1024:>9.1f}MB")
+    return 0
+
+# The default corpus of the suite. Each case is a spec for synthesize_design.
+SUITE_CASES = {
+    'small': "modules=1,ports=16,width=8,comments=0.2,size=0",
+    'wide': "modules=1,ports=5000,width=32,comments=0.1,size=0",
+    'many_modules': "modules=200,ports=24,width=16,comments=0.2,size=0",
+    'commented': "modules=20,ports=64,width=8,comments=0.9,size=0",
+    'netlist': "modules=4,ports=256,width=1,comments=0.05,size=4000000",
+}
+
+def parse_case(spec):
+    """
+    Function to parse a corpus spec like "modules=4,ports=256,width=1,comments=0.05,size=4000000" into a dict.
+    Missing keys get their defaults.
+    parameters:
+    spec: The spec string.
+    """
+    case = {'modules': 1, 'ports': 16, 'width': 8, 'comments': 0.2, 'size': 0}
+    for item in spec.split(","):
+        key, _, value = item.partition("=")
+        if key.strip() not in case:
+            raise ValueError(f"Unknown corpus key {key!r} in {spec!r}")
+        case[key.strip()] = float(value) if key.strip() == "comments" else int(value)
+    return case
+
+def synthesize_design(modules=1, ports=16, width=8, comments=0.2, size=0, seed=0):
+    """
+    Function to return the source of a synthetic design file.
+    The modules alternate between ANSI and non-ANSI port styles, the first one also gets a matching interface.
+    parameters:
+    modules: The number of modules.
+    ports: The number of ports per module.
+    width: The width of the ports. Every fourth port is a single bit.
+    comments: The probability that a line is followed by a comment line.
+    size: Pads the module bodies with gate instances until the file has about this many bytes. 0 disables padding.
+    seed: Seed of the random comment placement.
+    """
+    rng = random.Random(seed)
+    lines = []
+    nbytes = 0
+
+    def emit(line):
+        nonlocal nbytes
+        lines.append(line)
+        nbytes += len(line) + 1
+        if rng.random() < comments:
+            comment = rng.choice(["    // input [7:0] not_a_port;", "    /* output wire ghost; */", "    // TODO: review timing"])
+            lines.append(comment)
+            nbytes += len(comment) + 1
+
+    def port(i):
+        direction = "output" if i % 4 == 3 else "input"
+        dims = "" if i % 4 == 2 or width == 1 else f"[{width - 1}:0] "
+        return direction, dims, f"p{i}"
+
+    padding_per_module = size // max(modules, 1)
+    for m in range(modules):
+        module_start = nbytes
+        if m % 2 == 0:
+            emit(f"module dut{m} (")
+            for i in range(ports):
+                direction, dims, port_name = port(i)
+                emit(f"    {direction} logic {dims}{port_name}{',' if i < ports - 1 else ''}")
+            emit(");")
+        else:
+            emit(f"module dut{m}({', '.join(f'p{i}' for i in range(ports))});")
+            for i in range(ports):
+                direction, dims, port_name = port(i)
+                emit(f"    {direction} {dims}{port_name};")
+
+        # Gate instances like in a flattened netlist until the module reaches its share of the file size
+        gate = 0
+        while nbytes - module_start < padding_per_module:
+            emit(f"    AND2 u{gate} (.A(n{gate}), .B(n{gate + 1}), .Y(n{gate + 2}));")
+            gate += 1
+        emit("endmodule")
+        emit("")
+
+    emit("interface dut0_if();")
+    for i in range(ports):
+        direction, dims, port_name = port(i)
+        emit(f"    logic {dims}{port_name};")
+    emit("endinterface")
+    return "\n".join(lines) + "\n"
+
+def time_call(func, repeat):
+    """
+    Function to return the best wall time in seconds of repeat calls of func().
+    parameters:
+    func: The function to time.
+    repeat: The number of calls.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def run_suite(cases, repeat):
+    """
+    Function to run the suite over a corpus and return the list of result dicts with the benchmark name and its best time.
+    design_scan, every component generator and the end to end uvm_framework_files_gen are measured separately.
+    parameters:
+    cases: A dict mapping the case names to their specs.
+    repeat: The number of calls per benchmark, the best one is reported.
+    """
+    results = []
+    tmp_dir = tempfile.mkdtemp(prefix="uvmgen_suite_")
+    try:
+        for case_name, spec in cases.items():
+            case = parse_case(spec)
+            path = os.path.join(tmp_dir, f"{case_name}.sv")
+            with open(path, 'w') as file:
+                file.write(synthesize_design(**case))
+            info = dict(case, bytes=os.path.getsize(path))
+
+            def record(benchmark, seconds):
+                results.append({'name': f"{case_name}/{benchmark}", 'case': case_name, 'benchmark': benchmark,
+                                'seconds': seconds, 'corpus': info})
+                print(f"{case_name + '/' + benchmark:<40} {seconds * 1e3:>10.3f} ms", file=sys.stderr)
+
+            record("design_scan", time_call(lambda: uvm.design_scan(path), repeat))
+            module_name, port_lst, interface_name = uvm.design_scan(path)
+            design = {'module_name': module_name, 'port_lst': port_lst, 'design_type': "adder", 'interface_name': interface_name}
+            for component, generator in uvm.COMPONENT_GENERATORS.items():
+                record(f"gen/{component}", time_call(lambda: generator(design), repeat))
+
+            # End to end generation into an empty directory every time, so every file is rendered and written
+            out_dir = os.path.join(tmp_dir, f"{case_name}_out")
+
+            def end_to_end():
+                shutil.rmtree(out_dir, ignore_errors=True)
+                uvm.uvm_framework_files_gen(module_name, port_lst, "adder", interface_name,
+                                            uvm.GenerationOptions(output_dir=out_dir, verbose=False, design_file=path))
+            record("uvm_framework_files_gen", time_call(end_to_end, repeat))
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return results
+
+def compare_results(baseline, current, threshold):
+    """
+    Function to compare two suite reports. Returns the list of (name, baseline seconds, current seconds, ratio) of the regressions.
+    parameters:
+    baseline: The baseline report dict.
+    current: The current report dict.
+    threshold: The allowed relative slowdown, e.g. 0.15 for 15 %.
+    """
+    baseline_times = {result['name']: result['seconds'] for result in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        before = baseline_times.get(result['name'])
+        if before and result['seconds'] > before * (1 + threshold):
+            regressions.append((result['name'], before, result['seconds'], result['seconds'] / before))
+    return regressions
+
+def print_regressions(regressions, threshold):
+    """
+    Function to print the regressions found by compare_results.
+    parameters:
+    regressions: The list returned by compare_results.
+    threshold: The allowed relative slowdown.
+    """
+    if not regressions:
+        print(f"No regressions above {threshold:.0%}")
+        return
+    print(f"{len(regressions)} regression(s) above {threshold:.0%}:")
+    for name, before, after, ratio in regressions:
+        print(f"  {name:<40} {before * 1e3:>10.3f} ms -> {after * 1e3:>10.3f} ms ({ratio:.2f}x)")
+
+def bench_suite(args):
+    """
+    Benchmark suite over a synthetic design corpus. Writes a JSON report and optionally compares it to a baseline report.
+    """
+    cases = dict(SUITE_CASES)
+    if args.case:
+        cases = dict(case.split(":", 1) if ":" in case else (f"custom{i}", case) for i, case in enumerate(args.case))
+    report = {
+        'meta': {'python': platform.python_version(), 'platform': platform.platform(), 'time': time.time(),
+                 'generator_version': uvm.generator_version(), 'repeat': args.repeat},
+        'results': run_suite(cases, args.repeat),
+    }
+
+    if args.json == "-":
+        print(json.dumps(report, indent=2))
+    else:
+        with open(args.json, 'w') as file:
+            json.dump(report, file, indent=2)
+        print(f"Results written to {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as file:
+            regressions = compare_results(json.load(file), report, args.threshold)
+        print_regressions(regressions, args.threshold)
+        return 1 if regressions else 0
+    return 0
+
+def bench_compare(args):
+    """
+    Comparison of two stored suite reports. Fails if the current report regressed against the baseline.
+    """
+    with open(args.baseline, 'r') as file:
+        baseline = json.load(file)
+    with open(args.current, 'r') as file:
+        current = json.load(file)
+    regressions = compare_results(baseline, current, args.threshold)
+    print_regressions(regressions, args.threshold)
+    return 1 if regressions else 0
+
+def sv_volume(root):
+    """
+    Function to return the number of files, lines and bytes of the sv files below a directory.
+    parameters:
+    root: The directory.
+    """
+    files = lines = size = 0
+    for directory, dirnames, filenames in os.walk(root):
+        for filename in filenames:
+            if filename.endswith(".sv"):
+                with open(os.path.join(directory, filename), 'rb') as file:
+                    data = file.read()
+                files += 1
+                lines += data.count(b"\n")
+                size += len(data)
+    return files, lines, size
+
+def bench_shared(args):
+    """
+    Benchmark of the generated SV volume of many testbenches with and without the shared base package.
+    With --compile-cmd the compile time of both trees is measured as well.
+    """
+    report = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("per_design", "shared"):
+            root = os.path.join(tmp, mode)
+            for i in range(args.designs):
+                uvm.uvm_framework_files_gen(f"dut{i}", synthetic_ports(args.ports), "adder", f"dut{i}_if",
+                                            uvm.GenerationOptions(output_dir=os.path.join(root, f"dut{i}"), verbose=False,
+                                                                  shared_lib=root if mode == "shared" else None))
+            files, lines, size = sv_volume(root)
+            report[mode] = {'files': files, 'lines': lines, 'bytes': size}
+            if args.compile_cmd:
+                # Every design package and tb is compiled in one call, the shared base package first
+                sources = sorted(os.path.join(root, f"dut{i}", f"dut{i}_{name}.sv") for i in range(args.designs) for name in ("pkg", "tb"))
+                if mode == "shared":
+                    sources.insert(0, os.path.join(root, f"{uvm.SHARED_BASE_PKG}.sv"))
+                incdirs = " ".join(f"+incdir+{os.path.join(root, f'dut{i}')}" for i in range(args.designs))
+                start = time.perf_counter()
+                subprocess.run(args.compile_cmd.format(files=" ".join(sources), incdirs=incdirs), shell=True, cwd=root, check=True,
+                               stdout=subprocess.DEVNULL)
+                report[mode]['compile_s'] = time.perf_counter() - start
+
+    print(f"{args.designs} designs with {args.ports} ports each")
+    print(f"{'mode':<12} {'files':>8} {'lines':>10} {'bytes':>12} {'compile':>10}")
+    for mode, r in report.items():
+        compile_time = f"{r['compile_s']:.2f}s" if 'compile_s' in r else "-"
+        print(f"{mode:<12} {r['files']:>8} {r['lines']:>10} {r['bytes']:>12} {compile_time:>10}")
+    reduction = 1 - report['shared']['lines'] / report['per_design']['lines']
+    print(f"The shared base package removes {reduction:.1%} of the generated lines")
+    return 0
+
+def legacy_uvm_hierarchy(module_name, pdf_filename):
+    """
+    The reportlab hierarchy diagram of the previous releases with a canvas per design. Kept as the reference for the diagram benchmark.
+    parameters:
+    module_name: The name of the design module.
+    pdf_filename: The PDF file to write.
+    """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.units import inch
+
+    c = canvas.Canvas(pdf_filename, pagesize=letter)
+    width, height = letter
+    positions = {
+        'test': (width / 2, height - inch),
+        'sequence_item': (width / 4, height - 2 * inch),
+        'env': (3 * width / 4, height - 2 * inch),
+        'scoreboard': (width / 6, height - 3 * inch),
+        'agent': (width / 2, height - 3 * inch),
+        'subscriber': (5 * width / 6, height - 3 * inch),
+        'sequencer': (width / 4, height - 4 * inch),
+        'driver': (width / 2, height - 4 * inch),
+        'monitor': (3 * width / 4, height - 4 * inch),
+    }
+    box_width = 120
+    box_height = 30
+    for name, pos in positions.items():
+        c.rect(pos[0] - box_width / 2, pos[1] - box_height / 2, box_width, box_height)
+        c.drawString(pos[0] - box_width / 2 + 5, pos[1] - box_height / 4, f"{module_name}_{name}")
+    for start, end in uvm.HIERARCHY_CONNECTIONS:
+        c.line(positions[start][0], positions[start][1] - box_height / 2, positions[end][0], positions[end][1] + box_height / 2)
+    c.save()
+
+def bench_diagram(args):
+    """
+    Benchmark of the per design render time of the hierarchy diagrams: the reportlab canvas per design of the previous releases
+    (skipped if reportlab is not installed) against the SVG and DOT text and the multi-page PDF of a whole batch.
+    """
+    names = [f"dut{i}" for i in range(args.designs)]
+    report = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        # Only looked up here, the first design pays for importing reportlab like every run of the previous releases
+        if importlib.util.find_spec("reportlab") is not None:
+            report['reportlab_pdf'] = time_call(lambda: [legacy_uvm_hierarchy(name, os.path.join(tmp, f"{name}.pdf")) for name in names],
+                                                args.repeat) / len(names)
+        else:
+            print("reportlab is not installed, the reference is skipped")
+
+        def write(filename, content):
+            with open(os.path.join(tmp, filename), 'wb' if isinstance(content, bytes) else 'w') as file:
+                file.write(content)
+        report['svg'] = time_call(lambda: [write(f"{name}.svg", uvm.hierarchy_svg(name)) for name in names], args.repeat) / len(names)
+        report['dot'] = time_call(lambda: [write(f"{name}.dot", uvm.hierarchy_dot(name)) for name in names], args.repeat) / len(names)
+        report['batch_pdf'] = time_call(lambda: write("batch.pdf", uvm.hierarchy_pdf(names)), args.repeat) / len(names)
+
+    print(f"{args.designs} designs, best of {args.repeat}")
+    print(f"{'renderer':<16} {'per design':>12}")
+    for renderer, seconds in report.items():
+        print(f"{renderer:<16} {seconds * 1e6:>10.1f}us")
+    if 'reportlab_pdf' in report:
+        print(f"The batch PDF renders {report['reportlab_pdf'] / report['batch_pdf']:.0f}x faster per design than a reportlab canvas per design")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks for generate_uvm_tb.py")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    parse = subparsers.add_parser("parse", help="design_scan against the legacy regex scan")
+    parse.add_argument("--ports", type=int, nargs="+", default=[10, 1000, 100000], help="Port counts of the synthetic designs")
+    parse.add_argument("--repeat", type=int, default=5, help="Samples per measurement, the best one is reported")
+    parse.add_argument("--tolerance", type=float, default=0.10, help="Allowed slowdown before the benchmark fails")
+    parse.set_defaults(func=bench_parse)
+
+    ports = subparsers.add_parser("ports", help="Time and peak RSS of every component generator over port counts")
+    ports.add_argument("--ports", type=int, nargs="+", default=[1000, 10000, 100000], help="Port counts of the sweep")
+    ports.add_argument("--only", metavar="COMPONENTS", help="Comma separated components to benchmark (default: all)")
+    ports.add_argument("--child", metavar="COMPONENT", help=argparse.SUPPRESS)
+    ports.set_defaults(func=bench_ports)
+
+    suite = subparsers.add_parser("suite", help="Parse and generation throughput over a synthetic design corpus")
+    suite.add_argument("--case", action="append", metavar="[NAME:]SPEC",
+                       help="Corpus case like 'big:modules=2,ports=1000,width=16,comments=0.3,size=1000000'. Repeatable, replaces the default corpus")
+    suite.add_argument("--repeat", type=int, default=5, help="Calls per benchmark, the best one is reported")
+    suite.add_argument("--json", default="-", help="File for the JSON report ('-' for stdout)")
+    suite.add_argument("--baseline", help="Baseline JSON report to compare against")
+    suite.add_argument("--threshold", type=float, default=0.15, help="Allowed relative slowdown against the baseline")
+    suite.set_defaults(func=bench_suite)
+
+    compare = subparsers.add_parser("compare", help="Compare two suite reports and flag regressions")
+    compare.add_argument("baseline", help="Baseline JSON report")
+    compare.add_argument("current", help="Current JSON report")
+    compare.add_argument("--threshold", type=float, default=0.15, help="Allowed relative slowdown")
+    compare.set_defaults(func=bench_compare)
+
+    imports = subparsers.add_parser("import", help="Import time of generate_uvm_tb (-X importtime)")
+    imports.add_argument("--repeat", type=int, default=5, help="Fresh interpreters, the fastest one is reported")
+    imports.add_argument("--max-ms", type=float, default=100.0, help="Import time budget in milliseconds, reported but not enforced")
+    imports.add_argument("--forbidden", nargs="+", default=["matplotlib", "reportlab", "numpy"],
+                         help="Packages that must not be imported by 'import generate_uvm_tb'")
+    imports.set_defaults(func=bench_import)
+
+    shared = subparsers.add_parser("shared", help="Generated SV volume of many testbenches with and without the shared base package")
+    shared.add_argument("--designs", type=int, default=200, help="Number of synthetic designs")
+    shared.add_argument("--ports", type=int, default=16, help="Ports of every design")
+    shared.add_argument("--compile-cmd", help="Also time this compile command template ({files}, {incdirs}), e.g. 'vlog -sv {incdirs} {files}'")
+    shared.set_defaults(func=bench_shared)
+
+    diagram = subparsers.add_parser("diagram", help="Per design render time of the hierarchy diagrams against a reportlab canvas per design")
+    diagram.add_argument("--designs", type=int, default=200, help="Number of designs")
+    diagram.add_argument("--repeat", type=int, default=5, help="Runs per renderer, the best one is reported")
+    diagram.set_defaults(func=bench_diagram)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+if __name__ == "__main__":
+    main()
@@ -1,638 +1,4324 @@
-import sys # Used for to allow command line arguments
-import re # Importing regular expression library. Core for design_scan function.
-# The following libraries are very important for report generation adnd command line interaction
-import subprocess
-import matplotlib.pyplot as plt
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from reportlab.lib.units import inch
-
-def design_scan(filename):
-    """
-    The funtion that will parse sv module and return module name, ports with their respectuve directions, and the interface name.
-    parameter: the sv design file (first command line argument)
-    """
-
-    # File descriptor to read the contents of the sv design file
-    with open(filename, 'r') as file: 
-        sv_file = file.read()
-
-    # Using the seach method of RegEx library to scan for module name and mark it as group for later use.
-    module_name = re.search(r'\bmodule\s+(\w+)', sv_file).group(1) 
-
-    # Using the RegEx findall method for signals with their direction and width.
-    module_ports = re.findall(r'\b(input|output|inout)\s+(?:reg\s+|logic\s+|wire\s+)?(\[[^]]*\])?\s*(\w+);', sv_file)
-    
-    # Appending a list for with module's port descrition in a tuple format to return
-    port_lst = []
-    for direction, width, name in module_ports:
-        port_lst.append((direction, width, name))
-
-    # Using RegEx to parse Interface name
-    interface_name_match = re.search(r'\binterface\s+(\w+)', sv_file)
-    interface_name = interface_name_match.group(1) if interface_name_match else None
-
-    return module_name, port_lst, interface_name
-
-def uvm_framework_files_gen(module_name, port_lst, design_type, interface_name):
-    """
-    The core function for the UVM testbench enivroment generation.
-    parameters: 
-    module_name: The name fo the design module. Parsed from the prev function
-    port_lst: A list of tuples of port definitions. Parsed from the previous function.
-    design_type: The 3rd arg. Useful for some sub functions for creation of some components. Parsed from the previous function.
-    interface_name: The interface name parsedf from the prev function. Useful for components which employes config_db.
-    """
-
-    # A dict with all the functions for generation of sifferent components. The keys are the strings useful for naming the generated files. 
-    # The values are the actual functions
-    components = {
-        'sequence_item': sequence_item_gen(module_name, port_lst),
-        'sequence': sequence_gen(module_name),
-        'sequencer': sequencer_gen(module_name),
-        'driver': driver_gen(module_name, interface_name, port_lst),
-        'monitor': monitor_gen(module_name, interface_name, port_lst),
-        'scoreboard': scoreboard_gen(module_name, port_lst, design_type),
-        'subscribe': subscriber_gen(module_name, port_lst),
-        'agent': agent_gen(module_name),
-        'env': env_gen(module_name),
-        'test': test_gen(module_name),
-        'pkg': pkg_gen(module_name),
-        'tb': tb_gen(module_name, interface_name, port_lst),
-        }
-
-    # Generates the files and prints on the terminal about their generation
-    for comp_name, sv_file in components.items():
-        filename = f"{module_name}_{comp_name}.sv"
-        with open(filename, 'w') as file:
-            file.write(sv_file)
-        print(filename, "has been created.")
-
-def sequence_item_gen(module_name, port_lst):
-    """
-    Function to generate the sequence_item responsibe for containing the transactions.
-    parameters:
-    module_name: The name of the design module.
-    port_lst: The list of tuples of port description.
-    """
-
-    # Logic for making a string of port declarations
-    port_declarations = ""
-    for direction, width, port in port_lst:
-        if (direction == "input"):
-            port_declarations += f"rand bit {width} {port};\n    "
-        else:
-            port_declarations += f"bit {width} {port};\n    "
-    
-
-    # Logic for facory registration
-    uvm_factory_registration = ""
-    for direction, width, port in port_lst:
-        uvm_factory_registration += f"    `uvm_field_int({port}, UVM_ALL_ON)\n    "
-
-    # The following content will be returned which maintains the syntax of an UVM testbench.
-    return f"""
-class {module_name}_seq_item extends uvm_sequence_item;
-
-    // Port declaration and randomizing them
-    {port_declarations}
-
-    // Add your contraints here as per the needs
-
-    function new(input string name = "{module_name}_seq_item");
-        super.new(name);
-    endfunction: new
-
-    `uvm_object_utils_begin({module_name}_seq_item)
-    {uvm_factory_registration}`uvm_object_utils_end
-
-endclass: {module_name}_seq_item
-"""
-
-def sequence_gen(module_name):
-    """
-    Function to generate the sequence for test case generation.
-    parameters:
-    module_name: The name of the design module.
-    """
-    
-    return f"""
-class {module_name}_seq extends uvm_sequence #({module_name}_seq_item);
-    `uvm_object_utils({module_name}_seq)
-
-    function new(input string name = "{module_name}_seq");
-        super.new(name);
-    endfunction: new
-
-    virtual task body();
-    // A basic test case for the functionality check
-    req = {module_name}_seq_item::type_id::create("req");
-    repeat(10) begin
-        start_item(req);
-        req.randomize();
-        finish_item(req);
-        // Additional test cases here
-    end
-    endtask: body
-
-endclass: {module_name}_seq
-
-// Also, if desired, add addional sequences here for more test cases.
-"""
-
-def sequencer_gen(module_name):
-    """
-    Function to generate the sequencer.
-    parameters:
-    module_name: The name of the design module.
-    """
-    return f"""
-class {module_name}_sequencer extends uvm_sequencer #({module_name}_seq_item);
-    `uvm_component_utils({module_name}_sequencer)
-
-    function new(input string name = "{module_name}_sequencer", uvm_component parent = null);
-        super.new(name, parent);
-    endfunction: new
-
-endclass: {module_name}_sequencer
-"""
-
-def driver_gen(module_name, interface_name, port_lst):
-    """
-    Function to generate the sequence for test case generation.
-    parameters:
-    module_name: The name of the design module.
-    interface_name: interface name of the design. Used for config_db.
-    port_lst: list of tuples of ports definitions.
-    """
-    
-    # A logic that filters the input ports from the transaction or sequence_item to drive virtual interface.
-    interface_drive = ""
-    for direction, width, port in port_lst:
-        if direction == "input":
-            interface_drive += f"vif.{port} <= req.{port};\n            "
-
-    return f"""
-class {module_name}_driver extends uvm_driver#({module_name}_seq_item);
-    `uvm_component_utils({module_name}_driver)
-
-    virtual {interface_name} vif;
-
-    function new(input string name = "{module_name}_driver", uvm_component parent = null);
-        super.new(name, parent);
-    endfunction: new
-
-    virtual function void build_phase(uvm_phase phase);
-        req = {module_name}_seq_item::type_id::create("req");
-        super.build_phase(phase);
-        if (!uvm_config_db#(virtual {interface_name})::get(this, "", "vif", vif))
-            `uvm_fatal(get_type_name(), "Virtual interface not dfound in config_db");
-    endfunction: build_phase
-
-    virtual task run_phase(uvm_phase phase);
-        forever begin
-            seq_item_port.get_next_item(req);
-            // Driving logic
-            {interface_drive}
-            `uvm_info(get_type_name(), "Sent transaction to DUT-------------------------", UVM_NONE);
-            req.print();
-            seq_item_port.item_done();
-        end
-    endtask: run_phase
-endclass: {module_name}_driver
-"""
-
-def monitor_gen(module_name, interface_name, port_lst):
-    """
-    Function to generate the monitor class for receiving response from the DUT.
-    parameters:
-    module_name: The name of the design module.
-    interface_name: interface name of the design. Used for config_db.
-    port_lst: list of tuples of ports definitions.
-    """
-    
-    # A logic that filters the input ports to collect response from the interface.
-    monitor_logic = ""
-    for direction, width, port in port_lst:
-        monitor_logic += f"tr.{port} = vif.{port};\n            "
-
-    return f"""
-class {module_name}_monitor extends uvm_monitor;
-    `uvm_component_utils({module_name}_monitor)
-
-    {module_name}_seq_item tr;
-    virtual {interface_name} vif;
-
-    uvm_analysis_port #({module_name}_seq_item) aport;
-
-    function new(input string name = "{module_name}_monitor", uvm_component parent = null);
-        super.new(name, parent);
-        aport = new("aport", this);
-    endfunction: new
-
-    virtual function void build_phase(uvm_phase phase);
-        super.build_phase(phase);
-        
-        tr = {module_name}_seq_item::type_id::create("tr");
-
-        if (!uvm_config_db#(virtual {interface_name})::get(this, "", "vif", vif))
-            `uvm_fatal(get_type_name(), "Cannot find vif in the config_db");
-    endfunction: build_phase
-
-    virtual task run_phase(uvm_phase phase);
-        {module_name}_seq_item tr;
-        forever begin
-            #10;
-            // Collecting response from DUT
-            {monitor_logic}
-
-            `uvm_info(get_type_name(), "Send trans to Scoreboard", UVM_NONE);
-            tr.print();
-
-            aport.write(tr);
-        end
-    endtask: run_phase
-endclass
-"""
-
-def scoreboard_gen(module_name, port_lst, design_type):
-    """
-    Function to generate the scoreboard to check the test.
-    parameters:
-    module_name: The name of the design module.
-    port_lst: list of tuples of ports definitions.
-    design_type: The 3rd command line argument. 
-    """
-    
-    verification_logic = ""
-    golden_reference_model = ""
-
-    # The following logic creates the comparision logic and the golden reference model as per the design type.
-    if design_type.lower() == "adder":
-        for direction, size, port in port_lst:
-            if (direction == "output"):
-                golden_reference_model = f"expected_output = tr.a + tr.b;\n\t\t"
-                verification_logic += f"if (tr.{port} != expected_output)\n\t" 
-                verification_logic += f"\t\t`uvm_info(get_type_name(), \"TEST FAILED\", UVM_NONE)\t\n"
-                verification_logic += f"\t\telse\n\t\t\t`uvm_info(get_type_name(), \"TEST PASSED\", UVM_NONE)\n\t\t"
-    elif design_type.lower() == "alu":
-        golden_reference_model = f"""
-            case (tr.opcode)
-                4'b0000: expected_output = tr.op1 + tr.op2; // ADD
-                4'b0001: expected_output = tr.op1 - tr.op2; // SUB
-                4'b0010: expected_output = tr.op1 & tr.op2; // AND
-                4'b0011: expected_output = tr.op1 | tr.op2; // OR
-                default: expected_output = 0;
-            endcase
-            """
-        for direction, size, port in port_lst:
-            if direction == "output":
-                verification_logic += f"if (tr.{port} != expected_output)\t\n\t\t\t`uvm_info(get_type_name(), \"TEST FAILED\")\n\t\t"
-                verification_logic += f"else\t\n\t\t\t`uvm_info(get_type_name(), \"TEST PASSED\")\n\t\t"
-    else:  # Generic template
-        verification_logic = """
-        // Add your reference verificationn logic here
-        """
-
-    return f"""
-class {module_name}_scoreboard extends uvm_scoreboard;
-    `uvm_component_utils({module_name}_scoreboard)
-
-    {module_name}_seq_item tr;
-
-    uvm_analysis_imp#({module_name}_seq_item, {module_name}_scoreboard) aimport;
-
-    function new(string name, uvm_component parent);
-        super.new(name, parent);
-        aimport = new("aimport", this);
-    endfunction: new
-
-    virtual function void build_phase(uvm_phase phase);
-        super.build_phase(phase);
-        tr = {module_name}_seq_item::type_id::create("tr");
-    endfunction: build_phase
-
-    virtual function void write(input {module_name}_seq_item t);
-        /*
-        tr = t;
-        int expected_output;
-
-        // Golden reference model
-        {golden_reference_model}
-
-        // Logic for comparision
-        {verification_logic}
-        tr.print()
-        */
-        // Additional comparison logic
-        // User can add more comparison logic here
-    endfunction
-endclass: {module_name}_scoreboard
-"""
-
-def subscriber_gen(module_name, port_lst):
-    """
-    Function to generate the subscriber object file for coverages.
-    parameters:
-    module_name: The name of the design module.
-    design_type: The 3rd command line argument. 
-    """
-    
-    coverage_logic = ""
-
-    for direction, width, port in port_lst:
-        coverage_logic += f"\t{port.upper()}\t:\tcoverpoint {port};\n\t"
-
-    return f"""
-class {module_name}_subscribe extends uvm_subscribe #({module_name}_seq_item);
-    `uvm_component_utils({module_name}_subscribe)
-
-    {module_name}_seq_item req;
-
-    real cov;
-
-    // A basic coverpoint for all the signals. If needed, modify as per the needs.
-    covergroup {module_name}_cg;
-    option.per_instance = 2;
-    {coverage_logic}endgroup: {module_name}_cg
-    
-    // Ad more additional covergroups with coverpoints here
-
-    function new(input string name = {module_name}_subscribe, uvm_component parent = null);
-        super.new(name, parent);
-
-        req = {module_name}_seq_item::tyep_id::create("req");
-
-        {module_name}_cd = new();
-
-        //Create an object of your additional covergroup here.
-    endfunction: new
-
-    virtual function void write(input {module_name}_seq_item t);
-        `uvm_info(get_type_name(), "Reading data from monitor for coverage", UVM_NONE);
-        t.print;
-        req = t;
-
-        {module_name}.sample();
-        cov = {module_name}.get_coverage();
-        `uvm_info(get_full_name(), $sformatf("Coverage is %0d", cov), UVM_NONE);
-    
-    endfunction: write
-
-endclass: {module_name}_subscribe
-"""
-
-def agent_gen(module_name):
-    """
-    Function to generate the agent object.
-    parameters:
-    module_name: The name of the design module.
-    """
-    
-    return f"""
-class {module_name}_agent extends uvm_agent;
-    `uvm_component_utils({module_name}_agent)
-
-    {module_name}_sequencer seqr;
-    {module_name}_driver drv;
-    {module_name}_monitor mon;
-
-    function new(input string name = "{module_name}_agent", uvm_component parent = null);
-        super.new(name, parent);
-    endfunction: new
-
-    virtual function void build_phase(uvm_phase phase);
-        super.build_phase(phase);
-        seqr = {module_name}_sequencer::type_id::create("seqr", this);
-        drv = {module_name}_driver::type_id::create("drv", this);
-        mon = {module_name}_monitor::type_id::create("mon", this);
-    endfunction: build_phase
-
-    virtual function void connect_phase(uvm_phase phase);
-        super.connect_phase(phase);
-        drv.seq_item_port.connect(seqr.seq_item_export);
-    endfunction: connect_phase
-
-endclass: {module_name}_agent
-"""
-
-def env_gen(module_name):
-    """
-    Function to generate the environment object.
-    parameters:
-    module_name: The name of the design module.
-    """
-
-    return f"""
-class {module_name}_env extends uvm_env;
-    `uvm_component_utils({module_name}_env)
-
-    {module_name}_agent agnt;
-    {module_name}_scoreboard sb;
-   // {module_name}_subscribe subs;
-
-    function new(input string name = "{module_name}_env", uvm_component parent = null);
-        super.new(name, parent);
-    endfunction
-
-    virtual function void build_phase(uvm_phase phase);
-        super.build_phase(phase);
-        agnt = {module_name}_agent::type_id::create("agnt", this);
-        sb = {module_name}_agent::type_id::create("sb", this); 
-       // subs = {module_name}_subscribe::type_id::create("subs", this);    
-    endfunction: build_phase
-
-    virtual function void connect_phase(uvm_phase phase);
-        super.connect_phase(phase);
-        agnt.mon.aport.connect(sb.aimport);
-       // agnt.mon.aport.connect(subs.analysis_export);
-    
-    endfunction: connect_phase
-
-endclass: {module_name}_env
-"""
-
-def test_gen(module_name):
-    """
-    Function to generate the test object.
-    parameters:
-    module_name: The name of the design module.
-    """
-
-    return f"""
-class {module_name}_test extends uvm_test;
-    `uvm_component_utils({module_name}_test)
-
-    {module_name}_env env;
-    {module_name}_seq seq;
-    //declare your more sequences here if impemented.
-
-    function new(input string name = "{module_name}_test", uvm_component parent = null);
-        super.new(name, parent);
-    endfunction: new
-
-    virtual function void build_phase(uvm_phase phase);
-        super.build_phase(phase);
-        env = {module_name}_env::type_id::create("env", this);
-        seq = {module_name}_seq::type_id::create("seq", this);
-    endfunction: build_phase
-
-    virtual task run_phase(uvm_phase phase);
-        phase.raise_objection(this);
-            seq.start(env.agnt.seqr);
-            #50;
-        phase.drop_objection(this);
-    endtask: run_phase
-
-endclass: {module_name}_test
-"""
-
-def pkg_gen(module_name):
-    """
-    Function to generate the packages.
-    parameters:
-    module_name: The name of the design module.
-    """
-
-    return f"""
-package {module_name}_pkg;
-    import uvm_pkg::*;
-    `include "uvm_macros.svh"
-    `include "{module_name}_sequence_item.sv"
-    `include "{module_name}_sequence.sv"
-    `include "{module_name}_sequencer.sv"
-    `include "{module_name}_driver.sv"
-    `include "{module_name}_monitor.sv"
-    `include "{module_name}_scoreboard.sv"
-    `include "{module_name}_agent.sv"
-    `include "{module_name}_env.sv"
-    `include "{module_name}_test.sv"
-endpackage
-"""
-
-def tb_gen(module_name, interface_name, port_lst):
-
-    """
-    Function to generate top level tb.
-    parameters:
-    module_name: The name of the design module.
-    interface_name: interface name of the design. Used for config_db.
-    """
-    dut_instance_logic = ""
-    i = 0
-    for direction, width, port in port_lst:
-        if (i < len(port_lst) - 1):
-            dut_instance_logic += f".{port}(vif.{port}), \t\t\n"
-        else: 
-            dut_instance_logic += f".{port}(vif.{port}) \t\t\n"
-        i += 1
-    return f"""
-module tb_{module_name};
-    import uvm_pkg::*;
-    import {module_name}_pkg::*;
-
-
-    {interface_name} vif();
-    {module_name} dut({dut_instance_logic});
-
-    initial begin
-        uvm_config_db#(virtual {interface_name})::set(null, "uvm_test_top.env.agent*", "vif", vif);
-        run_test("{module_name}_test");
-    end
-endmodule
-"""
-
-def code_compilation(module_name):
-    """
-    Function to do the simulation check in Questa Sim ansd generate the coverage report in ucdb and convert it to txt.
-    parameters:
-    module_name: The name of the design module.
-    """
-    # Command to run the simulation using QuestaSim
-    compile_cmd = f"vlog -sv {module_name}_pkg.sv {module_name}_tb.sv"
-    run_cmd = f"vsim -coverage -vopt work.tb_{module_name} -c"
-    run_cmd1 = f"run -all"
-    run_cmd2 = f"coverage report -detail"
-
-    try:
-        subprocess.run(compile_cmd, shell=True, check=True)
-        subprocess.run(run_cmd, shell=True, check=True)
-        subprocess.run(run_cmd1, shell=True, check=True)
-        subprocess.run(run_cmd2, shell=True, check=True)
-    except subprocess.CalledProcessError as e:
-        print(f"Simuilation Error: {e}")
-
-def uvm_hierarchy(module_name):
-    """
-    Function to generate UVM hierarchy diagram.
-    parameters:
-    module_name: The name of the design module.
-    """
-
-    pdf_filename = f"{module_name}_uvm_hierarchy.pdf"
-    c = canvas.Canvas(pdf_filename, pagesize=letter)
-    width, height = letter
-
-    positions = {
-        'test': (width / 2, height - inch),
-        'sequence_item': (width / 4, height - 2 * inch),
-        'env': (3 * width / 4, height - 2 * inch),
-        'scoreboard': (width / 6, height - 3 * inch),
-        'agent': (width / 2, height - 3 * inch),
-        'subscriber': (5 * width / 6, height - 3 * inch),
-        'sequencer': (width / 4, height - 4 * inch),
-        'driver': (width / 2, height - 4 * inch),
-        'monitor': (3 * width / 4, height - 4 * inch),
-    }
-    
-    box_width = 120
-    box_height = 30
-    for name, pos in positions.items():
-        c.rect(pos[0] - box_width / 2, pos[1] - box_height / 2, box_width, box_height)
-        c.drawString(pos[0] - box_width / 2 + 5, pos[1] - box_height / 4, f"{module_name}_{name}")
-
-    connections = [
-        ('test', 'sequence_item'),
-        ('test', 'env'),
-        ('env', 'scoreboard'),
-        ('env', 'agent'),
-        ('env', 'subscriber'),
-        ('agent', 'sequencer'),
-        ('agent', 'driver'),
-        ('agent', 'monitor'),
-    ]
-
-    for start, end in connections:
-        start_pos = positions[start]
-        end_pos = positions[end]
-        c.line(start_pos[0], start_pos[1] - box_height / 2, end_pos[0], end_pos[1] + box_height / 2)
-
-    c.save()
-    print(f"{pdf_filename} has been created")
-
-def main():
-    """
-    The very main function that executes all the neccesary functions
-    """
-
-    # Check for the arguments entered in the console
-    if (len(sys.argv) < 2 or len(sys.argv) > 3): 
-        print("Argument syntax error. Please use the following pattern.\nUsage: python generate_uvm_tb.py <sv_module> <design_type>\nThe last argument is optional. Suppoted desgin type for this build: Adder, ALU ")
-        sys.exit(1)
-
-    # Declaring the first argument for SV design modules
-    sv_module = sys.argv[1] 
-    # Calling the function that will return Module name, ports with their respective width and directions, and interface name.
-    module_name, ports, interface_name = design_scan(sv_module)
-    
-    #Check for 3rd argument that takes design type. If no 3rd argument, the basic framework will be selected
-    if (len(sys.argv) == 3 and sys.argv[2].lower() == "run"):
-        code_compilation(module_name)
-        uvm_hierarchy(module_name)
-    else:
-        design_type = sys.argv[2] if len(sys.argv) == 3 else "basic_framework" 
-        # The funntion responsible for generating UVM files
-        uvm_framework_files_gen(module_name, ports, design_type, interface_name)
-
-if __name__ == "__main__":
-    main()
+"""
+Generator of UVM testbenches for SystemVerilog designs.
+
+Command line: python generate_uvm_tb.py <design.sv> [design_type], see --help for the options and the subcommands.
+
+Python API: generate() renders a testbench in memory without printing or writing files, e.g.
+
+    import generate_uvm_tb
+    files = generate_uvm_tb.generate("alu.sv", "ALU")
+    files = generate_uvm_tb.generate(source="module add(input [3:0] a, b, output [4:0] y); endmodule", design_type="Adder",
+                                     components="driver,tb")
+
+It returns a dict of file name to source and can be called repeatedly and from many threads of one process.
+"""
+import sys # Used for to allow command line arguments
+import os
+import re # Importing regular expression library. Core for design_scan function.
+import glob # Used by the batch mode to expand directories, globs and filelists
+import argparse
+import hashlib # Used for the content hashes of the regeneration manifest
+import json
+import ast # Used to evaluate the constant expressions of port widths
+import operator
+import math # Used by the coverage planner to estimate random closure
+import mmap # Used to scan big design files without reading them into memory
+import time # Used for the per stage timings
+import functools # Used to hash this source file once per process
+from contextlib import contextmanager
+# The following library is very important for command line interaction.
+import subprocess
+import signal
+
+# Bump whenever the generated output changes. The manifest also records a hash of this file so local edits are picked up.
+GENERATOR_VERSION = "1.1.0"
+# The manifest that records the inputs of the last generation in an output directory
+MANIFEST_NAME = ".uvmgen_manifest.json"
+
+# Regular expression that finds the next interesting event of the sv scanner in one forward pass.
+# Comments, strings and `define bodies are matched so keywords inside them are skipped. Everything else is skipped by the regex engine.
+SV_EVENT_KEYWORDS = (b"module|macromodule|interface|endmodule|endinterface|input|output|inout|ref|parameter|localparam|"
+                     b"function|task|class|covergroup|property|sequence|clocking|import|export|modport|"
+                     b"endfunction|endtask|endclass|endgroup|endproperty|endsequence|endclocking")
+SV_NET_KEYWORDS = b"logic|wire|reg|bit|tri|var|byte|shortint|int|longint|integer"
+# The leading lookahead lets the regex engine skip every position that cannot start an event without trying the alternatives.
+SV_EVENT_PATTERN = rb'(?=[/"`a-z])(?://[^\n]*|/\*.*?\*/|"(?:\\.|[^"\\\n])*"|`define(?:\\\r?\n|[^\n])*|(?<![\w$`])(?P<kw>%s)(?![\w$]))'
+SV_MODULE_EVENTS = re.compile(SV_EVENT_PATTERN % SV_EVENT_KEYWORDS, re.S)
+# Interfaces additionally report their signal declarations
+SV_INTERFACE_EVENTS = re.compile(SV_EVENT_PATTERN % (SV_EVENT_KEYWORDS + b"|" + SV_NET_KEYWORDS), re.S)
+
+# Regular expressions for runs of plain declarations like "input logic [3:0] a, b;", the vast majority in real designs and netlists.
+# A run is found at once and split with findall, so the common case never reaches the token by token path.
+SV_PORT_RUN = re.compile(rb'(?:(?:input|output|inout|ref)\b[^;/"`()=]*;\s*)+')
+SV_SIGNAL_RUN = re.compile(rb'(?:(?:wire|reg|logic|var|bit|tri)\b[^;/"`()=]*;\s*)+')
+SV_PLAIN_DECLARATION = (r'(?:(signed|unsigned)\s+)?((?:\[[^\]\[;]*\]\s*)*)'
+                        r'([A-Za-z_][\w$]*(?:\s*,\s*[A-Za-z_][\w$]*)*)\s*;')
+SV_PORT_DECLARATION = re.compile(r'(input|output|inout|ref)\s+(?:(?:wire|reg|logic|var|bit|tri)\s+)?' + SV_PLAIN_DECLARATION)
+SV_SIGNAL_DECLARATION = re.compile(r'(wire|reg|logic|var|bit|tri)\s+' + SV_PLAIN_DECLARATION)
+# "interface class" declares a class, not an interface
+SV_INTERFACE_CLASS = re.compile(rb'\s+class\b')
+# A header without ANSI ports, e.g. "add(a, b, y);"
+SV_PLAIN_HEADER = re.compile(rb'\s*([A-Za-z_][\w$]*)\s*(?:\(\s*(?:[A-Za-z_][\w$]*(?:\s*,\s*[A-Za-z_][\w$]*)*)?\s*\))?\s*;')
+
+# Regular expression for a single sv token. Used for the short header and declaration parts found by the scanner.
+# Whitespace, comments, attributes and conditional compilation directives are matched without the tok group and skipped.
+SV_TOKEN = re.compile(rb'''
+    \s+
+  | //[^\n]*
+  | /\*.*?\*/
+  | \(\*(?!\)).*?\*\)
+  | `define(?:\\\r?\n|[^\n])*
+  | `(?:ifdef|ifndef|elsif|undef)\s+\w+
+  | `(?:else|endif|resetall|celldefine|endcelldefine|timescale[^\n]*|default_nettype\s+\w+|include\s+\S+)
+  | (?P<tok>
+        "(?:\\.|[^"\\\n])*"
+      | `\w+
+      | [A-Za-z_][\w$]*
+      | \\\S+
+      | \$[\w$]*
+      | \d[\w']*
+      | '[\w?]+
+      | ::
+      | .
+    )''', re.S | re.X)
+
+SV_DIRECTIONS = {b"input": "input", b"output": "output", b"inout": "inout", b"ref": "ref"}
+# Data type keywords that carry an implicit width. They are mapped to an equivalent packed width.
+SV_INT_TYPES = {b"byte": "signed [7:0]", b"shortint": "signed [15:0]", b"int": "signed [31:0]",
+                b"longint": "signed [63:0]", b"integer": "signed [31:0]"}
+SV_TYPE_KEYWORDS = {b"wire", b"reg", b"logic", b"bit", b"var", b"tri", b"tri0", b"tri1", b"wand", b"wor", b"uwire",
+                    b"supply0", b"supply1", b"signed", b"unsigned"} | set(SV_INT_TYPES)
+# Blocks whose bodies may contain direction keywords that are not ports of the enclosing module
+SV_SKIP_BLOCKS = {b"function": b"endfunction", b"task": b"endtask", b"class": b"endclass", b"covergroup": b"endgroup",
+                  b"property": b"endproperty", b"sequence": b"endsequence", b"clocking": b"endclocking"}
+SV_DPI_IMPORT = re.compile(rb'\s*"[^"]*"\s*(?:\w+\s+)*?(?:function|task)\b[^;]*;')
+# A design file bigger than this is scanned through mmap instead of being read into memory
+SV_MMAP_THRESHOLD = 1 << 20
+
+def sv_tokens(buf, pos, stop=b";"):
+    """
+    Function to collect the tokens from pos up to the stop token at bracket depth zero.
+    Returns the list of tokens (bytes) without the stop token and the position after it.
+    parameters:
+    buf: The sv source as bytes or mmap.
+    pos: The position to start from.
+    stop: The token that ends the collection.
+    """
+    tokens = []
+    depth = 0
+    match = SV_TOKEN.match
+    while True:
+        m = match(buf, pos)
+        if m is None:
+            return tokens, len(buf)
+        pos = m.end()
+        tok = m.group('tok')
+        if tok is None:
+            continue
+        if depth == 0 and tok == stop:
+            return tokens, pos
+        if tok in (b"(", b"[", b"{"):
+            depth += 1
+        elif tok in (b")", b"]", b"}"):
+            depth -= 1
+            if depth < 0:
+                return tokens, pos
+        tokens.append(tok)
+
+def sv_split(tokens):
+    """
+    Function to split a token list at the commas on bracket depth zero.
+    parameters:
+    tokens: The list of tokens.
+    """
+    items = [[]]
+    depth = 0
+    for tok in tokens:
+        if tok in (b"(", b"[", b"{"):
+            depth += 1
+        elif tok in (b")", b"]", b"}"):
+            depth -= 1
+        elif tok == b"," and depth == 0:
+            items.append([])
+            continue
+        items[-1].append(tok)
+    return [item for item in items if item]
+
+def sv_declaration(tokens):
+    """
+    Function to interpret the tokens of a declaration that follow the direction keyword, e.g. "logic signed [3:0] a, b".
+    Returns the width string ("" if there is none) and the list of declared names.
+    parameters:
+    tokens: The list of tokens.
+    """
+    i = 0
+    signed = None
+    type_width = ""
+    while i < len(tokens) and tokens[i] in SV_TYPE_KEYWORDS:
+        if tokens[i] in SV_INT_TYPES:
+            type_width = SV_INT_TYPES[tokens[i]]
+        elif tokens[i] in (b"signed", b"unsigned"):
+            signed = tokens[i] == b"signed"
+        i += 1
+
+    # Packed dimensions, possibly more than one
+    dims = []
+    while i < len(tokens) and tokens[i] == b"[":
+        depth = 0
+        start = i
+        while i < len(tokens):
+            if tokens[i] == b"[":
+                depth += 1
+            elif tokens[i] == b"]":
+                depth -= 1
+                if depth == 0:
+                    break
+            i += 1
+        dims.append(b"".join(tokens[start:i + 1]).decode())
+        i += 1
+
+    if dims:
+        width = "".join(dims)
+        if signed or (signed is None and type_width):
+            width = "signed " + width
+    elif type_width:
+        width = type_width if signed is not False else type_width[len("signed "):]
+    else:
+        width = "signed" if signed else ""
+
+    # The remaining items are the names, each optionally followed by unpacked dimensions or a default value
+    names = [item[0].decode() for item in sv_split(tokens[i:]) if re.match(rb'[A-Za-z_\\]', item[0])]
+    return width, names
+
+def sv_parameters(tokens, parameters):
+    """
+    Function to add the parameters of a parameter declaration or #( ) list to the parameters dict.
+    parameters:
+    tokens: The tokens of the declaration without the parameter keyword.
+    parameters: The dict mapping parameter names to their default value strings.
+    """
+    for item in sv_split(tokens):
+        if item and item[0] in (b"parameter", b"localparam"):
+            item = item[1:]
+        if b"=" not in item:
+            continue
+        eq = item.index(b"=")
+        if eq > 0:
+            parameters[item[eq - 1].decode()] = b"".join(item[eq + 1:]).decode()
+
+def sv_unit_header(buf, pos, kind):
+    """
+    Function to parse the header of a module or interface right after its keyword up to the closing semicolon.
+    Returns the unit dict and the position after the header.
+    parameters:
+    buf: The sv source as bytes or mmap.
+    pos: The position right after the module or interface keyword.
+    kind: "module" or "interface".
+    """
+    unit = {'kind': kind, 'name': None, 'ports': [], 'parameters': {}}
+    if kind == "interface":
+        unit['signals'] = []
+
+    # Headers without parameters and ANSI ports need no tokenizing, their ports are declared in the body
+    plain = SV_PLAIN_HEADER.match(buf, pos)
+    if plain:
+        unit['name'] = plain.group(1).decode()
+        return unit, plain.end()
+
+    tokens, pos = sv_tokens(buf, pos, b";")
+
+    i = 0
+    while i < len(tokens) and tokens[i] in (b"automatic", b"static"):
+        i += 1
+    if i < len(tokens):
+        unit['name'] = tokens[i].decode()
+    i += 1
+
+    # Package imports in the header end with their own semicolon and are skipped
+    while i < len(tokens) and tokens[i] == b"import":
+        more, pos = sv_tokens(buf, pos, b";")
+        tokens = tokens[:i] + more
+
+    # The parameter port list #( ... )
+    if i + 1 < len(tokens) and tokens[i] == b"#" and tokens[i + 1] == b"(":
+        end = sv_matching(tokens, i + 1)
+        sv_parameters(tokens[i + 2:end], unit['parameters'])
+        i = end + 1
+
+    # The port list ( ... ). ANSI items carry a direction, non-ANSI items are plain names declared in the body.
+    if i < len(tokens) and tokens[i] == b"(":
+        end = sv_matching(tokens, i)
+        direction = None
+        width = ""
+        for item in sv_split(tokens[i + 1:end]):
+            if item[0] in SV_DIRECTIONS:
+                direction = SV_DIRECTIONS[item[0]]
+                width, names = sv_declaration(item[1:])
+            elif direction and (item[0] in SV_TYPE_KEYWORDS or item[0] == b"["):
+                width, names = sv_declaration(item)
+            elif direction and (len(item) == 1 or item[1] in (b"[", b"=")):
+                names = [item[0].decode()]
+            else:
+                # Non-ANSI port names, interface ports and explicit .name(expr) ports
+                continue
+            if direction:
+                unit['ports'].extend((direction, width, name) for name in names)
+    return unit, pos
+
+def sv_matching(tokens, i):
+    """
+    Function to return the index of the bracket closing the one at index i.
+    parameters:
+    tokens: The list of tokens.
+    i: The index of the opening bracket.
+    """
+    depth = 0
+    for j in range(i, len(tokens)):
+        if tokens[j] in (b"(", b"[", b"{"):
+            depth += 1
+        elif tokens[j] in (b")", b"]", b"}"):
+            depth -= 1
+            if depth == 0:
+                return j
+    return len(tokens)
+
+def sv_plain_declarations(regex, buf, start, end, widths):
+    """
+    Function to return (keyword, width, name) for every declaration of a run of plain declarations.
+    Returns None if a declaration of the run is not plain, the caller then takes the token by token path.
+    parameters:
+    regex: SV_PORT_DECLARATION or SV_SIGNAL_DECLARATION.
+    buf: The sv source as bytes or mmap.
+    start: The start of the run.
+    end: The end of the run.
+    widths: Cache of the width strings, most declarations of a design share a handful of widths.
+    """
+    text = buf[start:end].decode()
+    declarations = regex.findall(text)
+    if len(declarations) != text.count(";"):
+        return None
+
+    result = []
+    append = result.append
+    for keyword, signed, dims, names in declarations:
+        width = widths.get((signed, dims))
+        if width is None:
+            width = "".join(dims.split())
+            if signed == "signed":
+                width = f"signed {width}" if width else "signed"
+            widths[(signed, dims)] = width
+        if "," in names:
+            for name in names.split(","):
+                append((keyword, width, name.strip()))
+        else:
+            append((keyword, width, names))
+    return result
+
+def sv_parse_buffer(buf, signals=True):
+    """
+    Function to scan sv source in a single forward pass and return all its modules and interfaces.
+    Every unit is a dict with the kind ("module" or "interface"), the name, the ports as (direction, width, name) tuples
+    and the parameters. Interfaces also list their signals as (type, width, name) tuples.
+    parameters:
+    buf: The sv source as bytes or mmap.
+    signals: Collects the signals of the interfaces when True. Their bodies are skipped otherwise.
+    """
+    units = []
+    unit = None
+    skip_until = None
+    widths = {}
+    pos = 0
+    while True:
+        events = SV_INTERFACE_EVENTS if signals and unit is not None and unit['kind'] == "interface" and skip_until is None else SV_MODULE_EVENTS
+        m = events.search(buf, pos)
+        if m is None:
+            break
+        pos = m.end()
+        kw = m.group('kw')
+        if kw is None:
+            continue
+
+        # Inside a function, task, class, etc. only the matching end keyword matters
+        if skip_until is not None:
+            if kw == skip_until:
+                skip_until = None
+            continue
+
+        if kw in (b"module", b"macromodule", b"interface"):
+            if kw == b"interface" and SV_INTERFACE_CLASS.match(buf, pos):
+                skip_until = b"endclass"
+                continue
+            unit, pos = sv_unit_header(buf, pos, "interface" if kw == b"interface" else "module")
+            units.append(unit)
+        elif unit is None:
+            continue
+        elif kw in (b"endmodule", b"endinterface"):
+            unit = None
+        elif kw in SV_DIRECTIONS:
+            run = SV_PORT_RUN.match(buf, m.start())
+            declarations = run and sv_plain_declarations(SV_PORT_DECLARATION, buf, m.start(), run.end(), widths)
+            if declarations:
+                unit['ports'].extend(declarations)
+                pos = run.end()
+                continue
+            tokens, pos = sv_tokens(buf, pos, b";")
+            width, names = sv_declaration(tokens)
+            unit['ports'].extend((SV_DIRECTIONS[kw], width, name) for name in names)
+        elif kw in (b"parameter", b"localparam"):
+            tokens, pos = sv_tokens(buf, pos, b";")
+            sv_parameters(tokens, unit['parameters'])
+        elif kw in SV_SKIP_BLOCKS:
+            skip_until = SV_SKIP_BLOCKS[kw]
+        elif kw in (b"import", b"export"):
+            # DPI imports and exports have a function prototype without a body
+            dpi = SV_DPI_IMPORT.match(buf, pos)
+            if dpi:
+                pos = dpi.end()
+        elif kw == b"modport":
+            pos = sv_tokens(buf, pos, b";")[1]
+        else:
+            # A signal declaration inside an interface
+            run = SV_SIGNAL_RUN.match(buf, m.start())
+            declarations = run and sv_plain_declarations(SV_SIGNAL_DECLARATION, buf, m.start(), run.end(), widths)
+            if declarations:
+                unit['signals'].extend(declarations)
+                pos = run.end()
+                continue
+            tokens, pos = sv_tokens(buf, pos, b";")
+            width, names = sv_declaration([kw] + tokens)
+            unit['signals'].extend((kw.decode(), width, name) for name in names)
+    return units
+
+@contextmanager
+def stage_timer(timings, stage):
+    """
+    Context manager that appends the wall and CPU time of its block to timings as {'stage', 'wall_s', 'cpu_s'}.
+    The CPU time includes finished child processes, so vlog and vsim are accounted for. Nothing is recorded if timings is None.
+    parameters:
+    timings: The list collecting the stage records, or None.
+    stage: The name of the stage, e.g. "parse" or "render:driver".
+    """
+    if timings is None:
+        yield
+        return
+    wall_start = time.perf_counter()
+    cpu_start = os.times()
+    try:
+        yield
+    finally:
+        cpu_end = os.times()
+        cpu = sum(cpu_end[i] - cpu_start[i] for i in range(4))
+        timings.append({'stage': stage, 'wall_s': time.perf_counter() - wall_start, 'cpu_s': cpu})
+
+def write_timings(filename, timings, command=None, stream=None):
+    """
+    Function to write the JSON timing report with the stage records and their totals.
+    parameters:
+    filename: The JSON file.
+    timings: The list of stage records collected by stage_timer.
+    command: The command line of the invocation, recorded in the report.
+    stream: The stream of the message, the standard output by default.
+    """
+    report = {
+        'command': command,
+        'total_wall_s': sum(record['wall_s'] for record in timings),
+        'total_cpu_s': sum(record['cpu_s'] for record in timings),
+        'stages': timings,
+    }
+    with open(filename, 'w') as file:
+        json.dump(report, file, indent=2)
+    print(f"{filename} has been created.", file=stream)
+
+def design_parse(filename, signals=True):
+    """
+    The function that parses every module and interface of a sv design file in a single pass.
+    Small files are read at once, big files (e.g. flattened netlists) are scanned through mmap so they are never copied into memory.
+    Returns the list of unit dicts, see sv_parse_buffer.
+    parameters:
+    filename: The sv design file.
+    signals: Collects the signals of the interfaces when True.
+    """
+    with open(filename, 'rb') as file:
+        if os.fstat(file.fileno()).st_size < SV_MMAP_THRESHOLD:
+            return sv_parse_buffer(file.read(), signals)
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            return sv_parse_buffer(buf, signals)
+
+def design_scan(filename):
+    """
+    The funtion that will parse sv module and return module name, ports with their respectuve directions, and the interface name.
+    The first module and the first interface of the file are used. See design_parse for all the units of a file.
+    parameter: the sv design file (first command line argument)
+    """
+    units = design_parse(filename, signals=False)
+
+    # The first module is the design, the first interface is used by the testbench
+    module = next((unit for unit in units if unit['kind'] == "module"), None)
+    if module is None:
+        raise ValueError(f"No module found in {filename}")
+    interface = next((unit for unit in units if unit['kind'] == "interface"), None)
+    interface_name = interface['name'] if interface else None
+
+    return module['name'], module['ports'], interface_name
+
+# One letter per direction for the port columns of the IR cache
+DIRECTION_CODES = {"input": "i", "output": "o", "inout": "b", "ref": "r"}
+
+class DesignIR:
+    """
+    The intermediate representation of a design: the first module of a file with its parameters, its ports and the name of the
+    first interface. See design_ir. The ports are the (direction, width, name) tuples of design_scan, which the generators unpack
+    at C speed; the vector files resolve the widths of their few ports with port_width_bits.
+    """
+    __slots__ = ("name", "ports", "parameters", "interface_name")
+
+    def __init__(self, name, ports, parameters, interface_name):
+        self.name = name
+        self.ports = ports
+        self.parameters = parameters
+        self.interface_name = interface_name
+
+    def to_dict(self):
+        """
+        Function to return the IR as a dict of plain values for the JSON cache.
+        The ports are stored in columns and the widths as indexes into a table of the distinct widths, which keeps big netlists compact.
+        """
+        widths = {}
+        for direction, width, name in self.ports:
+            widths.setdefault(width, len(widths))
+        return {'name': self.name, 'parameters': self.parameters, 'interface_name': self.interface_name,
+                'widths': list(widths),
+                'directions': "".join(DIRECTION_CODES[direction] for direction, width, name in self.ports),
+                'width_index': [widths[width] for direction, width, name in self.ports],
+                'names': [name for direction, width, name in self.ports]}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Function to rebuild the IR from the dict of to_dict.
+        parameters:
+        data: The dict.
+        """
+        directions = {code: direction for direction, code in DIRECTION_CODES.items()}
+        widths = data['widths']
+        ports = [(directions[direction], widths[index], name)
+                 for direction, index, name in zip(data['directions'], data['width_index'], data['names'])]
+        return cls(data['name'], ports, data['parameters'], data['interface_name'])
+
+# The directory of the cached design IRs, one JSON file per design file content
+IR_CACHE_DIR = ".uvmgen_cache"
+
+def ir_cache_dir(output):
+    """
+    Function to return the IR cache directory next to the generated files, so the cache stays out of the current directory.
+    parameters:
+    output: The output directory, or an archive file whose directory holds the cache.
+    """
+    if output.endswith((".tar", ".tar.gz", ".tgz", ".zip")):
+        output = os.path.dirname(output) or "."
+    return os.path.join(output, IR_CACHE_DIR)
+
+def units_ir(units, source):
+    """
+    Function to build the DesignIR from the units of design_parse or sv_parse_buffer. Raises ValueError if there is no module.
+    parameters:
+    units: The list of unit dicts.
+    source: The name of the design source for the error message.
+    """
+    module = next((unit for unit in units if unit['kind'] == "module"), None)
+    if module is None:
+        raise ValueError(f"No module found in {source}")
+    interface = next((unit for unit in units if unit['kind'] == "interface"), None)
+    return module_ir(module, interface['name'] if interface else None)
+
+def module_ir(module, interface_name):
+    """
+    Function to build the DesignIR of a module unit and the name of its interface.
+    parameters:
+    module: The unit dict of the module, see sv_parse_buffer.
+    interface_name: The name of the interface used by the testbench, or None.
+    """
+    return DesignIR(module['name'], list(module['ports']), module['parameters'], interface_name)
+
+def design_ir(filename, cache_dir=IR_CACHE_DIR):
+    """
+    Function to return the DesignIR of a sv design file. The IR is cached under the hash of the file content, so repeated
+    invocations on the same design skip the parsing. Raises ValueError if the file has no module.
+    parameters:
+    filename: The sv design file.
+    cache_dir: The directory of the cache. None parses without the cache.
+    """
+    cache_file = None
+    if cache_dir is not None:
+        cache_file = os.path.join(cache_dir, f"{file_hash(filename)}.json")
+        try:
+            with open(cache_file, 'r') as file:
+                data = json.load(file)
+            # Entries written by another version of the generator may come from a different parser
+            if data.get('generator_version') == generator_version():
+                return DesignIR.from_dict(data)
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    ir = units_ir(design_parse(filename, signals=False), filename)
+
+    if cache_file is not None:
+        data = ir.to_dict()
+        data['generator_version'] = generator_version()
+        os.makedirs(cache_dir, exist_ok=True)
+        # Written to a file of this process first, so parallel workers never read a partial entry
+        # json.dumps runs in the C encoder, json.dump to a file would encode in Python
+        with open(f"{cache_file}.{os.getpid()}.tmp", 'w') as file:
+            file.write(json.dumps(data))
+        os.replace(f"{cache_file}.{os.getpid()}.tmp", cache_file)
+    return ir
+
+# The persistent symbol index of the filelists, one entry per source file with its modules and interfaces
+INDEX_FILE = os.path.join(IR_CACHE_DIR, "index.json")
+# Below this number of files to rescan the index scans in this process, the process pool costs more than it saves
+INDEX_PARALLEL_MIN = 16
+# Filelist options that take the next token as their argument and are not source files
+FILELIST_ARG_OPTIONS = {"-y", "-L", "-work", "-top", "-l", "-timescale"}
+# Interface names tried for a module "alu": alu_if, alu_intf, ...
+INTERFACE_SUFFIXES = ("_if", "_intf", "_interface", "_bus")
+
+def read_filelist(filename, seen=None):
+    """
+    Function to return the source files of a .f filelist in order and without duplicates.
+    Comments (// and #), environment variables ($VAR, ${VAR}), nested filelists (-f, -F) and library files (-v) are supported.
+    Other options like +incdir+, +define+ or -y dir are skipped. Relative paths are relative to the filelist.
+    parameters:
+    filename: The filelist.
+    seen: The set of the filelists already read, guards against filelists that include each other.
+    """
+    seen = set() if seen is None else seen
+    seen.add(os.path.abspath(filename))
+    base_dir = os.path.dirname(filename)
+    with open(filename, 'r') as file:
+        tokens = [token for line in file for token in line.split("//")[0].split("#")[0].split()]
+
+    sources = []
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        i += 1
+        argument = None
+        if token in ("-f", "-F", "-v") or token in FILELIST_ARG_OPTIONS:
+            if i == len(tokens):
+                break
+            argument = os.path.expandvars(tokens[i])
+            argument = argument if os.path.isabs(argument) else os.path.join(base_dir, argument)
+            i += 1
+        if token in ("-f", "-F"):
+            if os.path.abspath(argument) not in seen:
+                sources.extend(read_filelist(argument, seen))
+        elif token == "-v":
+            sources.append(argument)
+        elif not token.startswith(("-", "+")):
+            path = os.path.expandvars(token)
+            sources.append(path if os.path.isabs(path) else os.path.join(base_dir, path))
+    return list(dict.fromkeys(os.path.normpath(source) for source in sources))
+
+def index_scan_file(filename):
+    """
+    Function executed by the indexer, possibly in a worker process. Returns the modules and interfaces of a file as plain values.
+    parameters:
+    filename: The sv source file.
+    """
+    return [{'kind': unit['kind'], 'name': unit['name'], 'ports': [list(port) for port in unit['ports']],
+             'parameters': unit['parameters']} for unit in design_parse(filename, signals=False)]
+
+def design_index(files, index_file=INDEX_FILE, workers=None, verbose=False):
+    """
+    Function to return the symbol index of a list of source files as a dict of absolute path to entry, in the order of the files.
+    Every entry records the mtime, size and hash of the file and its units (see index_scan_file). The index is kept in index_file,
+    so a file is only scanned again when its mtime or size changed and its hash differs. Many changed files are scanned in parallel.
+    parameters:
+    files: The sv source files, e.g. from read_filelist.
+    index_file: The persistent index. None indexes without it.
+    workers: The number of worker processes. Defaults to the number of cores.
+    verbose: Prints how many files were scanned.
+    """
+    entries = {}
+    if index_file is not None:
+        try:
+            with open(index_file, 'r') as file:
+                data = json.load(file)
+            # Entries written by another version of the generator may come from a different parser
+            if data.get('generator_version') == generator_version():
+                entries = data['files']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    paths = list(dict.fromkeys(os.path.abspath(filename) for filename in files))
+    changed = False
+    stale = []
+    for path in paths:
+        stat = os.stat(path)
+        entry = entries.get(path)
+        if entry and entry['mtime'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            continue
+        # A touched file with the same content keeps its units
+        digest = file_hash(path)
+        changed = True
+        if entry and entry['sha256'] == digest:
+            entry['mtime'], entry['size'] = stat.st_mtime_ns, stat.st_size
+        else:
+            entries[path] = {'mtime': stat.st_mtime_ns, 'size': stat.st_size, 'sha256': digest, 'units': None}
+            stale.append(path)
+
+    # The scanning is CPU bound, big filelists are spread over a process pool
+    if len(stale) >= INDEX_PARALLEL_MIN and workers != 1:
+        from concurrent.futures import ProcessPoolExecutor
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            scanned = list(pool.map(index_scan_file, stale, chunksize=max(1, len(stale) // (workers * 4))))
+    else:
+        scanned = [index_scan_file(path) for path in stale]
+    for path, units in zip(stale, scanned):
+        entries[path]['units'] = units
+    if verbose:
+        print(f"{len(stale)} of {len(paths)} files scanned.")
+
+    if index_file is not None and changed:
+        # Files that are gone are dropped, the files of other filelists are kept
+        entries = {path: entry for path, entry in entries.items() if entry['units'] is not None and os.path.exists(path)}
+        os.makedirs(os.path.dirname(index_file) or ".", exist_ok=True)
+        with open(f"{index_file}.{os.getpid()}.tmp", 'w') as file:
+            file.write(json.dumps({'generator_version': generator_version(), 'files': entries}))
+        os.replace(f"{index_file}.{os.getpid()}.tmp", index_file)
+    return {path: entries[path] for path in paths}
+
+def resolve_interface(module_name, module_file, interfaces):
+    """
+    Function to pick the interface of a module from the interfaces of an index. Returns its name or None.
+    The interface named after the module (see INTERFACE_SUFFIXES) wins, then the first interface of the file of the module,
+    then the only interface of the index.
+    parameters:
+    module_name: The name of the module.
+    module_file: The file that defines the module.
+    interfaces: The list of (file, name) tuples of the interfaces.
+    """
+    names = [name for path, name in interfaces]
+    for suffix in INTERFACE_SUFFIXES:
+        if module_name + suffix in names:
+            return module_name + suffix
+    same_file = [name for path, name in interfaces if path == module_file]
+    if same_file:
+        return same_file[0]
+    return names[0] if len(names) == 1 else None
+
+def index_design_ir(index, top=None):
+    """
+    Function to return the DesignIR of a top module of an index and the file that defines it. Its interface may come from any file.
+    Raises ValueError if the module is not found.
+    parameters:
+    index: The index of design_index.
+    top: The name of the top module. Defaults to the first module of the first file.
+    """
+    modules = [(path, unit) for path, entry in index.items() for unit in entry['units'] if unit['kind'] == "module"]
+    if not modules:
+        raise ValueError("No module found in the index")
+    if top is not None:
+        matches = [(path, unit) for path, unit in modules if unit['name'] == top]
+        if not matches:
+            names = sorted({unit['name'] for path, unit in modules})
+            raise ValueError(f"Module {top} not found in the index, available: {', '.join(names[:20])}" + (", ..." if len(names) > 20 else ""))
+        modules = matches
+    # Like the simulators, the first definition of a module wins
+    path, module = modules[0]
+    interfaces = [(path, unit['name']) for path, entry in index.items() for unit in entry['units'] if unit['kind'] == "interface"]
+    return module_ir(module, resolve_interface(module['name'], path, interfaces)), path
+
+def content_hash(data):
+    """
+    Function to return the sha256 hex digest of a string or bytes object.
+    parameters:
+    data: The content to hash.
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    return hashlib.sha256(data).hexdigest()
+
+def file_hash(filename):
+    """
+    Function to return the sha256 hex digest of a file. The file is read in chunks so big designs are not loaded at once.
+    parameters:
+    filename: The file to hash.
+    """
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+@functools.lru_cache(maxsize=None)
+def generator_version():
+    """
+    Function to return the version string of the generator recorded in the manifest.
+    It combines GENERATOR_VERSION with the hash of this source file, computed once per process.
+    """
+    return f"{GENERATOR_VERSION}+{file_hash(__file__)[:12]}"
+
+def load_manifest(output_dir):
+    """
+    Function to load the regeneration manifest of an output directory. Returns an empty manifest if there is none or it is unreadable.
+    parameters:
+    output_dir: The directory holding the generated files.
+    """
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), 'r') as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+def save_manifest(output_dir, manifest):
+    """
+    Function to save the regeneration manifest of an output directory. The manifest is replaced atomically.
+    parameters:
+    output_dir: The directory holding the generated files.
+    manifest: The manifest dict.
+    """
+    manifest_file = os.path.join(output_dir, MANIFEST_NAME)
+    os.makedirs(output_dir, exist_ok=True)
+    with open(manifest_file + ".tmp", 'w') as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+    os.replace(manifest_file + ".tmp", manifest_file)
+
+def write_if_changed(filename, content):
+    """
+    Function to write a file only when its content differs from what is already on disk, so unchanged files keep their mtime.
+    The content goes to a temporary file that is renamed over the target, so a crash never leaves a partially written file.
+    Returns True if the file was written.
+    parameters:
+    filename: The file to write.
+    content: The new content of the file, a string or bytes.
+    """
+    mode = 'b' if isinstance(content, bytes) else ''
+    try:
+        with open(filename, 'r' + mode) as file:
+            if file.read() == content:
+                return False
+    except (OSError, UnicodeDecodeError):
+        pass
+    temp_file = f"{filename}.{os.getpid()}.tmp"
+    with open(temp_file, 'w' + mode) as file:
+        file.write(content)
+    os.replace(temp_file, filename)
+    return True
+
+class OutputSink:
+    """
+    The destination of the generated files. Sinks that are not incremental get every selected file rendered, without a manifest.
+    Names are relative paths with forward slashes. A sink is closed when it is used as a context manager.
+    """
+    incremental = False
+
+    def write(self, name, content):
+        """
+        Function to store a file. Returns True if it was written, False if it was unchanged.
+        parameters:
+        name: The relative name of the file.
+        content: A string or bytes.
+        """
+        raise NotImplementedError
+
+    def write_blocks(self, name, blocks):
+        """
+        Function to store a file given as an iterable of bytes blocks, e.g. the vector files.
+        parameters:
+        name: The relative name of the file.
+        blocks: An iterable of bytes.
+        """
+        self.write(name, b"".join(blocks))
+
+    def close(self):
+        """
+        Function to finish the sink.
+        """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class DirectorySink(OutputSink):
+    """
+    Writes every file into a directory with temporary files and renames, and keeps the regeneration manifest there.
+    """
+    incremental = True
+
+    def __init__(self, output_dir="."):
+        self.output_dir = output_dir
+
+    def write(self, name, content):
+        filename = os.path.join(self.output_dir, name)
+        os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+        return write_if_changed(filename, content)
+
+    def write_blocks(self, name, blocks):
+        # Streamed to the temporary file, so big vector files are never held in memory at once
+        filename = os.path.join(self.output_dir, name)
+        os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+        temp_file = f"{filename}.{os.getpid()}.tmp"
+        with open(temp_file, 'wb') as file:
+            for block in blocks:
+                file.write(block)
+        os.replace(temp_file, filename)
+
+class MemorySink(OutputSink):
+    """
+    Collects the files in the dict files, e.g. to hand the testbench of a batch worker to the process that writes the archive.
+    """
+
+    def __init__(self):
+        self.files = {}
+
+    def write(self, name, content):
+        changed = self.files.get(name) != content
+        self.files[name] = content
+        return changed
+
+class ArchiveSink(OutputSink):
+    """
+    Writes every file into one tar (.tar, .tar.gz, .tgz) or zip (.zip) archive with one sequential write.
+    The archive is built under a temporary name and renamed on close, so a crash never leaves a partial archive behind.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.temp_file = f"{filename}.{os.getpid()}.tmp"
+        os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+        # The archive modules are only needed by this sink
+        self.zip = filename.endswith(".zip")
+        if self.zip:
+            import zipfile
+            self.archive = zipfile.ZipFile(self.temp_file, 'w', zipfile.ZIP_DEFLATED)
+        elif filename.endswith((".tar", ".tar.gz", ".tgz")):
+            import tarfile
+            self.archive = tarfile.open(self.temp_file, 'w:gz' if filename.endswith("gz") else 'w')
+        else:
+            raise ValueError(f"Unknown archive type of {filename}, use .tar, .tar.gz, .tgz or .zip")
+
+    def write(self, name, content):
+        data = content.encode() if isinstance(content, str) else content
+        if self.zip:
+            self.archive.writestr(name, data)
+        else:
+            import io
+            import tarfile
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            self.archive.addfile(info, io.BytesIO(data))
+        return True
+
+    def close(self):
+        if self.archive is not None:
+            self.archive.close()
+            self.archive = None
+            os.replace(self.temp_file, self.filename)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # A failed batch drops the temporary archive instead of publishing it
+        if exc_type is None:
+            self.close()
+        elif self.archive is not None:
+            self.archive.close()
+            self.archive = None
+            os.remove(self.temp_file)
+
+class StdoutSink(OutputSink):
+    """
+    Streams every file to the standard output after a header line with its name, e.g. to pipe a testbench into another tool.
+    """
+
+    def write(self, name, content):
+        text = content.decode() if isinstance(content, bytes) else content
+        sys.stdout.write(f"// ===== {name} =====\n{text}")
+        if not text.endswith("\n"):
+            sys.stdout.write("\n")
+        return True
+
+# Operators allowed in the constant expressions of port widths, e.g. "[WIDTH-1:0]" or "[$clog2(DEPTH)-1:0]"
+SV_CONST_OPERATORS = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.FloorDiv: operator.floordiv,
+    ast.Div: operator.floordiv, ast.Mod: operator.mod, ast.Pow: operator.pow, ast.LShift: operator.lshift,
+    ast.RShift: operator.rshift, ast.BitAnd: operator.and_, ast.BitOr: operator.or_, ast.BitXor: operator.xor,
+    ast.USub: operator.neg, ast.UAdd: operator.pos, ast.Invert: operator.invert,
+}
+# Sized and based literals like 8'hFF or 'd10
+SV_BASED_LITERAL = re.compile(r"\d*\s*'[sS]?([bBoOdDhH])\s*([0-9a-fA-F_]+)")
+SV_LITERAL_BASES = {'b': 2, 'o': 8, 'd': 10, 'h': 16}
+# Names of clock and reset ports. They are not stimulus and are never used as operands of the golden models.
+SV_CLOCK_PORT = re.compile(r'(?i)^(?:clk|clock|aclk|clk_i|clk_in)$|_(?:clk|clock)$')
+SV_RESET_PORT = re.compile(r'(?i)^(?:rst|reset|aresetn|rst_n|rst_ni|rstn|reset_n)$|_(?:rst|rst_n|rstn|reset)$')
+# Vector files are written in blocks of this many vectors so the memory stays bounded for millions of vectors
+VECTOR_BLOCK = 1 << 18
+
+def sv_const_eval(expr, parameters=None, depth=0):
+    """
+    Function to evaluate a constant sv expression of a port width. Returns None if it cannot be resolved.
+    parameters:
+    expr: The expression, e.g. "WIDTH-1".
+    parameters: A dict of parameter names and their value expressions, see design_parse.
+    depth: The nesting of parameters referring to other parameters. Used to stop at cycles.
+    """
+    parameters = parameters or {}
+    expr = SV_BASED_LITERAL.sub(lambda match: str(int(match.group(2).replace("_", ""), SV_LITERAL_BASES[match.group(1).lower()])), expr)
+    expr = expr.replace("$clog2", "clog2")
+    try:
+        tree = ast.parse(expr.strip(), mode='eval')
+    except (SyntaxError, ValueError):
+        return None
+
+    # Walking the tree with the allowed nodes only, the expression is never executed
+    def evaluate(node):
+        if isinstance(node, ast.Expression):
+            return evaluate(node.body)
+        if isinstance(node, ast.Constant) and isinstance(node.value, int):
+            return node.value
+        if isinstance(node, ast.BinOp) and type(node.op) in SV_CONST_OPERATORS:
+            left, right = evaluate(node.left), evaluate(node.right)
+            if left is None or right is None or (isinstance(node.op, (ast.Div, ast.FloorDiv, ast.Mod)) and right == 0):
+                return None
+            return SV_CONST_OPERATORS[type(node.op)](left, right)
+        if isinstance(node, ast.UnaryOp) and type(node.op) in SV_CONST_OPERATORS:
+            operand = evaluate(node.operand)
+            return None if operand is None else SV_CONST_OPERATORS[type(node.op)](operand)
+        if isinstance(node, ast.Name) and node.id in parameters and depth < 16:
+            return sv_const_eval(str(parameters[node.id]), parameters, depth + 1)
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "clog2"
+                and len(node.args) == 1 and not node.keywords):
+            value = evaluate(node.args[0])
+            return None if value is None else max(value - 1, 0).bit_length()
+        return None
+
+    return evaluate(tree)
+
+def port_width_bits(width, parameters=None):
+    """
+    Function to return the number of bits of a port width like "[3:0]", "signed [W-1:0]" or "[1:0][7:0]". Returns None if it cannot be resolved.
+    parameters:
+    width: The width string of a port tuple. An empty width is a single bit.
+    parameters: A dict of parameter names and their value expressions, see design_parse.
+    """
+    bits = 1
+    for dimension in re.findall(r'\[([^\[\]]*)\]', width):
+        if ':' in dimension:
+            msb, lsb = dimension.split(':', 1)
+            msb, lsb = sv_const_eval(msb, parameters), sv_const_eval(lsb, parameters)
+            if msb is None or lsb is None:
+                return None
+            bits *= abs(msb - lsb) + 1
+        else:
+            size = sv_const_eval(dimension, parameters)
+            if size is None:
+                return None
+            bits *= size
+    return bits
+
+def vector_ports(port_lst, parameters=None):
+    """
+    Function to return the stimulus and the checked ports of a design with their widths in bits, as two lists of (port, bits).
+    Clock and reset ports are left to the testbench. Raises ValueError for a width that cannot be resolved or is wider than 64 bits.
+    parameters:
+    port_lst: The list of tuples of port description.
+    parameters: A dict of parameter names and their value expressions, see design_parse.
+    """
+    inputs, outputs = [], []
+    # The widths repeat a lot, every distinct width is resolved once
+    resolved = {}
+    for direction, width, port in port_lst:
+        if direction not in ("input", "output") or (direction == "input" and (SV_CLOCK_PORT.search(port) or SV_RESET_PORT.search(port))):
+            continue
+        if width not in resolved:
+            resolved[width] = port_width_bits(width, parameters)
+        bits = resolved[width]
+        if bits is None:
+            raise ValueError(f"Cannot resolve the width {width!r} of port {port}")
+        if bits > 64:
+            raise ValueError(f"Port {port} is {bits} bits wide, vector files support up to 64 bits")
+        (inputs if direction == "input" else outputs).append((port, bits))
+    return inputs, outputs
+
+def reset_levels(port_lst):
+    """
+    Function to return the reset inputs of a design with their deasserted level as a list of (port, level).
+    Resets with a name ending in n, like rst_n or aresetn, are active low and deasserted at 1.
+    parameters:
+    port_lst: The list of tuples of port description.
+    """
+    return [(port, 1 if port.lower().endswith(("n", "_ni")) else 0) for direction, width, port in port_lst
+            if direction == "input" and SV_RESET_PORT.search(port)]
+
+def import_numpy():
+    """
+    Function to import NumPy for the vector files. NumPy is only needed by these modes, so the generator keeps working without it.
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError("Vector files need NumPy, install it with 'pip install numpy'") from None
+    return numpy
+
+def golden_model(vectors, outputs, design_type):
+    """
+    Function to evaluate the golden models of scoreboard_gen on whole arrays and add the expected outputs to the vectors dict.
+    The uint64 arithmetic wraps and is masked to every output width. Design types without a golden model add nothing.
+    parameters:
+    vectors: A dict of input port name and numpy uint64 array.
+    outputs: The list of (port, bits) of the outputs, see vector_ports.
+    design_type: Adder and ALU have a golden model.
+    """
+    np = import_numpy()
+    design_type = design_type.lower()
+    if design_type == "adder":
+        operands = [port for port in ("a", "b") if port in vectors] or list(vectors)
+        if not operands:
+            raise ValueError("The adder golden model needs input ports")
+        expected = vectors[operands[0]].copy()
+        for port in operands[1:]:
+            expected += vectors[port]
+    elif design_type == "alu":
+        if not all(port in vectors for port in ("opcode", "op1", "op2")):
+            raise ValueError("The ALU golden model needs the input ports opcode, op1 and op2")
+        opcode, op1, op2 = vectors["opcode"], vectors["op1"], vectors["op2"]
+        expected = np.select([opcode == 0, opcode == 1, opcode == 2, opcode == 3],
+                             [op1 + op2, op1 - op2, op1 & op2, op1 | op2], np.uint64(0))
+    else:
+        return vectors
+    for port, bits in outputs:
+        vectors[port] = expected & np.uint64((1 << bits) - 1)
+    return vectors
+
+def stimulus_vectors(port_lst, design_type, count, seed=1, parameters=None):
+    """
+    Function to generate random stimulus for every input and the expected value of every output with NumPy in bulk.
+    Returns a dict of port name and numpy uint64 array. The outputs are only present for the design types with a golden model.
+    parameters:
+    port_lst: The list of tuples of port description.
+    design_type: Adder and ALU have a golden model, every other type gets stimulus only.
+    count: The number of vectors.
+    seed: The seed of the random generator, the same seed gives the same vectors.
+    parameters: A dict of parameter names and their value expressions, see design_parse.
+    """
+    np = import_numpy()
+    inputs, outputs = vector_ports(port_lst, parameters)
+    rng = np.random.default_rng(seed)
+    vectors = {port: rng.integers(0, 1 << bits, size=count, dtype=np.uint64, endpoint=False) for port, bits in inputs}
+    return golden_model(vectors, outputs, design_type)
+
+def readmemh_blocks(values, bits):
+    """
+    Function to yield an array of values as the bytes of a $readmemh file with one fixed width hex value per line.
+    The text is built with array operations in blocks, so millions of values are written without a Python loop over them.
+    parameters:
+    values: A numpy uint64 array.
+    bits: The width of the values in bits.
+    """
+    np = import_numpy()
+    digits = max(1, (bits + 3) // 4)
+    shifts = np.arange(digits - 1, -1, -1, dtype=np.uint64) * np.uint64(4)
+    hex_digits = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+    for start in range(0, len(values), VECTOR_BLOCK):
+        block = values[start:start + VECTOR_BLOCK]
+        text = np.empty((len(block), digits + 1), dtype=np.uint8)
+        text[:, :digits] = hex_digits[(block[:, None] >> shifts) & np.uint64(0xF)]
+        text[:, digits] = ord("\n")
+        yield text.tobytes()
+
+def hashed_blocks(blocks, digest):
+    """
+    Function to pass blocks of bytes through while adding them to a hashlib digest.
+    parameters:
+    blocks: An iterable of bytes.
+    digest: The hashlib object.
+    """
+    for block in blocks:
+        digest.update(block)
+        yield block
+
+def vector_files(module_name, port_lst, design_type, parameters=None):
+    """
+    Function to return the vector files of a design as a list of (filename, port, bits). Inputs get <module>_<port>.hex,
+    outputs with a golden model get <module>_<port>_exp.hex. The generated sequence and scoreboard read these names.
+    parameters:
+    module_name: The name of the design module.
+    port_lst: The list of tuples of port description.
+    design_type: Only adder and ALU have expected output files.
+    parameters: A dict of parameter names and their value expressions, see design_parse.
+    """
+    inputs, outputs = vector_ports(port_lst, parameters)
+    files = [(f"{module_name}_{port}.hex", port, bits) for port, bits in inputs]
+    if design_type.lower() in ("adder", "alu"):
+        files += [(f"{module_name}_{port}_exp.hex", port, bits) for port, bits in outputs]
+    return files
+
+# The default number of automatic bins of a coverpoint, the auto_bin_max option of a covergroup
+COVERAGE_AUTO_BIN_MAX = 64
+
+def parse_crosses(crosses, ports):
+    """
+    Function to return the crosses of a coverage plan as a list of (port, port) pairs. Raises ValueError for unknown ports.
+    parameters:
+    crosses: None, "all" for every pair of ports, or a comma separated list of pairs like "a:b,op1:opcode".
+    ports: The names of the ports that can be crossed.
+    """
+    if not crosses:
+        return []
+    if crosses == "all":
+        return [(first, second) for index, first in enumerate(ports) for second in ports[index + 1:]]
+    pairs = []
+    for item in crosses.split(","):
+        pair = tuple(port.strip() for port in item.split(":"))
+        if len(pair) != 2 or pair[0] == pair[1]:
+            raise ValueError(f"A cross is two different ports like a:b, got {item!r}")
+        unknown = [port for port in pair if port not in ports]
+        if unknown:
+            raise ValueError(f"Cannot cross unknown or non stimulus ports: {', '.join(unknown)}")
+        if pair not in pairs and pair[::-1] not in pairs:
+            pairs.append(pair)
+    return pairs
+
+def covering_array(levels, pairs):
+    """
+    Function to build a near minimal mixed level covering array with the in parameter order (IPOG) strategy.
+    Every value of every parameter appears at least once and every value combination of the given pairs appears at least once.
+    Returns a list of rows, every row is a list with one value per parameter.
+    parameters:
+    levels: The number of values of every parameter.
+    pairs: A list of (i, j) parameter index pairs whose combinations must be covered.
+    """
+    pairs = {(min(i, j), max(i, j)) for i, j in pairs}
+    partners = {index: set() for index in range(len(levels))}
+    for i, j in pairs:
+        partners[i].add(j)
+        partners[j].add(i)
+
+    # The crossed parameters are added in the order of their levels. The biggest pair is covered exhaustively at first.
+    order = sorted((index for index in partners if partners[index]), key=lambda index: -levels[index])
+    rows = [[None] * len(levels) for value in range(levels[order[0]])] if order else []
+    for value, row in enumerate(rows):
+        row[order[0]] = value
+    for position, param in enumerate(order[1:], start=1):
+        earlier = [index for index in order[:position] if index in partners[param]]
+        # The uncovered combinations of every earlier partner, as value of the partner to the set of values of param
+        uncovered = {index: {value: set(range(levels[param])) for value in range(levels[index])} for index in earlier}
+
+        # Horizontal growth: every existing row gets the value of param that covers most of the uncovered combinations
+        for number, row in enumerate(rows):
+            gains = [0] * levels[param]
+            for index in earlier:
+                if row[index] is not None:
+                    for value in uncovered[index][row[index]]:
+                        gains[value] += 1
+            best = max(gains)
+            if best == 0:
+                continue
+            # Ties are broken from a rotating start, so the values of param are spread evenly over the rows
+            start = number % levels[param]
+            value = next(value for value in list(range(start, levels[param])) + list(range(start)) if gains[value] == best)
+            row[param] = value
+            for index in earlier:
+                if row[index] is not None:
+                    uncovered[index][row[index]].discard(value)
+
+        # Vertical growth: the remaining combinations go to rows that do not care about the partner yet, or to new rows
+        for index in earlier:
+            for partner_value, values in uncovered[index].items():
+                for value in sorted(values):
+                    row = next((row for row in rows if row[param] == value and row[index] is None), None)
+                    if row is None:
+                        row = next((row for row in rows if row[param] is None and row[index] is None), None)
+                    if row is None:
+                        row = [None] * len(levels)
+                        rows.append(row)
+                    row[param], row[index] = value, partner_value
+
+    # Every value of every parameter must appear. Missing values fill the free cells first, the rest is cycled.
+    for param, level in enumerate(levels):
+        missing = sorted(set(range(level)) - {row[param] for row in rows})
+        free = [row for row in rows if row[param] is None]
+        while len(free) < len(missing):
+            free.append([None] * len(levels))
+            rows.append(free[-1])
+        for row, value in zip(free, missing):
+            row[param] = value
+    for number, row in enumerate(rows):
+        for param, level in enumerate(levels):
+            if row[param] is None:
+                row[param] = number % level
+    return rows
+
+def random_closure(bin_counts, transactions=None):
+    """
+    Function to estimate the closure of purely random stimulus over coverpoints with uniformly hit bins (coupon collector).
+    Returns (median transactions to hit every bin, expected coverage in percent after the given transactions).
+    parameters:
+    bin_counts: The number of bins of every coverpoint and cross.
+    transactions: The number of transactions the expected coverage is computed for.
+    """
+    bin_counts = [count for count in bin_counts if count > 0]
+    if not bin_counts:
+        return 0, 100.0
+    # The probability that every bin is hit after t transactions is about exp(-n exp(-t/n)) for every coverpoint
+    def all_hit(t):
+        return math.exp(-sum(count * math.exp(-t / count) for count in bin_counts))
+    low, high = 0.0, 1.0
+    while all_hit(high) < 0.5:
+        high *= 2
+    while high - low > 0.5:
+        middle = (low + high) / 2
+        low, high = (middle, high) if all_hit(middle) < 0.5 else (low, middle)
+    median = max(math.ceil(high), max(bin_counts))
+    coverage = None
+    if transactions is not None:
+        coverage = 100 * sum(1 - (1 - 1 / count) ** transactions for count in bin_counts) / len(bin_counts)
+    return median, coverage
+
+def plan_coverage(port_lst, design_type, crosses=None, auto_bin_max=COVERAGE_AUTO_BIN_MAX, seed=1, parameters=None):
+    """
+    Function to plan a near minimal directed stimulus that hits every automatic bin of the input coverpoints and of the crosses.
+    The planner works on bins, a wide bus has at most auto_bin_max bins, so the values of a port are never enumerated.
+    Returns a dict with the vectors (in the format of stimulus_vectors), the per coverpoint bins and the comparison with random stimulus.
+    parameters:
+    port_lst: The list of tuples of port description.
+    design_type: Adder and ALU also get the expected outputs and their predicted coverage.
+    crosses: None, "all" or a comma separated list of input pairs like "a:b", see parse_crosses.
+    auto_bin_max: The maximum number of automatic bins of a coverpoint.
+    seed: The seed used to pick a value inside every bin.
+    parameters: A dict of parameter names and their value expressions, see design_parse.
+    """
+    np = import_numpy()
+    inputs, outputs = vector_ports(port_lst, parameters)
+    if not inputs:
+        raise ValueError("The coverage plan needs input ports")
+    names = [port for port, bits in inputs]
+    cross_pairs = parse_crosses(crosses, names)
+    levels = [min(1 << bits, auto_bin_max) for port, bits in inputs]
+    rows = np.array(covering_array(levels, [(names.index(first), names.index(second)) for first, second in cross_pairs]),
+                    dtype=np.uint64)
+
+    # Every bin of a port is an equal range of values, a random value inside the planned bin is driven
+    rng = np.random.default_rng(seed)
+    vectors = {}
+    for column, ((port, bits), level) in enumerate(zip(inputs, levels)):
+        size = (1 << bits) // level
+        vectors[port] = rows[:, column] * np.uint64(size) + rng.integers(0, size, size=len(rows), dtype=np.uint64)
+    golden_model(vectors, outputs, design_type)
+
+    # The predicted coverage of every coverpoint and cross of the subscriber. Outputs are only known with a golden model.
+    coverpoints = {}
+    for port, bits in inputs + outputs:
+        if port in vectors:
+            level = min(1 << bits, auto_bin_max)
+            hit = len(np.unique(vectors[port] // np.uint64((1 << bits) // level)))
+            coverpoints[port] = {'bins': level, 'hit': hit, 'coverage': 100 * hit / level}
+    cross_coverage = {}
+    for first, second in cross_pairs:
+        column_first, column_second = names.index(first), names.index(second)
+        level = levels[column_first] * levels[column_second]
+        hit = len(np.unique(rows[:, column_first] * np.uint64(levels[column_second]) + rows[:, column_second]))
+        cross_coverage[f"{first}:{second}"] = {'bins': level, 'hit': hit, 'coverage': 100 * hit / level}
+
+    planned = [coverpoints[port]['bins'] for port in names] + [cross['bins'] for cross in cross_coverage.values()]
+    random_transactions, random_coverage = random_closure(planned, len(rows))
+    items = list(coverpoints.values()) + list(cross_coverage.values())
+    return {
+        'count': len(rows),
+        'vectors': vectors,
+        'crosses': cross_pairs,
+        'auto_bin_max': auto_bin_max,
+        'spec': {'crosses': [list(pair) for pair in cross_pairs], 'auto_bin_max': auto_bin_max, 'seed': seed},
+        'coverpoints': coverpoints,
+        'cross_coverage': cross_coverage,
+        'planned_coverage': min(100 * sum(cross['hit'] for cross in cross_coverage.values()) /
+                                sum(cross['bins'] for cross in cross_coverage.values()) if cross_coverage else 100.0,
+                                *(coverpoints[port]['coverage'] for port in names)),
+        'covergroup_coverage': sum(item['coverage'] for item in items) / len(items),
+        'random_transactions': random_transactions,
+        'random_coverage': random_coverage,
+        'reduction': random_transactions / len(rows),
+    }
+
+def coverage_plan_report(plan, stream=None):
+    """
+    Function to print the predicted coverage of a coverage plan and the comparison with random stimulus.
+    parameters:
+    plan: The dict returned by plan_coverage.
+    stream: The stream of the report, the standard output by default.
+    """
+    print(f"Coverage plan: {plan['count']} directed vectors", file=stream)
+    for port, point in plan['coverpoints'].items():
+        print(f"  {port:<20} {point['hit']:>6}/{point['bins']:<6} bins {point['coverage']:6.2f}%", file=stream)
+    for name, cross in plan['cross_coverage'].items():
+        print(f"  {name:<20} {cross['hit']:>6}/{cross['bins']:<6} bins {cross['coverage']:6.2f}%", file=stream)
+    print(f"Predicted covergroup coverage: {plan['covergroup_coverage']:.2f}% (planned bins: {plan['planned_coverage']:.2f}%)",
+          file=stream)
+    print(f"Random stimulus needs about {plan['random_transactions']} transactions for the planned bins "
+          f"({plan['reduction']:.1f}x more), and reaches {plan['random_coverage']:.2f}% after {plan['count']}.", file=stream)
+
+# The shared base package and the components it replaces when a testbench is generated with it
+SHARED_BASE_PKG = "uvmgen_base_pkg"
+SHARED_COMPONENTS = ("sequencer", "agent", "env", "test")
+
+# The styles of the generated driver, monitor and scoreboard. The first one is the default.
+TB_PROFILES = ("readable", "throughput")
+# The clock of the throughput testbench top toggles every TB_CLOCK_HALF_PERIOD time units, the resets are held for TB_RESET_CYCLES
+TB_CLOCK_HALF_PERIOD = 5
+TB_RESET_CYCLES = 2
+
+# The registry of the component generators. The keys are the strings useful for naming the generated files.
+# The values take the design dict (module_name, port_lst, design_type, interface_name and the optional vectors, coverage_plan and
+# tb_profile) and render the component,
+# so only the components that are actually requested are ever rendered.
+COMPONENT_GENERATORS = {
+    'sequence_item': lambda design: sequence_item_gen(design['module_name'], design['port_lst']),
+    'sequence': lambda design: sequence_gen(design['module_name'], design.get('vectors')),
+    'sequencer': lambda design: sequencer_gen(design['module_name']),
+    'driver': lambda design: driver_gen(design['module_name'], design['interface_name'], design['port_lst'], design.get('tb_profile', "readable")),
+    'monitor': lambda design: monitor_gen(design['module_name'], design['interface_name'], design['port_lst'], design.get('tb_profile', "readable")),
+    'scoreboard': lambda design: scoreboard_gen(design['module_name'], design['port_lst'], design['design_type'], design.get('vectors'),
+                                                design.get('tb_profile', "readable")),
+    'subscribe': lambda design: subscriber_gen(design['module_name'], design['port_lst'], design.get('coverage_plan')),
+    'agent': lambda design: agent_gen(design['module_name']),
+    'env': lambda design: env_gen(design['module_name']),
+    'test': lambda design: test_gen(design['module_name']),
+    'pkg': lambda design: pkg_gen(design['module_name'], design.get('shared_lib', False)),
+    'tb': lambda design: tb_gen(design['module_name'], design['interface_name'], design['port_lst'], design.get('tb_profile', "readable")),
+}
+
+# The manifest inputs every component is rendered from, besides the module name and the generator version.
+# A change of the design only renders the components whose inputs changed, e.g. a new port leaves the agent and env alone.
+COMPONENT_INPUTS = {
+    'sequence_item': ('ports_hash',),
+    'sequence': ('ports_hash', 'design_type', 'vectors', 'coverage_plan', 'vector_files'),
+    'sequencer': (),
+    'driver': ('ports_hash', 'interface_name', 'tb_profile'),
+    'monitor': ('ports_hash', 'interface_name', 'tb_profile'),
+    'scoreboard': ('ports_hash', 'design_type', 'vectors', 'coverage_plan', 'vector_files', 'tb_profile'),
+    'subscribe': ('ports_hash', 'coverage_plan'),
+    'agent': (),
+    'env': (),
+    'test': (),
+    'pkg': ('shared_lib',),
+    'tb': ('ports_hash', 'interface_name', 'tb_profile'),
+}
+# The manifest inputs of the vector files
+VECTOR_INPUTS = ('ports_hash', 'design_type', 'vectors', 'coverage_plan', 'vector_files')
+
+def inputs_digest(inputs, keys):
+    """
+    Function to return the digest of a subset of the manifest inputs, always including the generator version.
+    parameters:
+    inputs: The manifest inputs dict.
+    keys: The keys of the inputs the digest covers.
+    """
+    return content_hash(json.dumps({key: inputs[key] for key in keys + ('generator_version',)}, sort_keys=True))
+
+def select_components(components=None):
+    """
+    Function to validate a selection of components and return it in the order of the registry.
+    parameters:
+    components: An iterable of component names or a comma separated string, e.g. "driver,monitor,tb". None selects all of them.
+    """
+    if components is None:
+        return list(COMPONENT_GENERATORS)
+    if isinstance(components, str):
+        components = [name.strip() for name in components.split(",") if name.strip()]
+    unknown = sorted(set(components) - set(COMPONENT_GENERATORS))
+    if unknown:
+        raise ValueError(f"Unknown component(s) {', '.join(unknown)}. Choose from: {', '.join(COMPONENT_GENERATORS)}")
+    return [name for name in COMPONENT_GENERATORS if name in components]
+
+class GenerationOptions:
+    """
+    The options of uvm_framework_files_gen besides the design itself. Every option has a default, so a caller only names the ones
+    it changes, e.g. GenerationOptions(output_dir="out", verbose=False). A new option is added here, not to the signature.
+    output_dir: The directory the generated files are written to. Defaults to the current working directory.
+    verbose: Prints a line for every generated file when True.
+    design_file: The sv design file. Its hash is recorded in the manifest when given.
+    force: Regenerates even if the manifest says the testbench is up to date.
+    components: The components to generate, see select_components. Defaults to all of them.
+    timings: A list that collects the time of every stage and component, see stage_timer.
+    vectors: Number of stimulus vectors precomputed with NumPy into $readmemh files. The sequence and scoreboard then use the files,
+             and the driver and monitor are the synchronized ones of the throughput profile.
+    vector_seed: The seed of the stimulus vectors.
+    parameters: A dict of the design parameters used to resolve the port widths of the vector files.
+    coverage_plan: A plan of plan_coverage. Its directed vectors replace the random ones and the subscriber gets its crosses.
+    tb_profile: One of TB_PROFILES. "readable" prints every transaction, "throughput" generates the driver, monitor and scoreboard
+                for long regressions.
+    shared_lib: The directory of the shared base package, or None. The base package is written there and the sequencer, agent,
+                env and test become typedefs in the package of the design instead of files of their own.
+                Only directory sinks write the base package, other sinks get it from their caller.
+    sink: The OutputSink the files are written to. Defaults to a DirectorySink of output_dir. Sinks that are not incremental
+          get every selected component and no manifest.
+    """
+    __slots__ = ("output_dir", "verbose", "design_file", "force", "components", "timings", "vectors", "vector_seed", "parameters",
+                 "coverage_plan", "tb_profile", "shared_lib", "sink")
+
+    def __init__(self, *, output_dir=".", verbose=True, design_file=None, force=False, components=None, timings=None, vectors=0,
+                 vector_seed=1, parameters=None, coverage_plan=None, tb_profile="readable", shared_lib=None, sink=None):
+        self.output_dir = output_dir
+        self.verbose = verbose
+        self.design_file = design_file
+        self.force = force
+        self.components = components
+        self.timings = timings
+        self.vectors = vectors
+        self.vector_seed = vector_seed
+        self.parameters = parameters
+        self.coverage_plan = coverage_plan
+        self.tb_profile = tb_profile
+        self.shared_lib = shared_lib
+        self.sink = sink
+
+def uvm_framework_files_gen(module_name, port_lst, design_type, interface_name, options=None):
+    """
+    The core function for the UVM testbench enivroment generation.
+    parameters: 
+    module_name: The name fo the design module. Parsed from the prev function
+    port_lst: A list of tuples of port definitions. Parsed from the previous function.
+    design_type: The 3rd arg. Useful for some sub functions for creation of some components. Parsed from the previous function.
+    interface_name: The interface name parsedf from the prev function. Useful for components which employes config_db.
+    options: The GenerationOptions. Defaults to all the defaults: every component into the current directory.
+    Returns the list of files that were (re)written.
+    """
+    options = options or GenerationOptions()
+    output_dir, verbose, design_file, timings = options.output_dir, options.verbose, options.design_file, options.timings
+    vectors, vector_seed, parameters, coverage_plan = options.vectors, options.vector_seed, options.parameters, options.coverage_plan
+    tb_profile, shared_lib, sink = options.tb_profile, options.shared_lib, options.sink
+
+    components = select_components(options.components)
+    if tb_profile not in TB_PROFILES:
+        raise ValueError(f"Unknown testbench profile {tb_profile!r}, available: {', '.join(TB_PROFILES)}")
+    if sink is None:
+        sink = DirectorySink(output_dir)
+    if shared_lib is not None:
+        components = [comp_name for comp_name in components if comp_name not in SHARED_COMPONENTS]
+        if sink.incremental:
+            write_base_pkg(shared_lib, verbose)
+    if coverage_plan:
+        vectors = coverage_plan['count']
+    # The vectors are checked in the order they are driven, which needs the driver and monitor synchronized to the clock or
+    # to each other. The readable ones drive in zero time and sample on a free running delay.
+    if vectors and tb_profile == "readable":
+        tb_profile = "throughput"
+    vector_list = vector_files(module_name, port_lst, design_type, parameters) if vectors else []
+
+    # The inputs that fully determine the generated testbench. Every file in the manifest records the digest of the inputs
+    # it was rendered from (see COMPONENT_INPUTS), so a component is only rendered again when its inputs changed or its file is gone.
+    with stage_timer(timings, "manifest:hash"):
+        inputs = {
+            'design_hash': file_hash(design_file) if design_file else None,
+            'ports_hash': content_hash(json.dumps([list(port) for port in port_lst])),
+            'interface_name': interface_name,
+            'design_type': design_type,
+            'generator_version': generator_version(),
+            'vectors': [vectors, vector_seed] if vectors else None,
+            'coverage_plan': coverage_plan['spec'] if coverage_plan else None,
+            'tb_profile': tb_profile,
+            'shared_lib': shared_lib is not None,
+            'vector_files': vector_list or None,
+        }
+        digests = {comp_name: inputs_digest(inputs, COMPONENT_INPUTS[comp_name]) for comp_name in components}
+        vectors_digest = inputs_digest(inputs, VECTOR_INPUTS)
+    with stage_timer(timings, "manifest:load"):
+        manifest = load_manifest(output_dir) if sink.incremental else {}
+    entry = manifest.get(module_name, {})
+    files = entry.get('files', {})
+    if not options.force and sink.incremental:
+        components = [comp_name for comp_name in components
+                      if not isinstance(files.get(f"{module_name}_{comp_name}.sv"), dict)
+                      or files[f"{module_name}_{comp_name}.sv"].get('inputs') != digests[comp_name]
+                      or not os.path.exists(os.path.join(output_dir, f"{module_name}_{comp_name}.sv"))]
+        vector_list = [vector_file for vector_file in vector_list
+                       if not isinstance(files.get(vector_file[0]), dict) or files[vector_file[0]].get('inputs') != vectors_digest
+                       or not os.path.exists(os.path.join(output_dir, vector_file[0]))]
+        if not components and not vector_list:
+            if verbose:
+                print(f"{module_name} testbench is up to date. Use --force to regenerate.")
+            return []
+
+    # Generates the files and prints on the terminal about their generation. Files with identical content are not rewritten.
+    design = {'module_name': module_name, 'port_lst': port_lst, 'design_type': design_type, 'interface_name': interface_name,
+              'tb_profile': tb_profile, 'shared_lib': shared_lib is not None}
+    if vectors:
+        design['vectors'] = {'count': vectors, 'files': inputs['vector_files'], 'resets': reset_levels(port_lst)}
+    if coverage_plan:
+        design['coverage_plan'] = coverage_plan
+    written = []
+
+    # The stimulus and expected values are computed in bulk and only when one of the vector files is stale
+    if vector_list:
+        with stage_timer(timings, "vectors:compute"):
+            values = coverage_plan['vectors'] if coverage_plan else stimulus_vectors(port_lst, design_type, vectors, vector_seed, parameters)
+        for filename, port, bits in vector_list:
+            digest = hashlib.sha256()
+            with stage_timer(timings, f"vectors:write:{port}"):
+                sink.write_blocks(filename, hashed_blocks(readmemh_blocks(values[port], bits), digest))
+            files[filename] = {'sha256': digest.hexdigest(), 'inputs': vectors_digest}
+            written.append(filename)
+            if verbose:
+                print(os.path.normpath(os.path.join(output_dir, filename)), "has been created.")
+    for comp_name in components:
+        with stage_timer(timings, f"render:{comp_name}"):
+            sv_file = COMPONENT_GENERATORS[comp_name](design)
+        filename = f"{module_name}_{comp_name}.sv"
+        files[filename] = {'sha256': content_hash(sv_file), 'inputs': digests[comp_name]}
+        with stage_timer(timings, f"write:{comp_name}"):
+            changed = sink.write(filename, sv_file)
+        if changed:
+            written.append(filename)
+            if verbose:
+                print(os.path.normpath(os.path.join(output_dir, filename)), "has been created.")
+        elif verbose:
+            print(os.path.normpath(os.path.join(output_dir, filename)), "is unchanged.")
+
+    if sink.incremental:
+        manifest[module_name] = {'inputs': inputs, 'files': files}
+        # The base package may be shared from another directory, e.g. the output root of a batch. The run path compiles it from there.
+        if shared_lib is not None:
+            manifest[module_name]['base_pkg'] = os.path.relpath(os.path.join(shared_lib, f"{SHARED_BASE_PKG}.sv"), output_dir)
+        with stage_timer(timings, "manifest:save"):
+            save_manifest(output_dir, manifest)
+    return written
+
+def generate(path=None, design_type="basic_framework", components=None, tb_profile="readable", vectors=0, vector_seed=1,
+             shared_lib=False, source=None):
+    """
+    The Python API of the generator. Renders the testbench of a design in memory and returns a dict of file name to source.
+    Nothing is printed and nothing is written, neither the files nor the manifest or the IR cache, so the function can be called
+    repeatedly and concurrently from one process. Raises ValueError if the design has no module, or unless exactly one of path
+    and source is given.
+    parameters:
+    path: The path of the sv design file, as str or os.PathLike.
+    design_type: The design type, e.g. "Adder" or "ALU".
+    components: The components to generate, see select_components. Defaults to all of them.
+    tb_profile: One of TB_PROFILES.
+    vectors: Number of precomputed stimulus vectors, see GenerationOptions. Needs NumPy.
+    vector_seed: The seed of the stimulus vectors.
+    shared_lib: Adds the shared base package and generates the sequencer, agent, env and test as thin specializations of it.
+    source: The sv source of the design as str or bytes, instead of a path.
+    """
+    if (path is None) == (source is None):
+        raise ValueError("Give either the path or the source of the design")
+    # The source is scanned from memory, a path the same way as on the command line but without the IR cache
+    if source is not None:
+        ir = units_ir(sv_parse_buffer(source.encode() if isinstance(source, str) else source, signals=False), "the design source")
+    else:
+        ir = design_ir(os.fspath(path), cache_dir=None)
+
+    sink = MemorySink()
+    if shared_lib:
+        sink.write(f"{SHARED_BASE_PKG}.sv", base_pkg_gen())
+    uvm_framework_files_gen(ir.name, ir.ports, design_type, ir.interface_name,
+                            GenerationOptions(verbose=False, components=components, vectors=vectors, vector_seed=vector_seed,
+                                              parameters=ir.parameters, tb_profile=tb_profile, shared_lib="." if shared_lib else None,
+                                              sink=sink))
+    # The vector files are rendered as bytes, every file is returned as text
+    return {name: content.decode() if isinstance(content, bytes) else content for name, content in sink.files.items()}
+
+def sequence_item_gen(module_name, port_lst):
+    """
+    Function to generate the sequence_item responsibe for containing the transactions.
+    parameters:
+    module_name: The name of the design module.
+    port_lst: The list of tuples of port description.
+    """
+
+    # Logic for making a string of port declarations. The pieces are joined once so the cost stays linear in the number of ports.
+    port_declarations = "".join(
+        f"rand bit {width} {port};\n    " if direction == "input" else f"bit {width} {port};\n    "
+        for direction, width, port in port_lst)
+
+    # Logic for facory registration
+    uvm_factory_registration = "".join(f"    `uvm_field_int({port}, UVM_ALL_ON)\n    " for direction, width, port in port_lst)
+
+    # The following content will be returned which maintains the syntax of an UVM testbench.
+    return f"""
+class {module_name}_seq_item extends uvm_sequence_item;
+
+    // Port declaration and randomizing them
+    {port_declarations}
+
+    // Add your contraints here as per the needs
+
+    function new(input string name = "{module_name}_seq_item");
+        super.new(name);
+    endfunction: new
+
+    `uvm_object_utils_begin({module_name}_seq_item)
+    {uvm_factory_registration}`uvm_object_utils_end
+
+endclass: {module_name}_seq_item
+"""
+
+def sequence_gen(module_name, vectors=None):
+    """
+    Function to generate the sequence for test case generation.
+    parameters:
+    module_name: The name of the design module.
+    vectors: A dict with the vector count and files, see uvm_framework_files_gen. The sequence then drives the stimulus of the files.
+    """
+    if vectors:
+        return vector_sequence_gen(module_name, vectors)
+    
+    return f"""
+class {module_name}_seq extends uvm_sequence #({module_name}_seq_item);
+    `uvm_object_utils({module_name}_seq)
+
+    function new(input string name = "{module_name}_seq");
+        super.new(name);
+    endfunction: new
+
+    virtual task body();
+    // A basic test case for the functionality check
+    req = {module_name}_seq_item::type_id::create("req");
+    repeat(10) begin
+        start_item(req);
+        req.randomize();
+        finish_item(req);
+        // Additional test cases here
+    end
+    endtask: body
+
+endclass: {module_name}_seq
+
+// Also, if desired, add addional sequences here for more test cases.
+"""
+
+def vector_sequence_gen(module_name, vectors):
+    """
+    Function to generate the sequence that drives the precomputed stimulus of the $readmemh vector files instead of randomizing.
+    parameters:
+    module_name: The name of the design module.
+    vectors: A dict with the vector count, the list of (filename, port, bits) of the stimulus files and the list of (port, level)
+             of the resets, which are held at their deasserted level.
+    """
+    stimulus = [(filename, port, bits) for filename, port, bits in vectors['files'] if not filename.endswith("_exp.hex")]
+
+    # Logic for the arrays that hold the vectors, loading the files and assigning one vector to every item
+    declarations = "".join(f"bit [{bits - 1}:0] {port}_vec [];\n    " for filename, port, bits in stimulus)
+    loads = "".join(f"{port}_vec = new[n_vectors];\n    $readmemh(\"{filename}\", {port}_vec);\n    "
+                    for filename, port, bits in stimulus)
+    assignments = "".join(f"req.{port} = {port}_vec[i];\n        " for filename, port, bits in stimulus)
+    # The vectors have no reset, it stays deasserted so the design runs
+    resets = "".join(f"req.{port} = {level};\n    " for port, level in vectors.get('resets', []))
+
+    return f"""
+class {module_name}_seq extends uvm_sequence #({module_name}_seq_item);
+    `uvm_object_utils({module_name}_seq)
+
+    // Stimulus precomputed by generate_uvm_tb.py, one $readmemh file per input port
+    int unsigned n_vectors = {vectors['count']};
+    {declarations}
+    function new(input string name = "{module_name}_seq");
+        super.new(name);
+    endfunction: new
+
+    virtual task body();
+    // The files are loaded once, every item only copies its vector
+    {loads}req = {module_name}_seq_item::type_id::create("req");
+    {resets}for (int unsigned i = 0; i < n_vectors; i++) begin
+        start_item(req);
+        {assignments}finish_item(req);
+    end
+    endtask: body
+
+endclass: {module_name}_seq
+
+// Also, if desired, add addional sequences here for more test cases.
+"""
+
+def sequencer_gen(module_name):
+    """
+    Function to generate the sequencer.
+    parameters:
+    module_name: The name of the design module.
+    """
+    return f"""
+class {module_name}_sequencer extends uvm_sequencer #({module_name}_seq_item);
+    `uvm_component_utils({module_name}_sequencer)
+
+    function new(input string name = "{module_name}_sequencer", uvm_component parent = null);
+        super.new(name, parent);
+    endfunction: new
+
+endclass: {module_name}_sequencer
+"""
+
+def driver_gen(module_name, interface_name, port_lst, profile="readable"):
+    """
+    Function to generate the sequence for test case generation.
+    parameters:
+    module_name: The name of the design module.
+    interface_name: interface name of the design. Used for config_db.
+    port_lst: list of tuples of ports definitions.
+    profile: "readable" prints every transaction, "throughput" generates the driver of throughput_driver_gen.
+    """
+    if profile == "throughput":
+        return throughput_driver_gen(module_name, interface_name, port_lst)
+    
+    # A logic that filters the input ports from the transaction or sequence_item to drive virtual interface.
+    interface_drive = "".join(f"vif.{port} <= req.{port};\n            " for direction, width, port in port_lst if direction == "input")
+
+    return f"""
+class {module_name}_driver extends uvm_driver#({module_name}_seq_item);
+    `uvm_component_utils({module_name}_driver)
+
+    virtual {interface_name} vif;
+
+    function new(input string name = "{module_name}_driver", uvm_component parent = null);
+        super.new(name, parent);
+    endfunction: new
+
+    virtual function void build_phase(uvm_phase phase);
+        req = {module_name}_seq_item::type_id::create("req");
+        super.build_phase(phase);
+        if (!uvm_config_db#(virtual {interface_name})::get(this, "", "vif", vif))
+            `uvm_fatal(get_type_name(), "Virtual interface not dfound in config_db");
+    endfunction: build_phase
+
+    virtual task run_phase(uvm_phase phase);
+        forever begin
+            seq_item_port.get_next_item(req);
+            // Driving logic
+            {interface_drive}
+            `uvm_info(get_type_name(), "Sent transaction to DUT-------------------------", UVM_NONE);
+            req.print();
+            seq_item_port.item_done();
+        end
+    endtask: run_phase
+endclass: {module_name}_driver
+"""
+
+def clock_port(port_lst):
+    """
+    Function to return the name of the clock input of a design, or None for a design without a clock.
+    parameters:
+    port_lst: list of tuples of ports definitions.
+    """
+    return next((port for direction, width, port in port_lst if direction == "input" and SV_CLOCK_PORT.search(port)), None)
+
+def reset_release_wait(port_lst):
+    """
+    Function to return the waits for the release of every reset of a design. The throughput driver and monitor start after them,
+    the reset sequence of tb_gen releases them.
+    parameters:
+    port_lst: list of tuples of ports definitions.
+    """
+    return "".join(f"// The testbench top releases the reset\n        wait (vif.{port} === 1'b{level});\n        "
+                   for port, level in reset_levels(port_lst))
+
+def throughput_driver_gen(module_name, interface_name, port_lst):
+    """
+    Function to generate the driver of the throughput profile. It drives on the clock edge, or signals the monitor with an
+    event after every transaction of a design without a clock. The transaction is only formatted when the verbosity asks for it.
+    The clock and the resets belong to the testbench top, the driver starts once the resets are released.
+    parameters:
+    module_name: The name of the design module.
+    interface_name: interface name of the design. Used for config_db.
+    port_lst: list of tuples of ports definitions.
+    """
+    clock = clock_port(port_lst)
+
+    # The clock and the resets belong to the testbench top, every other input is driven from the transaction
+    resets = [port for port, level in reset_levels(port_lst)]
+    interface_drive = "".join(f"vif.{port} <= req.{port};\n            " for direction, width, port in port_lst
+                              if direction == "input" and port != clock and port not in resets)
+    if clock:
+        synchronization, event_declaration, event_creation, event_trigger = f"@(posedge vif.{clock});\n            ", "", "", ""
+    else:
+        synchronization = ""
+        event_declaration = "\n    uvm_event drive_ev;\n"
+        event_creation = f"\n        drive_ev = uvm_event_pool::get_global(\"{module_name}_drive\");"
+        event_trigger = "// The design settles for one time unit before the monitor samples it\n            #1;\n            drive_ev.trigger();\n            "
+
+    return f"""
+class {module_name}_driver extends uvm_driver#({module_name}_seq_item);
+    `uvm_component_utils({module_name}_driver)
+
+    virtual {interface_name} vif;
+{event_declaration}
+    function new(input string name = "{module_name}_driver", uvm_component parent = null);
+        super.new(name, parent);
+    endfunction: new
+
+    virtual function void build_phase(uvm_phase phase);
+        super.build_phase(phase);
+        if (!uvm_config_db#(virtual {interface_name})::get(this, "", "vif", vif))
+            `uvm_fatal(get_type_name(), "Virtual interface not dfound in config_db");{event_creation}
+    endfunction: build_phase
+
+    virtual task run_phase(uvm_phase phase);
+        {reset_release_wait(port_lst)}forever begin
+            seq_item_port.get_next_item(req);
+            // Driving logic
+            {synchronization}{interface_drive}{event_trigger}// The message is only formatted when the verbosity is UVM_HIGH or above
+            `uvm_info(get_type_name(), $sformatf("Sent transaction to DUT\\n%s", req.sprint()), UVM_HIGH)
+            seq_item_port.item_done();
+        end
+    endtask: run_phase
+endclass: {module_name}_driver
+"""
+
+def monitor_gen(module_name, interface_name, port_lst, profile="readable"):
+    """
+    Function to generate the monitor class for receiving response from the DUT.
+    parameters:
+    module_name: The name of the design module.
+    interface_name: interface name of the design. Used for config_db.
+    port_lst: list of tuples of ports definitions.
+    profile: "readable" samples every #10 and prints every transaction, "throughput" generates the monitor of throughput_monitor_gen.
+    """
+    if profile == "throughput":
+        return throughput_monitor_gen(module_name, interface_name, port_lst)
+    
+    # A logic that filters the input ports to collect response from the interface.
+    monitor_logic = "".join(f"tr.{port} = vif.{port};\n            " for direction, width, port in port_lst)
+
+    return f"""
+class {module_name}_monitor extends uvm_monitor;
+    `uvm_component_utils({module_name}_monitor)
+
+    {module_name}_seq_item tr;
+    virtual {interface_name} vif;
+
+    uvm_analysis_port #({module_name}_seq_item) aport;
+
+    function new(input string name = "{module_name}_monitor", uvm_component parent = null);
+        super.new(name, parent);
+        aport = new("aport", this);
+    endfunction: new
+
+    virtual function void build_phase(uvm_phase phase);
+        super.build_phase(phase);
+        
+        tr = {module_name}_seq_item::type_id::create("tr");
+
+        if (!uvm_config_db#(virtual {interface_name})::get(this, "", "vif", vif))
+            `uvm_fatal(get_type_name(), "Cannot find vif in the config_db");
+    endfunction: build_phase
+
+    virtual task run_phase(uvm_phase phase);
+        {module_name}_seq_item tr;
+        forever begin
+            #10;
+            // Collecting response from DUT
+            {monitor_logic}
+
+            `uvm_info(get_type_name(), "Send trans to Scoreboard", UVM_NONE);
+            tr.print();
+
+            aport.write(tr);
+        end
+    endtask: run_phase
+endclass
+"""
+
+def throughput_monitor_gen(module_name, interface_name, port_lst):
+    """
+    Function to generate the monitor of the throughput profile. It samples on the clock edge, or on the event of the driver
+    for a design without a clock, and hands a fresh transaction to the analysis port so no subscriber has to copy it.
+    The driver assigns with nonblocking assignments on the clock edge, so an edge sees the inputs of the edge before it. The monitor
+    skips the first edge and every later edge samples the transaction driven one cycle earlier, the n-th sample is the n-th item.
+    parameters:
+    module_name: The name of the design module.
+    interface_name: interface name of the design. Used for config_db.
+    port_lst: list of tuples of ports definitions.
+    """
+    clock = clock_port(port_lst)
+
+    # A logic that collects every port of the interface into the new transaction
+    monitor_logic = "".join(f"tr.{port} = vif.{port};\n            " for direction, width, port in port_lst)
+    if clock:
+        sampling, event_declaration, event_creation = f"@(posedge vif.{clock});", "", ""
+        first_sample = (f"// The first edge is the one the driver drives the first transaction on, it is sampled on the next edge\n"
+                        f"        @(posedge vif.{clock});\n        ")
+    else:
+        sampling, first_sample = "drive_ev.wait_trigger();", ""
+        event_declaration = "\n    uvm_event drive_ev;\n"
+        event_creation = f"\n        drive_ev = uvm_event_pool::get_global(\"{module_name}_drive\");"
+
+    return f"""
+class {module_name}_monitor extends uvm_monitor;
+    `uvm_component_utils({module_name}_monitor)
+
+    virtual {interface_name} vif;
+{event_declaration}
+    uvm_analysis_port #({module_name}_seq_item) aport;
+
+    function new(input string name = "{module_name}_monitor", uvm_component parent = null);
+        super.new(name, parent);
+        aport = new("aport", this);
+    endfunction: new
+
+    virtual function void build_phase(uvm_phase phase);
+        super.build_phase(phase);
+
+        if (!uvm_config_db#(virtual {interface_name})::get(this, "", "vif", vif))
+            `uvm_fatal(get_type_name(), "Cannot find vif in the config_db");{event_creation}
+    endfunction: build_phase
+
+    virtual task run_phase(uvm_phase phase);
+        {module_name}_seq_item tr;
+        {reset_release_wait(port_lst)}{first_sample}forever begin
+            {sampling}
+            // A fresh transaction for every sample, the subscribers keep the handle instead of copying it.
+            // It is constructed directly, the factory lookup is skipped on this path.
+            tr = new("tr");
+            // Collecting response from DUT
+            {monitor_logic}
+            `uvm_info(get_type_name(), $sformatf("Send trans to Scoreboard\\n%s", tr.sprint()), UVM_HIGH)
+            aport.write(tr);
+        end
+    endtask: run_phase
+endclass
+"""
+
+def scoreboard_gen(module_name, port_lst, design_type, vectors=None, profile="readable"):
+    """
+    Function to generate the scoreboard to check the test.
+    parameters:
+    module_name: The name of the design module.
+    port_lst: list of tuples of ports definitions.
+    design_type: The 3rd command line argument. 
+    vectors: A dict with the vector count and files, see uvm_framework_files_gen. The scoreboard then checks against the expected files.
+    profile: "readable" keeps the reference logic as a commented template, "throughput" generates the scoreboard of throughput_scoreboard_gen.
+    """
+    expected = [(filename, port, bits) for filename, port, bits in (vectors or {}).get('files', []) if filename.endswith("_exp.hex")]
+    if expected:
+        return vector_scoreboard_gen(module_name, vectors['count'], expected)
+    if profile == "throughput":
+        return throughput_scoreboard_gen(module_name, port_lst, design_type)
+    
+    verification_logic = ""
+    golden_reference_model = ""
+    output_ports = [port for direction, size, port in port_lst if direction == "output"]
+
+    # The following logic creates the comparision logic and the golden reference model as per the design type.
+    if design_type.lower() == "adder":
+        if output_ports:
+            golden_reference_model = f"expected_output = tr.a + tr.b;\n\t\t"
+        verification_logic = "".join(
+            f"if (tr.{port} != expected_output)\n\t"
+            f"\t\t`uvm_info(get_type_name(), \"TEST FAILED\", UVM_NONE)\t\n"
+            f"\t\telse\n\t\t\t`uvm_info(get_type_name(), \"TEST PASSED\", UVM_NONE)\n\t\t"
+            for port in output_ports)
+    elif design_type.lower() == "alu":
+        golden_reference_model = f"""
+            case (tr.opcode)
+                4'b0000: expected_output = tr.op1 + tr.op2; // ADD
+                4'b0001: expected_output = tr.op1 - tr.op2; // SUB
+                4'b0010: expected_output = tr.op1 & tr.op2; // AND
+                4'b0011: expected_output = tr.op1 | tr.op2; // OR
+                default: expected_output = 0;
+            endcase
+            """
+        verification_logic = "".join(
+            f"if (tr.{port} != expected_output)\t\n\t\t\t`uvm_info(get_type_name(), \"TEST FAILED\")\n\t\t"
+            f"else\t\n\t\t\t`uvm_info(get_type_name(), \"TEST PASSED\")\n\t\t"
+            for port in output_ports)
+    else:  # Generic template
+        verification_logic = """
+        // Add your reference verificationn logic here
+        """
+
+    return f"""
+class {module_name}_scoreboard extends uvm_scoreboard;
+    `uvm_component_utils({module_name}_scoreboard)
+
+    {module_name}_seq_item tr;
+
+    uvm_analysis_imp#({module_name}_seq_item, {module_name}_scoreboard) aimport;
+
+    function new(string name, uvm_component parent);
+        super.new(name, parent);
+        aimport = new("aimport", this);
+    endfunction: new
+
+    virtual function void build_phase(uvm_phase phase);
+        super.build_phase(phase);
+        tr = {module_name}_seq_item::type_id::create("tr");
+    endfunction: build_phase
+
+    virtual function void write(input {module_name}_seq_item t);
+        /*
+        tr = t;
+        int expected_output;
+
+        // Golden reference model
+        {golden_reference_model}
+
+        // Logic for comparision
+        {verification_logic}
+        tr.print()
+        */
+        // Additional comparison logic
+        // User can add more comparison logic here
+    endfunction
+endclass: {module_name}_scoreboard
+"""
+
+def throughput_scoreboard_gen(module_name, port_lst, design_type):
+    """
+    Function to generate the scoreboard of the throughput profile. The golden reference model is active and works on the handle
+    of the monitor without a copy. Only mismatches are reported per transaction, the passes are counted and summarized once.
+    parameters:
+    module_name: The name of the design module.
+    port_lst: list of tuples of ports definitions.
+    design_type: The 3rd command line argument. 
+    """
+    outputs = [(width, port) for direction, width, port in port_lst if direction == "output"]
+
+    # The following logic creates the golden reference model of every output as per the design type.
+    if design_type.lower() == "adder":
+        golden_reference_model = "".join(f"{port}_exp = t.a + t.b;\n        " for width, port in outputs)
+    elif design_type.lower() == "alu":
+        golden_reference_model = "".join(f"""case (t.opcode)
+            4'b0000: {port}_exp = t.op1 + t.op2; // ADD
+            4'b0001: {port}_exp = t.op1 - t.op2; // SUB
+            4'b0010: {port}_exp = t.op1 & t.op2; // AND
+            4'b0011: {port}_exp = t.op1 | t.op2; // OR
+            default: {port}_exp = 0;
+        endcase
+        """ for width, port in outputs)
+    else:
+        outputs = []
+        golden_reference_model = "// Add your reference verificationn logic here\n        "
+
+    # The expected values have the width of their output, so the comparison truncates like the design does
+    declarations = "".join(f"bit {width} {port}_exp;\n        " for width, port in outputs)
+    verification_logic = "".join(
+        f"if (t.{port} != {port}_exp) begin\n"
+        f"            n_failed++;\n"
+        f"            `uvm_error(get_type_name(), $sformatf(\"TEST FAILED: {port}=%0h expected %0h\", t.{port}, {port}_exp))\n"
+        f"            return;\n        end\n        "
+        for width, port in outputs)
+
+    return f"""
+class {module_name}_scoreboard extends uvm_scoreboard;
+    `uvm_component_utils({module_name}_scoreboard)
+
+    int unsigned n_passed;
+    int unsigned n_failed;
+
+    uvm_analysis_imp#({module_name}_seq_item, {module_name}_scoreboard) aimport;
+
+    function new(string name, uvm_component parent);
+        super.new(name, parent);
+        aimport = new("aimport", this);
+    endfunction: new
+
+    virtual function void write(input {module_name}_seq_item t);
+        {declarations}
+        // Golden reference model
+        {golden_reference_model}
+        // Logic for comparision
+        {verification_logic}n_passed++;
+    endfunction
+
+    virtual function void report_phase(uvm_phase phase);
+        super.report_phase(phase);
+        `uvm_info(get_type_name(), $sformatf("%0d transactions passed, %0d failed", n_passed, n_failed), UVM_NONE)
+        if (n_failed == 0)
+            `uvm_info(get_type_name(), "TEST PASSED", UVM_NONE)
+    endfunction: report_phase
+endclass: {module_name}_scoreboard
+"""
+
+def vector_scoreboard_gen(module_name, count, expected):
+    """
+    Function to generate the scoreboard that compares every transaction with the expected values of the $readmemh vector files.
+    The golden model already ran in Python, so the simulator only compares. The n-th transaction of the monitor is checked against
+    the n-th vector, the throughput monitor samples one cycle after the drive to keep them in line.
+    parameters:
+    module_name: The name of the design module.
+    count: The number of vectors.
+    expected: The list of (filename, port, bits) of the expected output files.
+    """
+
+    # Logic for the arrays of expected values, loading them and comparing every output of a transaction
+    declarations = "".join(f"bit [{bits - 1}:0] {port}_exp [];\n    " for filename, port, bits in expected)
+    loads = "".join(f"{port}_exp = new[n_vectors];\n        $readmemh(\"{filename}\", {port}_exp);\n        "
+                    for filename, port, bits in expected)
+    verification_logic = "".join(
+        f"if (tr.{port} != {port}_exp[n_checked]) begin\n"
+        f"\t\t\t\tn_failed++;\n"
+        f"\t\t\t\t`uvm_error(get_type_name(), $sformatf(\"TEST FAILED: vector %0d {port}=%0h expected %0h\", n_checked, tr.{port}, {port}_exp[n_checked]))\n"
+        f"\t\t\tend\n\t\t\telse\n\t\t\t\t`uvm_info(get_type_name(), \"TEST PASSED\", UVM_HIGH)\n\t\t\t"
+        for filename, port, bits in expected)
+
+    return f"""
+class {module_name}_scoreboard extends uvm_scoreboard;
+    `uvm_component_utils({module_name}_scoreboard)
+
+    {module_name}_seq_item tr;
+
+    // Expected values precomputed by generate_uvm_tb.py, one $readmemh file per output port
+    int unsigned n_vectors = {count};
+    int unsigned n_checked;
+    int unsigned n_failed;
+    {declarations}
+    uvm_analysis_imp#({module_name}_seq_item, {module_name}_scoreboard) aimport;
+
+    function new(string name, uvm_component parent);
+        super.new(name, parent);
+        aimport = new("aimport", this);
+    endfunction: new
+
+    virtual function void build_phase(uvm_phase phase);
+        super.build_phase(phase);
+        tr = {module_name}_seq_item::type_id::create("tr");
+        {loads}
+    endfunction: build_phase
+
+    virtual function void write(input {module_name}_seq_item t);
+        tr = t;
+        // Logic for comparision with the next expected vector
+        if (n_checked < n_vectors) begin
+            {verification_logic}
+        end
+        n_checked++;
+    endfunction
+
+    virtual function void report_phase(uvm_phase phase);
+        super.report_phase(phase);
+        // Every vector has to reach the scoreboard, a shorter run did not check all of them
+        if (n_checked < n_vectors)
+            `uvm_error(get_type_name(), $sformatf("Only %0d of %0d vectors were checked", n_checked, n_vectors))
+        `uvm_info(get_type_name(), $sformatf("%0d vectors checked, %0d mismatches", n_checked < n_vectors ? n_checked : n_vectors, n_failed), UVM_NONE)
+    endfunction: report_phase
+endclass: {module_name}_scoreboard
+"""
+
+def subscriber_gen(module_name, port_lst, coverage_plan=None):
+    """
+    Function to generate the subscriber object file for coverages.
+    parameters:
+    module_name: The name of the design module.
+    design_type: The 3rd command line argument. 
+    coverage_plan: A plan of plan_coverage. Its crosses and auto_bin_max are added to the covergroup.
+    """
+    
+    coverage_logic = "".join(f"\t{port.upper()}\t:\tcoverpoint {port};\n\t" for direction, width, port in port_lst)
+    # The crosses and the bin limit the directed vectors were planned for
+    if coverage_plan:
+        coverage_logic += "".join(f"\t{first.upper()}_X_{second.upper()}\t:\tcross {first.upper()}, {second.upper()};\n\t"
+                                  for first, second in coverage_plan['crosses'])
+        if coverage_plan['auto_bin_max'] != COVERAGE_AUTO_BIN_MAX:
+            coverage_logic = f"option.auto_bin_max = {coverage_plan['auto_bin_max']};\n\t" + coverage_logic
+
+    return f"""
+class {module_name}_subscribe extends uvm_subscribe #({module_name}_seq_item);
+    `uvm_component_utils({module_name}_subscribe)
+
+    {module_name}_seq_item req;
+
+    real cov;
+
+    // A basic coverpoint for all the signals. If needed, modify as per the needs.
+    covergroup {module_name}_cg;
+    option.per_instance = 2;
+    {coverage_logic}endgroup: {module_name}_cg
+    
+    // Ad more additional covergroups with coverpoints here
+
+    function new(input string name = {module_name}_subscribe, uvm_component parent = null);
+        super.new(name, parent);
+
+        req = {module_name}_seq_item::tyep_id::create("req");
+
+        {module_name}_cd = new();
+
+        //Create an object of your additional covergroup here.
+    endfunction: new
+
+    virtual function void write(input {module_name}_seq_item t);
+        `uvm_info(get_type_name(), "Reading data from monitor for coverage", UVM_NONE);
+        t.print;
+        req = t;
+
+        {module_name}.sample();
+        cov = {module_name}.get_coverage();
+        `uvm_info(get_full_name(), $sformatf("Coverage is %0d", cov), UVM_NONE);
+    
+    endfunction: write
+
+endclass: {module_name}_subscribe
+"""
+
+def agent_gen(module_name):
+    """
+    Function to generate the agent object.
+    parameters:
+    module_name: The name of the design module.
+    """
+    
+    return f"""
+class {module_name}_agent extends uvm_agent;
+    `uvm_component_utils({module_name}_agent)
+
+    {module_name}_sequencer seqr;
+    {module_name}_driver drv;
+    {module_name}_monitor mon;
+
+    function new(input string name = "{module_name}_agent", uvm_component parent = null);
+        super.new(name, parent);
+    endfunction: new
+
+    virtual function void build_phase(uvm_phase phase);
+        super.build_phase(phase);
+        seqr = {module_name}_sequencer::type_id::create("seqr", this);
+        drv = {module_name}_driver::type_id::create("drv", this);
+        mon = {module_name}_monitor::type_id::create("mon", this);
+    endfunction: build_phase
+
+    virtual function void connect_phase(uvm_phase phase);
+        super.connect_phase(phase);
+        drv.seq_item_port.connect(seqr.seq_item_export);
+    endfunction: connect_phase
+
+endclass: {module_name}_agent
+"""
+
+def env_gen(module_name):
+    """
+    Function to generate the environment object.
+    parameters:
+    module_name: The name of the design module.
+    """
+
+    return f"""
+class {module_name}_env extends uvm_env;
+    `uvm_component_utils({module_name}_env)
+
+    {module_name}_agent agnt;
+    {module_name}_scoreboard sb;
+   // {module_name}_subscribe subs;
+
+    function new(input string name = "{module_name}_env", uvm_component parent = null);
+        super.new(name, parent);
+    endfunction
+
+    virtual function void build_phase(uvm_phase phase);
+        super.build_phase(phase);
+        agnt = {module_name}_agent::type_id::create("agnt", this);
+        sb = {module_name}_agent::type_id::create("sb", this); 
+       // subs = {module_name}_subscribe::type_id::create("subs", this);    
+    endfunction: build_phase
+
+    virtual function void connect_phase(uvm_phase phase);
+        super.connect_phase(phase);
+        agnt.mon.aport.connect(sb.aimport);
+       // agnt.mon.aport.connect(subs.analysis_export);
+    
+    endfunction: connect_phase
+
+endclass: {module_name}_env
+"""
+
+def test_gen(module_name):
+    """
+    Function to generate the test object.
+    parameters:
+    module_name: The name of the design module.
+    """
+
+    return f"""
+class {module_name}_test extends uvm_test;
+    `uvm_component_utils({module_name}_test)
+
+    {module_name}_env env;
+    {module_name}_seq seq;
+    //declare your more sequences here if impemented.
+
+    function new(input string name = "{module_name}_test", uvm_component parent = null);
+        super.new(name, parent);
+    endfunction: new
+
+    virtual function void build_phase(uvm_phase phase);
+        super.build_phase(phase);
+        env = {module_name}_env::type_id::create("env", this);
+        seq = {module_name}_seq::type_id::create("seq", this);
+    endfunction: build_phase
+
+    virtual task run_phase(uvm_phase phase);
+        phase.raise_objection(this);
+            seq.start(env.agnt.seqr);
+            #50;
+        phase.drop_objection(this);
+    endtask: run_phase
+
+endclass: {module_name}_test
+"""
+
+def pkg_gen(module_name, shared_lib=False):
+    """
+    Function to generate the packages.
+    parameters:
+    module_name: The name of the design module.
+    shared_lib: With the shared base package the sequencer, agent, env and test are thin specializations of its classes.
+    """
+    if shared_lib:
+        return shared_pkg_gen(module_name)
+
+    return f"""
+package {module_name}_pkg;
+    import uvm_pkg::*;
+    `include "uvm_macros.svh"
+    `include "{module_name}_sequence_item.sv"
+    `include "{module_name}_sequence.sv"
+    `include "{module_name}_sequencer.sv"
+    `include "{module_name}_driver.sv"
+    `include "{module_name}_monitor.sv"
+    `include "{module_name}_scoreboard.sv"
+    `include "{module_name}_agent.sv"
+    `include "{module_name}_env.sv"
+    `include "{module_name}_test.sv"
+endpackage
+"""
+
+def shared_pkg_gen(module_name):
+    """
+    Function to generate the package of a design that uses the shared base package of base_pkg_gen.
+    Only the design specific classes are included, the rest are typedefs of the parameterized base classes.
+    parameters:
+    module_name: The name of the design module.
+    """
+
+    return f"""
+package {module_name}_pkg;
+    import uvm_pkg::*;
+    import {SHARED_BASE_PKG}::*;
+    `include "uvm_macros.svh"
+    `include "{module_name}_sequence_item.sv"
+    `include "{module_name}_sequence.sv"
+    `include "{module_name}_driver.sv"
+    `include "{module_name}_monitor.sv"
+    `include "{module_name}_scoreboard.sv"
+
+    // Thin specializations of the shared base classes
+    typedef uvmgen_sequencer #({module_name}_seq_item) {module_name}_sequencer;
+    typedef uvmgen_agent #({module_name}_seq_item, {module_name}_driver, {module_name}_monitor) {module_name}_agent;
+    typedef uvmgen_env #({module_name}_agent, {module_name}_scoreboard) {module_name}_env;
+
+    // The test is not parameterized, so run_test finds it by its name
+    class {module_name}_test extends uvmgen_test #({module_name}_env, {module_name}_seq);
+        `uvm_component_utils({module_name}_test)
+
+        function new(input string name = "{module_name}_test", uvm_component parent = null);
+            super.new(name, parent);
+        endfunction: new
+
+    endclass: {module_name}_test
+endpackage
+"""
+
+def base_pkg_gen():
+    """
+    Function to generate the shared base package. Its classes are parameterized on the sequence item and component types, so
+    the sequencer, agent, env and test are compiled once for all the designs instead of once per design.
+    """
+
+    return f"""
+package {SHARED_BASE_PKG};
+    import uvm_pkg::*;
+    `include "uvm_macros.svh"
+
+    class uvmgen_sequencer #(type T = uvm_sequence_item) extends uvm_sequencer #(T);
+        `uvm_component_param_utils(uvmgen_sequencer #(T))
+
+        function new(input string name = "uvmgen_sequencer", uvm_component parent = null);
+            super.new(name, parent);
+        endfunction: new
+
+    endclass: uvmgen_sequencer
+
+    class uvmgen_agent #(type T = uvm_sequence_item, type DRV = uvm_driver #(T), type MON = uvm_monitor) extends uvm_agent;
+        `uvm_component_param_utils(uvmgen_agent #(T, DRV, MON))
+
+        uvmgen_sequencer #(T) seqr;
+        DRV drv;
+        MON mon;
+
+        function new(input string name = "uvmgen_agent", uvm_component parent = null);
+            super.new(name, parent);
+        endfunction: new
+
+        virtual function void build_phase(uvm_phase phase);
+            super.build_phase(phase);
+            seqr = uvmgen_sequencer #(T)::type_id::create("seqr", this);
+            drv = DRV::type_id::create("drv", this);
+            mon = MON::type_id::create("mon", this);
+        endfunction: build_phase
+
+        virtual function void connect_phase(uvm_phase phase);
+            super.connect_phase(phase);
+            drv.seq_item_port.connect(seqr.seq_item_export);
+        endfunction: connect_phase
+
+    endclass: uvmgen_agent
+
+    class uvmgen_env #(type AGENT = uvm_agent, type SB = uvm_scoreboard) extends uvm_env;
+        `uvm_component_param_utils(uvmgen_env #(AGENT, SB))
+
+        AGENT agnt;
+        SB sb;
+
+        function new(input string name = "uvmgen_env", uvm_component parent = null);
+            super.new(name, parent);
+        endfunction: new
+
+        virtual function void build_phase(uvm_phase phase);
+            super.build_phase(phase);
+            agnt = AGENT::type_id::create("agnt", this);
+            sb = SB::type_id::create("sb", this);
+        endfunction: build_phase
+
+        virtual function void connect_phase(uvm_phase phase);
+            super.connect_phase(phase);
+            agnt.mon.aport.connect(sb.aimport);
+        endfunction: connect_phase
+
+    endclass: uvmgen_env
+
+    class uvmgen_test #(type ENV = uvm_env, type SEQ = uvm_sequence #(uvm_sequence_item)) extends uvm_test;
+        `uvm_component_param_utils(uvmgen_test #(ENV, SEQ))
+
+        ENV env;
+        SEQ seq;
+
+        function new(input string name = "uvmgen_test", uvm_component parent = null);
+            super.new(name, parent);
+        endfunction: new
+
+        virtual function void build_phase(uvm_phase phase);
+            super.build_phase(phase);
+            env = ENV::type_id::create("env", this);
+            seq = SEQ::type_id::create("seq", this);
+        endfunction: build_phase
+
+        virtual task run_phase(uvm_phase phase);
+            phase.raise_objection(this);
+                seq.start(env.agnt.seqr);
+                #50;
+            phase.drop_objection(this);
+        endtask: run_phase
+
+    endclass: uvmgen_test
+endpackage
+"""
+
+def write_base_pkg(output_dir, verbose=True):
+    """
+    Function to write the shared base package into a directory. Returns True if the file was written.
+    parameters:
+    output_dir: The directory that is compiled together with the design packages.
+    verbose: Prints a line when the file is written.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    filename = os.path.join(output_dir, f"{SHARED_BASE_PKG}.sv")
+    changed = write_if_changed(filename, base_pkg_gen())
+    if verbose:
+        print(os.path.normpath(filename), "has been created." if changed else "is unchanged.")
+    return changed
+
+def tb_gen(module_name, interface_name, port_lst, profile="readable"):
+
+    """
+    Function to generate top level tb.
+    parameters:
+    module_name: The name of the design module.
+    interface_name: interface name of the design. Used for config_db.
+    port_lst: list of tuples of ports definitions.
+    profile: "throughput" adds the clock generator and the reset sequence its driver and monitor synchronize to.
+    """
+    # The port connections are joined with the separating comma, so the last one gets none
+    dut_instance_logic = ", \t\t\n".join(f".{port}(vif.{port})" for direction, width, port in port_lst)
+    if dut_instance_logic:
+        dut_instance_logic += " \t\t\n"
+
+    # The throughput driver and monitor wait for the clock edges and the release of the resets, the top generates both
+    clock_reset_logic = ""
+    if profile == "throughput":
+        clock = clock_port(port_lst)
+        if clock:
+            clock_reset_logic += f"""
+    initial begin
+        vif.{clock} = 0;
+        forever #{TB_CLOCK_HALF_PERIOD} vif.{clock} = ~vif.{clock};
+    end
+"""
+        resets = reset_levels(port_lst)
+        if resets:
+            assertion = "".join(f"vif.{port} = {1 - level};\n        " for port, level in resets)
+            release = "".join(f"vif.{port} = {level};\n        " for port, level in resets)
+            # The resets are released between two edges, away from the edges the driver and monitor act on
+            delay = f"repeat ({TB_RESET_CYCLES}) @(negedge vif.{clock});" if clock else f"#{TB_RESET_CYCLES * 2 * TB_CLOCK_HALF_PERIOD};"
+            clock_reset_logic += f"""
+    initial begin
+        {assertion}{delay}
+        {release.rstrip()}
+    end
+"""
+    return f"""
+module tb_{module_name};
+    import uvm_pkg::*;
+    import {module_name}_pkg::*;
+
+
+    {interface_name} vif();
+    {module_name} dut({dut_instance_logic});
+{clock_reset_logic}
+    initial begin
+        uvm_config_db#(virtual {interface_name})::set(null, "uvm_test_top.env.agent*", "vif", vif);
+        run_test("{module_name}_test");
+    end
+endmodule
+"""
+
+# Default simulator commands of the run path. Placeholders: {module}, {lib} for the library of the design, and {do_file} for the session script.
+SIM_COMPILE_CMD = "vlog -sv {module}_pkg.sv {module}_tb.sv"
+# Testbenches generated with the shared base package compile it before the package of the design
+SIM_SHARED_COMPILE_CMD = "vlog -sv uvmgen_base_pkg.sv {module}_pkg.sv {module}_tb.sv"
+SIM_SESSION_CMD = "vsim -coverage -vopt {lib}.tb_{module} -c"
+
+def base_pkg_path(module_name, output_dir="."):
+    """
+    Function to return the path of the shared base package of a generated testbench relative to its directory, as recorded in the
+    manifest. Testbenches generated before it was recorded have the base package next to them.
+    parameters:
+    module_name: The name of the design module.
+    output_dir: The directory holding the generated files.
+    """
+    path = load_manifest(output_dir).get(module_name, {}).get('base_pkg')
+    return path if isinstance(path, str) else f"{SHARED_BASE_PKG}.sv"
+
+def default_compile_cmd(module_name, output_dir="."):
+    """
+    Function to return the default compile command template of a generated testbench, with the shared base package if the
+    manifest says the testbench was generated with it.
+    parameters:
+    module_name: The name of the design module.
+    output_dir: The directory holding the generated files.
+    """
+    inputs = load_manifest(output_dir).get(module_name, {}).get('inputs', {})
+    if not (isinstance(inputs, dict) and inputs.get('shared_lib')):
+        return SIM_COMPILE_CMD
+    return SIM_SHARED_COMPILE_CMD.replace(f"{SHARED_BASE_PKG}.sv", base_pkg_path(module_name, output_dir))
+
+def simulator_commands(module_name):
+    """
+    Function to return the commands run inside the simulator session: the simulation, the coverage report as txt and the ucdb.
+    parameters:
+    module_name: The name of the design module.
+    """
+    return [
+        "run -all",
+        f"coverage save {module_name}.ucdb",
+        f"coverage report -detail -output {module_name}_coverage_report.txt",
+        "quit -f",
+    ]
+
+def simulator_session(cmd, commands, mode="do", do_file="run.do", on_line=print):
+    """
+    Function to drive a single simulator process with all the commands and stream its output back line by line.
+    In "do" mode the commands are written to a do script passed with -do (or in place of {do_file} in cmd).
+    In "stdin" mode they are piped to the standard input of the simulator.
+    Returns the exit status of the simulator.
+    parameters:
+    cmd: The simulator command line.
+    commands: The list of simulator commands.
+    mode: "do" or "stdin".
+    do_file: The do script written in "do" mode.
+    on_line: Called with every output line of the simulator, without the line break.
+    """
+    if mode == "do":
+        with open(do_file, 'w') as file:
+            file.write("\n".join(commands) + "\n")
+        cmd = cmd.format(do_file=do_file) if "{do_file}" in cmd else f"{cmd} -do {do_file}"
+    elif mode != "stdin":
+        raise ValueError(f"Unknown simulator session mode {mode!r}, use 'do' or 'stdin'")
+
+    proc = subprocess.Popen(cmd, shell=True, stdin=subprocess.PIPE if mode == "stdin" else subprocess.DEVNULL,
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+    if mode == "stdin":
+        try:
+            proc.stdin.write("\n".join(commands) + "\n")
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass
+    for line in proc.stdout:
+        on_line(line.rstrip("\n"))
+    return proc.wait()
+
+# Default commands of the incremental compile of the run path. Placeholders: {lib}, the library of the design, and {source}.
+COMPILE_LIB_NAME = "work_{module}"
+COMPILE_LIB_CMD = "vlib {lib}"
+COMPILE_UNIT_CMD = "vlog -sv -work {lib} {source}"
+# The record of the compiled units of every design library
+COMPILE_CACHE_NAME = ".uvmgen_compile_cache.json"
+# A `include directive with the file name in quotes
+SV_INCLUDE = re.compile(r'^[ \t]*`include[ \t]+"([^"]+)"', re.M)
+
+def include_dependencies(source, output_dir="."):
+    """
+    Function to return the files a source includes, directly or through other included files, in the order they are found.
+    Files that are not in the output directory, like uvm_macros.svh, belong to the tool installation and are left out.
+    parameters:
+    source: The sv source file.
+    output_dir: The directory the included files are searched in.
+    """
+    found = []
+    pending = [source]
+    while pending:
+        with open(pending.pop(0), 'r') as file:
+            text = file.read()
+        for name in SV_INCLUDE.findall(text):
+            path = os.path.join(output_dir, name)
+            if path not in found and os.path.exists(path):
+                found.append(path)
+                pending.append(path)
+    return found
+
+def compile_units(module_name, output_dir="."):
+    """
+    Function to return the compile units of a generated testbench in compile order: the shared base package when the package
+    of the design imports it, the package with everything it includes, and the tb.
+    Raises FileNotFoundError naming the units that do not exist.
+    parameters:
+    module_name: The name of the design module.
+    output_dir: The directory holding the generated files.
+    """
+    pkg_file = os.path.join(output_dir, f"{module_name}_pkg.sv")
+    tb_file = os.path.join(output_dir, f"{module_name}_tb.sv")
+    units = []
+    if os.path.exists(pkg_file):
+        with open(pkg_file, 'r') as file:
+            if f"import {SHARED_BASE_PKG}::*;" in file.read():
+                units.append(os.path.normpath(os.path.join(output_dir, base_pkg_path(module_name, output_dir))))
+    units += [pkg_file, tb_file]
+    missing = [unit for unit in units if not os.path.exists(unit)]
+    if missing:
+        raise FileNotFoundError(f"Missing compile unit(s) of {module_name}: {', '.join(missing)}. Generate the testbench first.")
+    return units
+
+def incremental_compile(module_name, timings=None, lib_cmd=COMPILE_LIB_CMD, unit_cmd=COMPILE_UNIT_CMD, output_dir=".", force=False):
+    """
+    Function to compile a generated testbench into its own library, recompiling only the units whose inputs changed.
+    The digest of a unit covers the command, the source, its `include dependencies and the digests of the units before it,
+    because a changed package must also be recompiled into everything that imports it. Returns the list of compiled sources.
+    Raises subprocess.CalledProcessError if a command fails, the units compiled before stay recorded, and FileNotFoundError for
+    a missing compile unit, see compile_units.
+    parameters:
+    module_name: The name of the design module.
+    timings: A list that collects the time of every compile step, see stage_timer.
+    lib_cmd: The command template that creates the library ({lib}).
+    unit_cmd: The command template that compiles one unit into the library ({lib}, {source}, {module}).
+    output_dir: The directory holding the generated files. The library and the cache file are created here as well.
+    force: Recompiles every unit.
+    """
+    lib = COMPILE_LIB_NAME.format(module=module_name)
+    cache_file = os.path.join(output_dir, COMPILE_CACHE_NAME)
+    try:
+        with open(cache_file, 'r') as file:
+            cache = json.load(file)
+    except (OSError, ValueError):
+        cache = {}
+    entry = cache.get(module_name, {})
+    # The units are collected first, so a missing one is reported before anything is created
+    units = compile_units(module_name, output_dir)
+    # A removed library, or one made by other commands, is compiled from scratch
+    if force or entry.get('lib') != lib or entry.get('lib_cmd') != lib_cmd or not os.path.isdir(os.path.join(output_dir, lib)):
+        entry = {'lib': lib, 'lib_cmd': lib_cmd, 'units': {}}
+        if not os.path.isdir(os.path.join(output_dir, lib)):
+            with stage_timer(timings, "vlib"):
+                subprocess.run(lib_cmd.format(lib=lib, module=module_name), shell=True, check=True, cwd=output_dir)
+
+    compiled = []
+    digest = unit_cmd
+    for source in units:
+        name = os.path.relpath(source, output_dir)
+        digest = content_hash(json.dumps([digest, file_hash(source)] + [file_hash(dep) for dep in include_dependencies(source, output_dir)]))
+        if entry['units'].get(name) == digest:
+            continue
+        with stage_timer(timings, f"vlog:{os.path.basename(source)}"):
+            result = subprocess.run(unit_cmd.format(lib=lib, source=name, module=module_name), shell=True, cwd=output_dir)
+        if result.returncode != 0:
+            entry['units'].pop(name, None)
+        else:
+            entry['units'][name] = digest
+            compiled.append(name)
+        # The cache is saved after every unit, so a failure does not lose the units that were compiled before it
+        cache[module_name] = entry
+        with open(cache_file + ".tmp", 'w') as file:
+            json.dump(cache, file, indent=2, sort_keys=True)
+        os.replace(cache_file + ".tmp", cache_file)
+        if result.returncode != 0:
+            raise subprocess.CalledProcessError(result.returncode, unit_cmd.format(lib=lib, source=name, module=module_name))
+    return compiled
+
+def code_compilation(module_name, timings=None, compile_cmd=None, sim_cmd=SIM_SESSION_CMD, mode="do", lib_cmd=COMPILE_LIB_CMD,
+                     unit_cmd=COMPILE_UNIT_CMD, force=False):
+    """
+    Function to do the simulation check in Questa Sim ansd generate the coverage report in ucdb and convert it to txt.
+    The simulation and coverage commands all run in one simulator session, its output is streamed to the terminal and <module>_sim.log.
+    parameters:
+    module_name: The name of the design module.
+    timings: A list that collects the time of every simulator step, see stage_timer.
+    compile_cmd: A compile command template that compiles everything into the work library at once. None compiles incrementally,
+                 see incremental_compile.
+    sim_cmd: The simulator command template ({module}, {lib}, {do_file}).
+    mode: How the commands reach the simulator, "do" (do script) or "stdin" (pipe).
+    lib_cmd: The library command template of the incremental compile.
+    unit_cmd: The unit command template of the incremental compile.
+    force: Recompiles every unit of the incremental compile.
+    Returns True if the simulation ran, False on a compile or simulator error.
+    """
+    # Command to run the simulation using QuestaSim
+    lib = "work" if compile_cmd else COMPILE_LIB_NAME.format(module=module_name)
+    run_cmd = sim_cmd.replace("{module}", module_name).replace("{lib}", lib)
+
+    try:
+        if compile_cmd:
+            with stage_timer(timings, "vlog"):
+                subprocess.run(compile_cmd.format(module=module_name), shell=True, check=True)
+        else:
+            compiled = incremental_compile(module_name, timings, lib_cmd, unit_cmd, force=force)
+            if not compiled:
+                print(f"{lib} is up to date.")
+        with stage_timer(timings, "vsim"), open(f"{module_name}_sim.log", 'w') as log:
+            def on_line(line):
+                print(line)
+                log.write(line + "\n")
+            returncode = simulator_session(run_cmd, simulator_commands(module_name), mode, f"{module_name}_run.do", on_line)
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, run_cmd)
+    except subprocess.CalledProcessError as e:
+        print(f"Simuilation Error: {e}")
+        return False
+    except FileNotFoundError as e:
+        print(f"Compile Error: {e}")
+        return False
+    return True
+
+# The UVM hierarchy diagram on a letter page in points. The boxes are placed by a fraction of the page width and inches from the top.
+HIERARCHY_PAGE = (612, 792)
+HIERARCHY_INCH = 72
+HIERARCHY_BOX = (120, 30)
+HIERARCHY_POSITIONS = {
+    'test': (1 / 2, 1),
+    'sequence_item': (1 / 4, 2),
+    'env': (3 / 4, 2),
+    'scoreboard': (1 / 6, 3),
+    'agent': (1 / 2, 3),
+    'subscriber': (5 / 6, 3),
+    'sequencer': (1 / 4, 4),
+    'driver': (1 / 2, 4),
+    'monitor': (3 / 4, 4),
+}
+HIERARCHY_CONNECTIONS = [
+    ('test', 'sequence_item'),
+    ('test', 'env'),
+    ('env', 'scoreboard'),
+    ('env', 'agent'),
+    ('env', 'subscriber'),
+    ('agent', 'sequencer'),
+    ('agent', 'driver'),
+    ('agent', 'monitor'),
+]
+# The formats of the hierarchy diagram
+HIERARCHY_FORMATS = ("pdf", "svg", "dot")
+
+@functools.lru_cache(maxsize=None)
+def hierarchy_templates():
+    """
+    Function to compute the layout of the hierarchy diagram once and return its templates by format.
+    Every template holds the placeholder {module} for the name of the design, so rendering a design is a single replace.
+    The pdf template is a tuple of the drawing shared by all the pages and the text of a page.
+    """
+    width, height = HIERARCHY_PAGE
+    box_width, box_height = HIERARCHY_BOX
+    positions = {name: (x * width, height - inches * HIERARCHY_INCH) for name, (x, inches) in HIERARCHY_POSITIONS.items()}
+    lines = [(positions[start][0], positions[start][1] - box_height / 2, positions[end][0], positions[end][1] + box_height / 2)
+             for start, end in HIERARCHY_CONNECTIONS]
+
+    # The pdf coordinates start at the bottom, the svg ones at the top
+    pdf_drawing = "".join(f"{x - box_width / 2:g} {y - box_height / 2:g} {box_width:g} {box_height:g} re S\n" for x, y in positions.values())
+    pdf_drawing += "".join(f"{x1:g} {y1:g} m {x2:g} {y2:g} l S\n" for x1, y1, x2, y2 in lines)
+    pdf_text = "BT /F1 12 Tf\n" + "".join(f"1 0 0 1 {x - box_width / 2 + 5:g} {y - box_height / 4:g} Tm ({{module}}_{name}) Tj\n"
+                                        for name, (x, y) in positions.items()) + "ET\n"
+    svg = (f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">\n'
+           f'<g fill="none" stroke="black">\n'
+           + "".join(f'<rect x="{x - box_width / 2:g}" y="{height - y - box_height / 2:g}" width="{box_width}" height="{box_height}"/>\n'
+                     for x, y in positions.values())
+           + "".join(f'<line x1="{x1:g}" y1="{height - y1:g}" x2="{x2:g}" y2="{height - y2:g}"/>\n' for x1, y1, x2, y2 in lines)
+           + '</g>\n<g font-family="Helvetica" font-size="12">\n'
+           + "".join(f'<text x="{x - box_width / 2 + 5:g}" y="{height - y + box_height / 4:g}">{{module}}_{name}</text>\n'
+                     for name, (x, y) in positions.items())
+           + "</g>\n</svg>\n")
+    dot = ('digraph "{module}_uvm_hierarchy" {\n    node [shape=box];\n'
+           + "".join(f'    {name} [label="{{module}}_{name}"];\n' for name in HIERARCHY_POSITIONS)
+           + "".join(f"    {start} -> {end};\n" for start, end in HIERARCHY_CONNECTIONS) + "}\n")
+    return {'pdf': (pdf_drawing, pdf_text), 'svg': svg, 'dot': dot}
+
+def hierarchy_svg(module_name):
+    """
+    Function to return the hierarchy diagram of a design as SVG text.
+    parameters:
+    module_name: The name of the design module.
+    """
+    escaped = module_name.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
+    return hierarchy_templates()['svg'].replace("{module}", escaped)
+
+def hierarchy_dot(module_name):
+    """
+    Function to return the hierarchy diagram of a design as Graphviz DOT text.
+    parameters:
+    module_name: The name of the design module.
+    """
+    return hierarchy_templates()['dot'].replace("{module}", module_name.replace("\\", "\\\\").replace('"', '\\"'))
+
+def hierarchy_pdf(module_names):
+    """
+    Function to return a PDF with one page of hierarchy diagram per design as bytes.
+    The PDF is written directly: the boxes and lines are one form shared by all the pages, a page only adds its text.
+    parameters:
+    module_names: The names of the design modules, one page each.
+    """
+    drawing, text = hierarchy_templates()['pdf']
+    width, height = HIERARCHY_PAGE
+    # Objects 1 to 4 are the catalog, the page tree, the font and the shared drawing, then a page and its content per design
+    objects = [None, None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+               b"<< /Type /XObject /Subtype /Form /BBox [0 0 %d %d] /Length %d >>\nstream\n%s\nendstream"
+               % (width, height, len(drawing), drawing.encode())]
+    resources = b"<< /Font << /F1 3 0 R >> /XObject << /H 4 0 R >> >>"
+    kids = []
+    for module_name in module_names:
+        escaped = module_name.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+        content = ("/H Do\n" + text.replace("{module}", escaped)).encode("latin-1", "replace")
+        kids.append(f"{len(objects) + 1} 0 R")
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Resources %s /Contents %d 0 R >>"
+                       % (width, height, resources, len(objects) + 2))
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content))
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode()
+
+    # The cross reference table records the byte offset of every object
+    chunks = [b"%PDF-1.4\n"]
+    offsets = []
+    size = len(chunks[0])
+    for number, body in enumerate(objects, 1):
+        chunk = b"%d 0 obj\n%s\nendobj\n" % (number, body)
+        offsets.append(size)
+        chunks.append(chunk)
+        size += len(chunk)
+    chunks.append(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    chunks.append(b"".join(b"%010d 00000 n \n" % offset for offset in offsets))
+    chunks.append(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, size))
+    return b"".join(chunks)
+
+def hierarchy_render(module_names, fmt):
+    """
+    Function to render the hierarchy diagrams of designs in one format. Returns a dict of file name to content.
+    A pdf is a single file with a page per design, svg and dot give a file per design.
+    parameters:
+    module_names: The names of the design modules.
+    fmt: One of HIERARCHY_FORMATS.
+    """
+    if fmt == "pdf":
+        name = f"{module_names[0]}_uvm_hierarchy.pdf" if len(module_names) == 1 else "uvm_hierarchy.pdf"
+        return {name: hierarchy_pdf(module_names)}
+    render = hierarchy_svg if fmt == "svg" else hierarchy_dot
+    return {f"{module_name}_uvm_hierarchy.{fmt}": render(module_name) for module_name in module_names}
+
+def select_formats(formats):
+    """
+    Function to validate a comma separated list of diagram formats and return it as a tuple.
+    parameters:
+    formats: A string like "pdf,svg", or None for no diagram.
+    """
+    if not formats:
+        return ()
+    formats = tuple(dict.fromkeys(fmt.strip().lower() for fmt in formats.split(",") if fmt.strip()))
+    unknown = [fmt for fmt in formats if fmt not in HIERARCHY_FORMATS]
+    if unknown:
+        raise ValueError(f"Unknown diagram format(s) {', '.join(unknown)}. Choose from: {', '.join(HIERARCHY_FORMATS)}")
+    return formats
+
+def uvm_hierarchy(module_name, timings=None, formats=("pdf",)):
+    """
+    Function to generate UVM hierarchy diagram.
+    parameters:
+    module_name: The name of the design module.
+    timings: A list that collects the time of the drawing step, see stage_timer.
+    formats: The formats to write, see HIERARCHY_FORMATS.
+    """
+    with stage_timer(timings, "hierarchy:draw"):
+        for fmt in formats:
+            for filename, content in hierarchy_render([module_name], fmt).items():
+                write_if_changed(filename, content)
+                print(f"{filename} has been created")
+
+def collect_designs(target):
+    """
+    Function to expand the batch target into a sorted list of sv design files.
+    parameters:
+    target: A directory (searched recursively for *.sv), a glob pattern, a filelist or a single sv file.
+    """
+
+    # A directory is searched recursively for all the sv design files
+    if os.path.isdir(target):
+        return sorted(glob.glob(os.path.join(target, "**", "*.sv"), recursive=True))
+
+    # Anything with wildcard characters is treated as a glob pattern
+    if glob.has_magic(target):
+        return sorted(path for path in glob.glob(target, recursive=True) if os.path.isfile(path))
+
+    # A single sv design file is a batch of one
+    if target.endswith((".sv", ".v")):
+        return [target]
+
+    # Everything else is a filelist with one design per line. Paths are relative to the filelist itself.
+    designs = []
+    base_dir = os.path.dirname(target)
+    with open(target, 'r') as file:
+        for line in file:
+            line = line.split("//")[0].split("#")[0].strip()
+            if line:
+                designs.append(line if os.path.isabs(line) else os.path.join(base_dir, line))
+    return designs
+
+def batch_design_gen(sv_module, design_type, output_dir, force=False, components=None, tb_profile="readable", shared_lib=None,
+                     archive=False, cache_dir=IR_CACHE_DIR):
+    """
+    Function executed in a worker process of the batch mode. Generates the testbench of a single design.
+    Returns a tuple of the design file, a success flag, a short message for the summary, the dict of the rendered files
+    when archive is set (None otherwise) and the module name (None on failure).
+    parameters:
+    sv_module: The sv design file.
+    design_type: The design type used for every design of the batch.
+    output_dir: The directory the testbench of this design is written to.
+    force: Regenerates even if the manifest says the testbench is up to date.
+    components: The components to generate. Defaults to all of them.
+    tb_profile: The style of the driver, monitor and scoreboard, see TB_PROFILES.
+    shared_lib: The directory of the shared base package, or None. See GenerationOptions.
+    archive: Renders into memory and returns the files, so the parent process writes them into the batch archive.
+    cache_dir: The directory of the IR cache, see design_ir.
+    """
+    sink = MemorySink() if archive else None
+    try:
+        ir = design_ir(sv_module, cache_dir)
+        written = uvm_framework_files_gen(ir.name, ir.ports, design_type, ir.interface_name,
+                                          GenerationOptions(output_dir=output_dir, verbose=False, design_file=sv_module, force=force,
+                                                            components=components, tb_profile=tb_profile, shared_lib=shared_lib,
+                                                            sink=sink))
+    except Exception as e:
+        return sv_module, False, f"{type(e).__name__}: {e}", None, None
+    return sv_module, True, f"{ir.name} -> {output_dir} ({len(written)} files written)", sink.files if sink else None, ir.name
+
+def batch_generate(designs, design_type, output_root, workers=None, force=False, components=None, tb_profile="readable",
+                   shared_lib=False, archive=None, diagrams=()):
+    """
+    Function to generate the testbenches of many designs on a process pool.
+    Every design gets its own output directory named after the design file.
+    Returns the list of (design file, success flag, message) tuples in the order of the designs.
+    parameters:
+    designs: The list of sv design files.
+    design_type: The design type used for every design of the batch.
+    output_root: The directory under which the per design output directories are created.
+    workers: The number of worker processes. Defaults to the number of cores.
+    force: Regenerates even if the manifests say the testbenches are up to date.
+    components: The components to generate. Defaults to all of them.
+    tb_profile: The style of the driver, monitor and scoreboard, see TB_PROFILES.
+    shared_lib: Writes one shared base package into output_root for all the designs, see GenerationOptions.
+    archive: A .tar, .tar.gz, .tgz or .zip file that receives all the testbenches in one sequential write instead of output_root.
+    diagrams: Formats of the hierarchy diagrams, see HIERARCHY_FORMATS. The pdf is one uvm_hierarchy.pdf with a page per design,
+              svg and dot are written next to every testbench.
+    """
+    # The IR cache of the workers is shared by the whole batch and lives next to its output
+    cache_dir = ir_cache_dir(archive or output_root)
+    if archive:
+        with ArchiveSink(archive) as sink:
+            return batch_generate_into(designs, design_type, output_root, workers, force, components, tb_profile, shared_lib, sink,
+                                       diagrams, cache_dir)
+    return batch_generate_into(designs, design_type, output_root, workers, force, components, tb_profile, shared_lib, None, diagrams,
+                               cache_dir)
+
+def batch_generate_into(designs, design_type, output_root, workers, force, components, tb_profile, shared_lib, sink, diagrams=(),
+                        cache_dir=IR_CACHE_DIR):
+    """
+    Function doing the work of batch_generate. The testbenches are written into output_root, or into sink when one is given.
+    parameters:
+    sink: An OutputSink that receives every file as <design name>/<file>, or None for the per design directories.
+    cache_dir: The directory of the IR cache of the workers, see design_ir.
+    See batch_generate for the other parameters.
+    """
+
+    # The shared base package is written once before the workers start, so they find it unchanged
+    if shared_lib:
+        if sink:
+            sink.write(f"{SHARED_BASE_PKG}.sv", base_pkg_gen())
+        else:
+            write_base_pkg(output_root)
+
+    # Each design gets its own output directory. Designs with the same file name get a numbered suffix.
+    output_dirs = {}
+    used_names = set()
+    for sv_module in designs:
+        name = os.path.splitext(os.path.basename(sv_module))[0]
+        unique_name, i = name, 1
+        while unique_name in used_names:
+            unique_name = f"{name}_{i}"
+            i += 1
+        used_names.add(unique_name)
+        # In the archive the directory is the member prefix of the design
+        output_dirs[sv_module] = unique_name if sink else os.path.join(output_root, unique_name)
+
+    # The process pool machinery is only needed by the batch mode
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    results = {}
+    module_names = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(batch_design_gen, sv_module, design_type, output_dirs[sv_module], force, components, tb_profile,
+                               output_root if shared_lib else None, sink is not None, cache_dir) for sv_module in designs]
+        for future in as_completed(futures):
+            sv_module, ok, message, files, module_names[sv_module] = future.result()
+            results[sv_module] = (sv_module, ok, message)
+            # The workers only render, this process writes the archive sequentially
+            for filename, content in (files or {}).items():
+                sink.write(f"{output_dirs[sv_module]}/{filename}", content)
+            print(f"[{'OK' if ok else 'FAILED'}] {sv_module}")
+
+    # The diagrams share one layout, so they are rendered here for the whole batch in design order.
+    # The pdf goes to the root, the svg and dot files next to the testbench of every design.
+    done = [sv_module for sv_module in designs if module_names[sv_module]]
+    diagram_sink = sink or DirectorySink(output_root)
+    for fmt in diagrams if done else ():
+        if fmt == "pdf":
+            diagram_sink.write("uvm_hierarchy.pdf", hierarchy_pdf([module_names[sv_module] for sv_module in done]))
+            print(f"{os.path.join(output_root, 'uvm_hierarchy.pdf') if sink is None else 'uvm_hierarchy.pdf'} has been created.")
+            continue
+        for sv_module in done:
+            for name, content in hierarchy_render([module_names[sv_module]], fmt).items():
+                diagram_sink.write(f"{os.path.basename(output_dirs[sv_module])}/{name}", content)
+
+    return [results[sv_module] for sv_module in designs]
+
+def batch_main(argv):
+    """
+    The main function of the batch mode.
+    Usage: python generate_uvm_tb.py batch <directory|glob|filelist> [design_type] [-j N] [-o output_dir]
+    parameters:
+    argv: The command line arguments following the batch keyword.
+    """
+    parser = argparse.ArgumentParser(prog="generate_uvm_tb.py batch", description="Generate the UVM testbenches of many designs in parallel.")
+    parser.add_argument("target", help="A directory, a glob pattern or a filelist of sv design files")
+    parser.add_argument("design_type", nargs="?", default="basic_framework", help="The design type used for every design")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Number of worker processes (default: number of cores)")
+    parser.add_argument("-o", "--output-dir", default="uvm_tb_out", help="Root directory for the generated testbenches")
+    parser.add_argument("--force", action="store_true", help="Regenerate even if a testbench is up to date")
+    parser.add_argument("--only", metavar="COMPONENTS", help=f"Comma separated components to generate ({','.join(COMPONENT_GENERATORS)})")
+    parser.add_argument("--tb-profile", choices=TB_PROFILES, default=TB_PROFILES[0], help="Style of the driver, monitor and scoreboard")
+    parser.add_argument("--shared-lib", action="store_true", help=f"Write one shared {SHARED_BASE_PKG}.sv into the output directory")
+    parser.add_argument("--archive", metavar="FILE", help="Write all the testbenches into one .tar, .tar.gz, .tgz or .zip archive instead")
+    parser.add_argument("--diagram", metavar="FORMATS",
+                        help=f"Comma separated hierarchy diagram formats ({','.join(HIERARCHY_FORMATS)}), pdf is one file with a page per design")
+    args = parser.parse_args(argv)
+    try:
+        components = select_components(args.only)
+        diagrams = select_formats(args.diagram)
+    except ValueError as e:
+        parser.error(str(e))
+
+    designs = collect_designs(args.target)
+    if not designs:
+        print(f"No sv design files found for {args.target}")
+        sys.exit(1)
+
+    results = batch_generate(designs, args.design_type, args.output_dir, args.workers, args.force, components, args.tb_profile,
+                             args.shared_lib, args.archive, diagrams)
+
+    # Summary of the batch with a line per design
+    failures = [result for result in results if not result[1]]
+    print(f"\nBatch summary: {len(results) - len(failures)} succeeded, {len(failures)} failed")
+    for sv_module, ok, message in results:
+        print(f"  {'OK' if ok else 'FAILED':<6} {sv_module}: {message}")
+    if failures:
+        sys.exit(1)
+
+# Default simulator command templates of the regression runner. Placeholders: {module}, {test}, {seed}.
+# Any other simulator, or a stub script for testing, can be plugged in with --compile-cmd and --sim-cmd.
+REGRESS_COMPILE_CMD = SIM_COMPILE_CMD
+REGRESS_SIM_CMD = "vsim -c -coverage work.tb_{module} +UVM_TESTNAME={test} -sv_seed {seed} -do 'run -all; quit -f'"
+
+def sim_log_failed(log_file):
+    """
+    Function to check a simulation log for reported failures: UVM_ERROR/UVM_FATAL messages or a TEST FAILED from the scoreboard.
+    The "UVM_ERROR :    0" lines of the UVM report summary are not failures.
+    parameters:
+    log_file: The simulation log.
+    """
+    with open(log_file, 'r', errors='replace') as file:
+        for line in file:
+            if "TEST FAILED" in line or (line.startswith(("UVM_ERROR ", "UVM_FATAL ", "# UVM_ERROR ", "# UVM_FATAL ")) and " @ " in line):
+                return True
+    return False
+
+async def run_sim_job(job, sim_cmd, semaphore, timeout, retries, log_dir):
+    """
+    Coroutine that runs one simulation of the regression and fills in its status.
+    A job is retried when the simulator exits with an error or times out, not when the test itself fails.
+    parameters:
+    job: The job dict with module, test and seed. Status, returncode, attempts, wall_s (all attempts), attempt_s (the last
+         attempt) and log are added.
+    sim_cmd: The simulator command template.
+    semaphore: Caps the number of concurrent simulations.
+    timeout: The time limit of one attempt in seconds, None for no limit.
+    retries: The number of retries after a failed attempt.
+    log_dir: The directory of the per run logs.
+    """
+    import asyncio
+
+    cmd = sim_cmd.format(**job)
+    job['log'] = os.path.join(log_dir, f"{job['test']}_{job['seed']}.log")
+    async with semaphore:
+        start = time.perf_counter()
+        for attempt in range(1, retries + 2):
+            job['attempts'] = attempt
+            attempt_start = time.perf_counter()
+            with open(job['log'], 'w') as log:
+                log.write(f"# {cmd}\n")
+                log.flush()
+                # Own process group, so a timeout kills the simulator and not only the shell that started it
+                proc = await asyncio.create_subprocess_shell(cmd, stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+                try:
+                    job['returncode'] = await asyncio.wait_for(proc.wait(), timeout)
+                    job['status'] = "error" if job['returncode'] != 0 else "passed"
+                except asyncio.TimeoutError:
+                    os.killpg(proc.pid, signal.SIGKILL)
+                    await proc.wait()
+                    job['returncode'] = None
+                    job['status'] = "timeout"
+            job['attempt_s'] = time.perf_counter() - attempt_start
+            if job['status'] == "passed":
+                if sim_log_failed(job['log']):
+                    job['status'] = "failed"
+                break
+        job['wall_s'] = time.perf_counter() - start
+    print(f"[{job['status'].upper()}] {job['test']} seed {job['seed']} ({job['wall_s']:.1f} s, {job['attempts']} attempt(s))")
+    return job
+
+async def run_sim_jobs(jobs, sim_cmd, workers, timeout, retries, log_dir):
+    """
+    Coroutine that runs all the simulations of the regression with at most workers of them at a time.
+    parameters:
+    jobs: The list of job dicts.
+    sim_cmd: The simulator command template.
+    workers: The maximum number of concurrent simulations.
+    timeout: The time limit of one attempt in seconds, None for no limit.
+    retries: The number of retries after a failed attempt.
+    log_dir: The directory of the per run logs.
+    """
+    import asyncio
+
+    semaphore = asyncio.Semaphore(workers)
+    return await asyncio.gather(*(run_sim_job(job, sim_cmd, semaphore, timeout, retries, log_dir) for job in jobs))
+
+# The runtime history of the regressions: the smoothed wall time of every (design, test, seed)
+HISTORY_FILE = ".uvmgen_history.json"
+# Weight of the newest run in the smoothed wall time
+HISTORY_SMOOTHING = 0.5
+# Estimate of a job without any history, in seconds
+HISTORY_DEFAULT_S = 1.0
+
+def load_history(history_file):
+    """
+    Function to load the runtime history. Returns an empty history if there is none or it is unreadable.
+    parameters:
+    history_file: The history file.
+    """
+    try:
+        with open(history_file, 'r') as file:
+            history = json.load(file)
+        return history if isinstance(history, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def history_key(job):
+    """
+    Function to return the key of a job in the runtime history.
+    parameters:
+    job: The job dict with module, test and seed.
+    """
+    return f"{job['module']}/{job['test']}/{job['seed']}"
+
+def record_history(history_file, jobs):
+    """
+    Function to add the run times of finished jobs to the runtime history. The file is replaced atomically.
+    The last attempt of a passed or failed job is recorded as its run time. A timed out job ran for at least its time limit,
+    so its wall time is raised to that lower bound and it keeps its place at the front of the schedule. Retries and simulator
+    errors say nothing about how long the simulation takes.
+    parameters:
+    history_file: The history file.
+    jobs: The job dicts with status and attempt_s.
+    """
+    history = load_history(history_file)
+    for job in jobs:
+        if job['status'] not in ("passed", "failed", "timeout"):
+            continue
+        entry = history.setdefault(history_key(job), {'wall_s': job['attempt_s'], 'runs': 0})
+        if job['status'] == "timeout":
+            entry['wall_s'] = max(entry['wall_s'], job['attempt_s'])
+        else:
+            entry['wall_s'] += HISTORY_SMOOTHING * (job['attempt_s'] - entry['wall_s'])
+        entry['runs'] += 1
+        entry['last_s'] = job['attempt_s']
+    os.makedirs(os.path.dirname(history_file) or ".", exist_ok=True)
+    with open(f"{history_file}.{os.getpid()}.tmp", 'w') as file:
+        json.dump(history, file, indent=1, sort_keys=True)
+    os.replace(f"{history_file}.{os.getpid()}.tmp", history_file)
+
+def estimate_runtimes(history, jobs):
+    """
+    Function to return the predicted wall time of every job from the runtime history.
+    A job without history gets the mean of its test over the other seeds, else the mean of its design, else HISTORY_DEFAULT_S.
+    parameters:
+    history: The runtime history, see load_history.
+    jobs: The job dicts.
+    """
+    tests, modules = {}, {}
+    for key, entry in history.items():
+        module, test, seed = key.rsplit("/", 2)
+        tests.setdefault((module, test), []).append(entry['wall_s'])
+        modules.setdefault(module, []).append(entry['wall_s'])
+    estimates = []
+    for job in jobs:
+        entry = history.get(history_key(job))
+        samples = tests.get((job['module'], job['test'])) or modules.get(job['module'])
+        estimates.append(entry['wall_s'] if entry else sum(samples) / len(samples) if samples else HISTORY_DEFAULT_S)
+    return estimates
+
+def lpt_schedule(estimates, bins):
+    """
+    Function to split jobs into balanced bins with the longest processing time first rule: every job, longest first, goes to the
+    least loaded bin. The makespan is at most 4/3 of the optimum. Returns the list of job indexes of every bin, each longest first,
+    and the list of the predicted loads.
+    parameters:
+    estimates: The predicted wall time of every job.
+    bins: The number of bins, e.g. workers or shards.
+    """
+    import heapq
+
+    assignments = [[] for _ in range(bins)]
+    loads = [0.0] * bins
+    heap = [(0.0, index) for index in range(bins)]
+    # Ties are broken by the job index, so every host computes the same shards from the same history
+    for job in sorted(range(len(estimates)), key=lambda job: (-estimates[job], job)):
+        load, index = heapq.heappop(heap)
+        assignments[index].append(job)
+        loads[index] = load + estimates[job]
+        heapq.heappush(heap, (loads[index], index))
+    return assignments, loads
+
+def regression_jobs(module_name, tests, seeds, history_file=HISTORY_FILE, shards=1):
+    """
+    Function to return the jobs of a regression, longest first, with their predicted wall time in predicted_s.
+    With shards the jobs are split into balanced shards for separate hosts, see lpt_schedule.
+    Returns the list of the jobs of every shard.
+    parameters:
+    module_name: The name of the design module.
+    tests: The list of UVM test names.
+    seeds: The list of seeds.
+    history_file: The runtime history, None schedules without it.
+    shards: The number of shards.
+    """
+    jobs = [{'module': module_name, 'test': test, 'seed': seed} for test in tests for seed in seeds]
+    estimates = estimate_runtimes(load_history(history_file) if history_file else {}, jobs)
+    for job, estimate in zip(jobs, estimates):
+        job['predicted_s'] = estimate
+    return [[jobs[job] for job in assignment] for assignment in lpt_schedule(estimates, shards)[0]]
+
+def run_regression(module_name, tests, seeds, compile_cmd=REGRESS_COMPILE_CMD, sim_cmd=REGRESS_SIM_CMD, workers=None,
+                   timeout=None, retries=0, log_dir="regression_logs", history_file=HISTORY_FILE, jobs=None):
+    """
+    Function to compile the testbench once and run every (test, seed) simulation concurrently, longest first.
+    Returns the list of job dicts with module, test, seed, predicted_s, status (passed, failed, error or timeout), returncode,
+    attempts, wall_s, attempt_s and log, and a dict with the predicted and the actual makespan.
+    parameters:
+    module_name: The name of the design module.
+    tests: The list of UVM test names.
+    seeds: The list of seeds.
+    compile_cmd: The compile command template, run once.
+    sim_cmd: The simulator command template, run per job.
+    workers: The maximum number of concurrent simulations. Defaults to the number of cores.
+    timeout: The time limit of one simulation attempt in seconds, None for no limit.
+    retries: The number of retries after a simulator error or a timeout.
+    log_dir: The directory of the compile log and the per run logs.
+    history_file: The runtime history. It orders the jobs and records their wall times. None runs without it.
+    jobs: The jobs to run, e.g. one shard of regression_jobs. Defaults to all the tests and seeds.
+    """
+    os.makedirs(log_dir, exist_ok=True)
+
+    # Compile once for all the simulations
+    compile_log = os.path.join(log_dir, "compile.log")
+    cmd = compile_cmd.format(module=module_name)
+    with open(compile_log, 'w') as log:
+        log.write(f"# {cmd}\n")
+        log.flush()
+        result = subprocess.run(cmd, shell=True, stdout=log, stderr=subprocess.STDOUT)
+    if result.returncode != 0:
+        raise RuntimeError(f"Compilation failed with exit status {result.returncode}, see {compile_log}")
+
+    # asyncio is slow to import and only needed by the regression runner
+    import asyncio
+
+    # The semaphore admits the jobs in order, so longest first leaves no long job for the end
+    if jobs is None:
+        jobs = regression_jobs(module_name, tests, seeds, history_file)[0]
+    workers = workers or os.cpu_count() or 1
+    predicted = max(lpt_schedule([job['predicted_s'] for job in jobs], workers)[1], default=0.0)
+    start = time.perf_counter()
+    results = asyncio.run(run_sim_jobs(jobs, sim_cmd, workers, timeout, retries, log_dir))
+    makespan = {'workers': workers, 'predicted_s': predicted, 'actual_s': time.perf_counter() - start}
+    if history_file:
+        record_history(history_file, results)
+    return results, makespan
+
+def regress_main(argv):
+    """
+    The main function of the regression runner.
+    Usage: python generate_uvm_tb.py regress <sv_module> [--tests T1,T2] [--seeds N] [-j N] [--timeout S] [--retries R]
+                                             [--shards N [--shard K]]
+    parameters:
+    argv: The command line arguments following the regress keyword.
+    """
+    parser = argparse.ArgumentParser(prog="generate_uvm_tb.py regress", description="Compile once and run many tests and seeds in parallel.")
+    parser.add_argument("sv_module", help="The sv design file")
+    parser.add_argument("--tests", help="Comma separated UVM test names (default: <module>_test)")
+    parser.add_argument("--seeds", type=int, default=1, help="Run seeds 1..N for every test")
+    parser.add_argument("--seed-list", help="Comma separated seeds, overrides --seeds")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Maximum concurrent simulations (default: number of cores)")
+    parser.add_argument("--timeout", type=float, default=None, help="Time limit of one simulation in seconds")
+    parser.add_argument("--retries", type=int, default=0, help="Retries after a simulator error or timeout")
+    parser.add_argument("--log-dir", default="regression_logs", help="Directory of the per run logs")
+    parser.add_argument("--compile-cmd", help="Compile command template ({module}, default: see default_compile_cmd)")
+    parser.add_argument("--sim-cmd", default=REGRESS_SIM_CMD, help="Simulator command template ({module}, {test}, {seed})")
+    parser.add_argument("--history", default=HISTORY_FILE, help="Runtime history used to schedule longest first and updated after the run")
+    parser.add_argument("--shards", type=int, default=1, help="Split the jobs into N balanced shards for separate hosts")
+    parser.add_argument("--shard", type=int, help="Run shard K (1..N) of --shards. Without it the shards are only planned")
+    parser.add_argument("--results-db", default=RESULTS_DB, help="Store every run in this SQLite database ('' to disable)")
+    parser.add_argument("--coverage-report", metavar="TEMPLATE",
+                        help="Text coverage report of a run stored with it ({module}, {test}, {seed}, {log_dir})")
+    args = parser.parse_args(argv)
+    if args.shards < 1 or (args.shard is not None and not 1 <= args.shard <= args.shards):
+        parser.error("--shard must be between 1 and --shards")
+
+    try:
+        module_name = design_ir(args.sv_module).name
+    except ValueError as e:
+        parser.error(str(e))
+    tests = args.tests.split(",") if args.tests else [f"{module_name}_test"]
+    seeds = [int(seed) for seed in args.seed_list.split(",")] if args.seed_list else list(range(1, args.seeds + 1))
+    shards = regression_jobs(module_name, tests, seeds, args.history, args.shards)
+
+    # Sharding without a shard to run only plans: a job list per shard for the hosts
+    if args.shards > 1 and args.shard is None:
+        for number, jobs in enumerate(shards, 1):
+            print(f"Shard {number}/{args.shards}: {len(jobs)} jobs, predicted {sum(job['predicted_s'] for job in jobs):.1f} s")
+            for job in jobs:
+                print(f"  {job['test']} seed {job['seed']} ({job['predicted_s']:.1f} s)")
+        print(f"Predicted makespan: {max(sum(job['predicted_s'] for job in jobs) for jobs in shards):.1f} s on {args.shards} hosts")
+        os.makedirs(args.log_dir, exist_ok=True)
+        shards_file = os.path.join(args.log_dir, "regression_shards.json")
+        with open(shards_file, 'w') as file:
+            json.dump(shards, file, indent=2)
+        print(f"{shards_file} has been created.")
+        return
+
+    try:
+        results, makespan = run_regression(module_name, tests, seeds, args.compile_cmd or default_compile_cmd(module_name), args.sim_cmd,
+                                           args.workers, args.timeout, args.retries, args.log_dir, args.history,
+                                           shards[(args.shard or 1) - 1])
+    except RuntimeError as e:
+        print(f"Simuilation Error: {e}")
+        sys.exit(1)
+
+    results_file = os.path.join(args.log_dir, "regression_results.json")
+    with open(results_file, 'w') as file:
+        json.dump(results, file, indent=2)
+    if args.results_db:
+        store_results(args.results_db, [
+            run_record(module_name, job['test'], job['seed'], job['status'], job['log'],
+                       args.coverage_report.format(log_dir=args.log_dir, **job) if args.coverage_report else None,
+                       source="regress", wall_s=job['wall_s'], attempts=job['attempts'], returncode=job['returncode'])
+            for job in results])
+
+    # Summary of the regression per status with the runs that did not pass
+    counts = {}
+    for job in results:
+        counts[job['status']] = counts.get(job['status'], 0) + 1
+    print(f"\nRegression summary: {len(results)} runs" + (f" of shard {args.shard}/{args.shards}" if args.shard else "") + ", "
+          + ", ".join(f"{count} {status}" for status, count in sorted(counts.items())))
+    print(f"Makespan on {makespan['workers']} workers: predicted {makespan['predicted_s']:.1f} s, actual {makespan['actual_s']:.1f} s")
+    for job in results:
+        if job['status'] != "passed":
+            print(f"  {job['status'].upper():<8} {job['test']} seed {job['seed']}: {job['log']}")
+    print(f"{results_file} has been created.")
+    if args.results_db:
+        print(f"{len(results)} run(s) stored in {args.results_db}")
+    if counts.get("passed", 0) != len(results):
+        sys.exit(1)
+
+def expand_paths(targets, pattern="*"):
+    """
+    Function to expand directories (searched recursively for pattern), glob patterns and plain files into a sorted list of files.
+    parameters:
+    targets: The list of directories, glob patterns and files.
+    pattern: The file name pattern used inside directories.
+    """
+    paths = []
+    for target in targets:
+        if os.path.isdir(target):
+            paths.extend(glob.glob(os.path.join(target, "**", pattern), recursive=True))
+        elif glob.has_magic(target):
+            paths.extend(path for path in glob.glob(target, recursive=True) if os.path.isfile(path))
+        else:
+            paths.append(target)
+    return sorted(set(paths))
+
+def open_text(filename):
+    """
+    Function to open a text file for line by line reading. Files ending in .gz are decompressed on the fly.
+    parameters:
+    filename: The file to open.
+    """
+    if filename.endswith(".gz"):
+        import gzip
+        return gzip.open(filename, 'rt', errors='replace')
+    return open(filename, 'r', errors='replace')
+
+# Regular expressions for the lines of a "coverage report -detail" text report. Transcript copies start with "# ".
+COVERAGE_GROUP = re.compile(r'^(?:#\s)?\s*(TYPE|Covergroup instance)\s+(\S+)')
+COVERAGE_POINT = re.compile(r'^(?:#\s)?\s*(Coverpoint|Cross)\s+(\S+)')
+COVERAGE_BIN = re.compile(r'^(?:#\s)?\s*(ignore_bin|illegal_bin|default bin|bin)\s+(.+?)\s+(\d+)\s+(\d+|-)(?:\s|$)')
+
+def parse_coverage_report(filename, coverage=None, instances=False):
+    """
+    Function to read a detailed text coverage report line by line and add its bin hits to coverage.
+    Memory grows with the number of bins only, never with the size of the report.
+    Returns coverage, a dict mapping (covergroup, coverpoint) to a dict mapping bin names to [kind, hits, goal].
+    parameters:
+    filename: The coverage report, optionally gzipped.
+    coverage: The dict to add to. A new one is created when None.
+    instances: Also collects the per instance sections. By default only the TYPE sections are used, so hits are not counted twice.
+    """
+    if coverage is None:
+        coverage = {}
+    covergroup = None
+    bins = None
+    with open_text(filename) as file:
+        for line in file:
+            # Most lines are bins, so the cheap substring checks come first
+            if "bin" in line:
+                m = COVERAGE_BIN.match(line)
+                if m and bins is not None:
+                    kind, name, hits, goal = m.groups()
+                    entry = bins.get(name)
+                    goal = int(goal) if goal != "-" else 0
+                    if entry is None:
+                        bins[name] = [kind, int(hits), goal]
+                    else:
+                        entry[1] += int(hits)
+                        entry[2] = max(entry[2], goal)
+                    continue
+            if "Coverpoint" in line or "Cross" in line:
+                m = COVERAGE_POINT.match(line)
+                if m:
+                    bins = coverage.setdefault((covergroup, m.group(2)), {}) if covergroup else None
+                    continue
+            if "TYPE" in line or "Covergroup instance" in line:
+                m = COVERAGE_GROUP.match(line)
+                if m:
+                    covergroup = m.group(2) if m.group(1) == "TYPE" or instances else None
+                    bins = None
+    return coverage
+
+def merge_coverage(total, coverage):
+    """
+    Function to merge the bin hits of one coverage dict into another. Hits are added, goals take the maximum.
+    parameters:
+    total: The dict merged into.
+    coverage: The dict merged from.
+    """
+    for key, bins in coverage.items():
+        total_bins = total.setdefault(key, {})
+        for name, (kind, hits, goal) in bins.items():
+            entry = total_bins.get(name)
+            if entry is None:
+                total_bins[name] = [kind, hits, goal]
+            else:
+                entry[1] += hits
+                entry[2] = max(entry[2], goal)
+    return total
+
+def coverage_report_worker(filenames, instances):
+    """
+    Function executed in a worker process of merge_coverage_reports. Parses and merges a share of the reports.
+    parameters:
+    filenames: The coverage reports of this worker.
+    instances: Also collects the per instance sections.
+    """
+    coverage = {}
+    for filename in filenames:
+        parse_coverage_report(filename, coverage, instances)
+    return coverage
+
+def merge_coverage_reports(filenames, workers=1, instances=False):
+    """
+    Function to parse any number of coverage reports (e.g. one per seed) and merge them into one aggregate.
+    With more than one worker the reports are split over a process pool and the partial aggregates are merged at the end.
+    parameters:
+    filenames: The coverage reports.
+    workers: The number of worker processes.
+    instances: Also collects the per instance sections.
+    """
+    if workers <= 1 or len(filenames) < 2:
+        return coverage_report_worker(filenames, instances)
+
+    from concurrent.futures import ProcessPoolExecutor
+    shares = [filenames[i::workers] for i in range(workers)]
+    total = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for coverage in pool.map(coverage_report_worker, shares, [instances] * len(shares)):
+            merge_coverage(total, coverage)
+    return total
+
+def coverage_summary(coverage, reports=None):
+    """
+    Function to turn a coverage dict into the nested JSON structure with per coverpoint and per covergroup coverage.
+    Ignored and illegal bins are listed but do not count towards the coverage.
+    parameters:
+    coverage: The dict returned by parse_coverage_report or merge_coverage_reports.
+    reports: The number of merged reports, recorded in the summary.
+    """
+    covergroups = {}
+    for (covergroup, coverpoint), bins in sorted(coverage.items()):
+        counted = [(hits, goal) for kind, hits, goal in bins.values() if kind in ("bin", "default bin")]
+        covered = sum(1 for hits, goal in counted if hits >= max(goal, 1))
+        group = covergroups.setdefault(covergroup, {'coverpoints': {}, 'covered': 0, 'total': 0})
+        group['coverpoints'][coverpoint] = {
+            'covered': covered,
+            'total': len(counted),
+            'percent': 100.0 * covered / len(counted) if counted else 100.0,
+            'bins': {name: {'kind': kind, 'hits': hits, 'goal': goal} for name, (kind, hits, goal) in bins.items()},
+        }
+        group['covered'] += covered
+        group['total'] += len(counted)
+    for group in covergroups.values():
+        group['percent'] = 100.0 * group['covered'] / group['total'] if group['total'] else 100.0
+    return {'reports': reports, 'covergroups': covergroups}
+
+def write_coverage_csv(filename, coverage):
+    """
+    Function to write a coverage dict as CSV with one row per bin.
+    parameters:
+    filename: The CSV file.
+    coverage: The dict returned by parse_coverage_report or merge_coverage_reports.
+    """
+    import csv
+    with open(filename, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(["covergroup", "coverpoint", "kind", "bin", "hits", "goal"])
+        for (covergroup, coverpoint), bins in sorted(coverage.items()):
+            for name, (kind, hits, goal) in bins.items():
+                writer.writerow([covergroup, coverpoint, kind, name, hits, goal])
+
+def coverage_main(argv):
+    """
+    The main function of the coverage merger.
+    Usage: python generate_uvm_tb.py coverage <reports...> [--json merged.json] [--csv merged.csv] [-j N]
+    parameters:
+    argv: The command line arguments following the coverage keyword.
+    """
+    parser = argparse.ArgumentParser(prog="generate_uvm_tb.py coverage",
+                                     description="Merge detailed text coverage reports of many seeds into one aggregate.")
+    parser.add_argument("reports", nargs="+", help="Coverage reports, directories or glob patterns (.gz is supported)")
+    parser.add_argument("--pattern", default="*coverage*.txt*", help="File name pattern used inside directories")
+    parser.add_argument("--json", help="Write the merged coverage as JSON")
+    parser.add_argument("--csv", help="Write the merged bins as CSV")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="Worker processes for parsing the reports")
+    parser.add_argument("--instances", action="store_true", help="Also merge the per instance sections")
+    args = parser.parse_args(argv)
+
+    reports = expand_paths(args.reports, args.pattern)
+    if not reports:
+        print("No coverage reports found")
+        sys.exit(1)
+    coverage = merge_coverage_reports(reports, args.workers, args.instances)
+    summary = coverage_summary(coverage, len(reports))
+
+    print(f"Merged {len(reports)} coverage report(s)")
+    for covergroup, group in summary['covergroups'].items():
+        print(f"  {covergroup}: {group['percent']:.2f}% ({group['covered']}/{group['total']} bins)")
+        for coverpoint, point in group['coverpoints'].items():
+            print(f"    {coverpoint}: {point['percent']:.2f}% ({point['covered']}/{point['total']} bins)")
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(summary, file, indent=2)
+        print(f"{args.json} has been created.")
+    if args.csv:
+        write_coverage_csv(args.csv, coverage)
+        print(f"{args.csv} has been created.")
+
+# Regular expressions for the simulation logs of the generated testbenches. Transcript lines may start with "# ".
+LOG_SEVERITY = re.compile(r'^(?:#\s)?\s*(UVM_INFO|UVM_WARNING|UVM_ERROR|UVM_FATAL)\b.*?@\s*([\d.]+)\s*([a-z]*s)?\s*:')
+LOG_TABLE_RULE = re.compile(r'^(?:#\s)?\s*-{10,}\s*$')
+# The messages of the generated driver and monitor that mark one transaction
+LOG_TRANSACTION_MESSAGES = ("Sent transaction to DUT", "Send trans to Scoreboard")
+# Lines kept of the most recently printed transaction table
+LOG_TABLE_LINES = 200
+
+def analyze_sim_log(filename):
+    """
+    Function to summarize a simulation log of a generated testbench in one streaming pass and bounded memory.
+    Counts TEST PASSED/TEST FAILED and the UVM messages per severity, keeps the first UVM_ERROR/UVM_FATAL or TEST FAILED line
+    with the transaction printed last before it, and counts the driver and monitor transactions over the simulated time.
+    parameters:
+    filename: The simulation log, optionally gzipped.
+    """
+    summary = {
+        'log': filename, 'lines': 0, 'passed': 0, 'failed': 0,
+        'severities': {'UVM_INFO': 0, 'UVM_WARNING': 0, 'UVM_ERROR': 0, 'UVM_FATAL': 0},
+        'first_failure': None, 'first_failing_transaction': None,
+        'transactions': {message: 0 for message in LOG_TRANSACTION_MESSAGES},
+        'first_time': None, 'last_time': None, 'time_unit': None,
+    }
+    severities = summary['severities']
+    transactions = summary['transactions']
+    table = []
+    in_table = False
+    rules = 0
+    last_table = []
+    line_number = 0
+
+    with open_text(filename) as file:
+        for line_number, line in enumerate(file, 1):
+            # The transaction tables of print() are framed by dashed rules: header rule, header, rule, rows, closing rule.
+            # A rule only starts a table if a header row and a second rule follow, so a banner rule never hides the messages.
+            if "---------" in line and LOG_TABLE_RULE.match(line):
+                if in_table and rules == 1 and len(table) == 2:
+                    table.append(line.rstrip("\n"))
+                    rules = 2
+                elif in_table and rules == 2 and len(table) > 3:
+                    last_table = table + [line.rstrip("\n")]
+                    table = []
+                    in_table = False
+                else:
+                    table = [line.rstrip("\n")]
+                    in_table = True
+                    rules = 1
+                continue
+            # The lines of a table are buffered, but still checked for messages below. A blank line or a missing second rule
+            # ends the table.
+            if in_table:
+                if line.strip() in ("", "#") or (rules == 1 and len(table) == 2):
+                    table = []
+                    in_table = False
+                elif len(table) < LOG_TABLE_LINES:
+                    table.append(line.rstrip("\n"))
+
+            failure = False
+            if "UVM_" in line:
+                m = LOG_SEVERITY.match(line)
+                if m:
+                    severity, sim_time, unit = m.groups()
+                    severities[severity] += 1
+                    sim_time = float(sim_time)
+                    if summary['first_time'] is None:
+                        summary['first_time'] = sim_time
+                        summary['time_unit'] = unit
+                    summary['last_time'] = sim_time
+                    failure = severity in ("UVM_ERROR", "UVM_FATAL")
+                    if severity == "UVM_INFO":
+                        for message in LOG_TRANSACTION_MESSAGES:
+                            if message in line:
+                                transactions[message] += 1
+            if "TEST PASSED" in line:
+                summary['passed'] += 1
+            elif "TEST FAILED" in line:
+                summary['failed'] += 1
+                failure = True
+            if failure and summary['first_failure'] is None:
+                summary['first_failure'] = {'line': line_number, 'text': line.strip()}
+                summary['first_failing_transaction'] = (table if in_table and rules == 2 else last_table) or None
+
+    summary['lines'] = line_number
+    span = (summary['last_time'] or 0) - (summary['first_time'] or 0)
+    total = max(transactions.values())
+    summary['transactions_per_time'] = total / span if span > 0 else None
+    summary['status'] = "failed" if summary['failed'] or severities['UVM_ERROR'] or severities['UVM_FATAL'] else (
+        "passed" if summary['passed'] else "unknown")
+    return summary
+
+def analyze_sim_logs(filenames, workers=1):
+    """
+    Function to analyze many simulation logs, optionally on a process pool. Returns the list of summaries in the order of the logs.
+    parameters:
+    filenames: The simulation logs.
+    workers: The number of worker processes.
+    """
+    if workers <= 1 or len(filenames) < 2:
+        return [analyze_sim_log(filename) for filename in filenames]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(analyze_sim_log, filenames, chunksize=max(1, len(filenames) // (workers * 4))))
+
+def logs_main(argv):
+    """
+    The main function of the simulation log analyzer.
+    Usage: python generate_uvm_tb.py logs <logs...> [-j N] [--json FILE]
+    parameters:
+    argv: The command line arguments following the logs keyword.
+    """
+    parser = argparse.ArgumentParser(prog="generate_uvm_tb.py logs", description="Summarize simulation logs in a streaming pass.")
+    parser.add_argument("logs", nargs="+", help="Simulation logs, directories or glob patterns (.gz is supported)")
+    parser.add_argument("--pattern", default="*.log*", help="File name pattern used inside directories")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="Worker processes for analyzing many logs")
+    parser.add_argument("--json", help="Write the summaries as JSON")
+    args = parser.parse_args(argv)
+
+    logs = expand_paths(args.logs, args.pattern)
+    if not logs:
+        print("No simulation logs found")
+        sys.exit(1)
+    summaries = analyze_sim_logs(logs, args.workers)
+
+    for summary in summaries:
+        severities = summary['severities']
+        rate = summary['transactions_per_time']
+        print(f"[{summary['status'].upper()}] {summary['log']}: {summary['passed']} passed, {summary['failed']} failed, "
+              f"{severities['UVM_ERROR']} UVM_ERROR, {severities['UVM_FATAL']} UVM_FATAL, "
+              f"{max(summary['transactions'].values())} transactions"
+              + (f" ({rate:.3g} per {summary['time_unit'] or 'time unit'})" if rate else ""))
+        if summary['first_failure']:
+            print(f"    first failure at line {summary['first_failure']['line']}: {summary['first_failure']['text']}")
+            for table_line in summary['first_failing_transaction'] or []:
+                print(f"      {table_line}")
+
+    failed = sum(1 for summary in summaries if summary['status'] == "failed")
+    print(f"\nLog summary: {len(summaries)} log(s), {failed} failed, "
+          f"{sum(summary['passed'] for summary in summaries)} TEST PASSED, {sum(summary['failed'] for summary in summaries)} TEST FAILED")
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(summaries, file, indent=2)
+        print(f"{args.json} has been created.")
+    if failed:
+        sys.exit(1)
+
+# The results store: every regression and run path simulation with its outcome, coverage per coverpoint and stage timings
+RESULTS_DB = ".uvmgen_results.db"
+# Runs inserted per transaction
+RESULTS_BATCH = 500
+RESULTS_SCHEMA = """
+PRAGMA journal_mode = WAL;
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY, timestamp REAL NOT NULL, design TEXT NOT NULL, test TEXT, seed INTEGER, status TEXT NOT NULL,
+    source TEXT, wall_s REAL, attempts INTEGER, returncode INTEGER, tests_passed INTEGER, tests_failed INTEGER,
+    uvm_errors INTEGER, uvm_fatals INTEGER, log TEXT);
+CREATE TABLE IF NOT EXISTS coverage (
+    run_id INTEGER NOT NULL REFERENCES runs(id), covergroup TEXT NOT NULL, coverpoint TEXT NOT NULL,
+    covered INTEGER, total INTEGER, percent REAL);
+CREATE TABLE IF NOT EXISTS timings (
+    run_id INTEGER NOT NULL REFERENCES runs(id), stage TEXT NOT NULL, wall_s REAL, cpu_s REAL);
+CREATE INDEX IF NOT EXISTS runs_design ON runs(design, timestamp);
+CREATE INDEX IF NOT EXISTS runs_test ON runs(test, timestamp);
+CREATE INDEX IF NOT EXISTS runs_seed ON runs(seed);
+CREATE INDEX IF NOT EXISTS runs_status ON runs(status, timestamp);
+CREATE INDEX IF NOT EXISTS runs_timestamp ON runs(timestamp);
+CREATE INDEX IF NOT EXISTS coverage_run ON coverage(run_id);
+CREATE INDEX IF NOT EXISTS coverage_point ON coverage(covergroup, coverpoint);
+CREATE INDEX IF NOT EXISTS timings_run ON timings(run_id);
+CREATE INDEX IF NOT EXISTS timings_stage ON timings(stage);
+"""
+
+def run_record(design, test, seed=None, status=None, log=None, coverage_report=None, timings=None, source="run", wall_s=None,
+               attempts=None, returncode=None):
+    """
+    Function to collect one simulation for the results store: its outcome, the counts of its log and its coverage per coverpoint.
+    parameters:
+    design: The name of the design module.
+    test: The UVM test name.
+    seed: The seed, None if unknown.
+    status: The status of the run. Defaults to the status of the log, see analyze_sim_log, or "error" without a log.
+    log: The simulation log, read if it exists.
+    coverage_report: The detailed text coverage report, read if it exists.
+    timings: The stage records of stage_timer.
+    source: What produced the run, e.g. "run" or "regress".
+    wall_s: The wall time of the simulation.
+    attempts: The number of attempts.
+    returncode: The exit status of the simulator.
+    """
+    summary = analyze_sim_log(log) if log and os.path.exists(log) else None
+    coverpoints = []
+    if coverage_report and os.path.exists(coverage_report):
+        for covergroup, group in coverage_summary(parse_coverage_report(coverage_report))['covergroups'].items():
+            coverpoints.extend((covergroup, coverpoint, point['covered'], point['total'], point['percent'])
+                               for coverpoint, point in group['coverpoints'].items())
+    return {
+        'timestamp': time.time(), 'design': design, 'test': test, 'seed': seed,
+        'status': status or (summary['status'] if summary else "error"), 'source': source, 'wall_s': wall_s,
+        'attempts': attempts, 'returncode': returncode,
+        'tests_passed': summary['passed'] if summary else None, 'tests_failed': summary['failed'] if summary else None,
+        'uvm_errors': summary['severities']['UVM_ERROR'] if summary else None,
+        'uvm_fatals': summary['severities']['UVM_FATAL'] if summary else None,
+        'log': log, 'coverage': coverpoints, 'timings': timings or [],
+    }
+
+def store_results(db_file, records):
+    """
+    Function to insert runs of run_record into the results store. The rows are inserted with executemany in transactions of
+    RESULTS_BATCH runs, so a regression of thousands of runs costs a few commits.
+    parameters:
+    db_file: The SQLite database, created if needed.
+    records: The list of run dicts.
+    """
+    # sqlite3 is only needed when results are stored or queried
+    import sqlite3
+
+    os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
+    conn = sqlite3.connect(db_file, isolation_level=None)
+    try:
+        conn.executescript(RESULTS_SCHEMA)
+        for start in range(0, len(records), RESULTS_BATCH):
+            # The ids are assigned here, so the coverage and timing rows go in with executemany as well
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                first_id = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM runs").fetchone()[0]
+                runs, coverage, timings = [], [], []
+                for run_id, record in enumerate(records[start:start + RESULTS_BATCH], first_id):
+                    runs.append((run_id, record['timestamp'], record['design'], record['test'], record['seed'], record['status'],
+                                 record['source'], record['wall_s'], record['attempts'], record['returncode'], record['tests_passed'],
+                                 record['tests_failed'], record['uvm_errors'], record['uvm_fatals'], record['log']))
+                    coverage.extend((run_id,) + tuple(point) for point in record['coverage'])
+                    timings.extend((run_id, timing['stage'], timing['wall_s'], timing['cpu_s']) for timing in record['timings'])
+                conn.executemany("INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", runs)
+                conn.executemany("INSERT INTO coverage VALUES (?, ?, ?, ?, ?, ?)", coverage)
+                conn.executemany("INSERT INTO timings VALUES (?, ?, ?, ?)", timings)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+    finally:
+        conn.close()
+
+# The questions of the query subcommand. Every query reads the runs as r, {where} is replaced by the filters of the command line.
+RESULTS_QUERIES = {
+    'runs': "SELECT r.timestamp, r.design, r.test, r.seed, r.status, r.wall_s, r.log FROM runs r {where} "
+            "ORDER BY r.timestamp DESC LIMIT :limit",
+    'failures': "SELECT r.timestamp, r.design, r.test, r.seed, r.status, r.uvm_errors, r.uvm_fatals, r.log FROM runs r "
+                "{where} AND r.status != 'passed' ORDER BY r.timestamp DESC LIMIT :limit",
+    'summary': "SELECT r.design, r.test, COUNT(*) AS runs, SUM(r.status = 'passed') AS passed, SUM(r.status != 'passed') AS failed, "
+               "MAX(r.timestamp) AS timestamp FROM runs r {where} GROUP BY r.design, r.test ORDER BY r.design, r.test",
+    'coverage': "SELECT date(r.timestamp, 'unixepoch', 'localtime') AS day, r.design, c.covergroup, COUNT(DISTINCT r.id) AS runs, "
+                "ROUND(100.0 * SUM(c.covered) / MAX(SUM(c.total), 1), 2) AS percent FROM coverage c JOIN runs r ON r.id = c.run_id "
+                "{where} GROUP BY day, r.design, c.covergroup ORDER BY day, r.design, c.covergroup",
+    'coverpoints': "SELECT r.design, c.covergroup, c.coverpoint, COUNT(*) AS runs, ROUND(AVG(c.percent), 2) AS mean_percent, "
+                   "ROUND(MAX(c.percent), 2) AS best_percent FROM coverage c JOIN runs r ON r.id = c.run_id {where} "
+                   "GROUP BY r.design, c.covergroup, c.coverpoint ORDER BY r.design, c.covergroup, c.coverpoint",
+    'timings': "SELECT t.stage, COUNT(*) AS samples, ROUND(AVG(t.wall_s), 4) AS mean_wall_s, ROUND(MAX(t.wall_s), 4) AS max_wall_s, "
+               "ROUND(AVG(t.cpu_s), 4) AS mean_cpu_s FROM timings t JOIN runs r ON r.id = t.run_id {where} "
+               "GROUP BY t.stage ORDER BY mean_wall_s DESC",
+}
+
+def parse_since(since):
+    """
+    Function to turn a --since value into a unix time: a duration back from now like 7d, 12h or 30m, or an ISO date or time.
+    parameters:
+    since: The value.
+    """
+    m = re.fullmatch(r'(\d+(?:\.\d+)?)([dhm])', since.strip())
+    if m:
+        return time.time() - float(m.group(1)) * {'d': 86400, 'h': 3600, 'm': 60}[m.group(2)]
+    from datetime import datetime
+    return datetime.fromisoformat(since.strip()).timestamp()
+
+def query_results(db_file, question, design=None, test=None, seed=None, status=None, since=None, limit=50):
+    """
+    Function to answer one of RESULTS_QUERIES from the results store. Returns the column names and the rows.
+    parameters:
+    db_file: The SQLite database.
+    question: A key of RESULTS_QUERIES.
+    design, test, seed, status: Filters on the runs, None for no filter.
+    since: Only runs from this unix time on, None for all of them.
+    limit: The maximum number of rows of the run lists.
+    """
+    import sqlite3
+
+    filters = {'design': design, 'test': test, 'seed': seed, 'status': status}
+    conditions = [f"r.{column} = :{column}" for column, value in filters.items() if value is not None]
+    if since is not None:
+        conditions.append("r.timestamp >= :since")
+    where = "WHERE " + " AND ".join(conditions or ["1"])
+    # Read only, a query never creates the database
+    conn = sqlite3.connect(f"file:{os.path.abspath(db_file)}?mode=ro", uri=True)
+    try:
+        cursor = conn.execute(RESULTS_QUERIES[question].format(where=where), dict(filters, since=since, limit=limit))
+        return [column[0] for column in cursor.description], cursor.fetchall()
+    finally:
+        conn.close()
+
+def query_main(argv):
+    """
+    The main function of the results store queries.
+    Usage: python generate_uvm_tb.py query <runs|failures|summary|coverage|coverpoints|timings> [--design D] [--since 7d] [--json]
+    parameters:
+    argv: The command line arguments following the query keyword.
+    """
+    parser = argparse.ArgumentParser(prog="generate_uvm_tb.py query", description="Query the stored regression and run results.")
+    parser.add_argument("question", choices=list(RESULTS_QUERIES),
+                        help="runs, failures, summary (pass/fail per test), coverage (trend per covergroup and day), "
+                             "coverpoints or timings (per stage)")
+    parser.add_argument("--db", default=RESULTS_DB, help="The results database")
+    parser.add_argument("--design", help="Only runs of this design module")
+    parser.add_argument("--test", help="Only runs of this UVM test")
+    parser.add_argument("--seed", type=int, help="Only runs with this seed")
+    parser.add_argument("--status", help="Only runs with this status (passed, failed, error, timeout)")
+    parser.add_argument("--since", help="Only runs since a duration like 7d, 12h, 30m or an ISO date")
+    parser.add_argument("--limit", type=int, default=50, help="Maximum rows of the run lists")
+    parser.add_argument("--json", action="store_true", help="Print the rows as JSON")
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.db):
+        print(f"No results database {args.db}, run a regression or the run path first")
+        sys.exit(1)
+    try:
+        since = parse_since(args.since) if args.since else None
+    except ValueError:
+        parser.error(f"Invalid --since {args.since!r}, use e.g. 7d, 12h, 30m or 2026-10-01")
+
+    start = time.perf_counter()
+    columns, rows = query_results(args.db, args.question, args.design, args.test, args.seed, args.status, since, args.limit)
+    elapsed = time.perf_counter() - start
+    if args.json:
+        print(json.dumps([dict(zip(columns, row)) for row in rows], indent=2))
+        return
+
+    # Aligned columns with readable timestamps
+    cells = [[time.strftime("%Y-%m-%d %H:%M", time.localtime(value)) if column == "timestamp" and value is not None
+              else "" if value is None else f"{value:.3g}" if isinstance(value, float) else str(value)
+              for column, value in zip(columns, row)] for row in rows]
+    widths = [max([len(column)] + [len(row[i]) for row in cells]) for i, column in enumerate(columns)]
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)).rstrip())
+    for row in cells:
+        print("  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip())
+    print(f"\n{len(rows)} row(s) in {elapsed * 1000:.1f} ms")
+
+def watch_snapshot(targets, pattern="*.sv"):
+    """
+    Function to return the modification time and size of every watched design file as a dict of path to (mtime_ns, size).
+    parameters:
+    targets: The list of design files, directories and glob patterns.
+    pattern: The file name pattern used inside directories.
+    """
+    snapshot = {}
+    for path in expand_paths(targets, pattern):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+def watch_regenerate(path, design_type, output_dir, components=None, tb_profile="readable"):
+    """
+    Function to scan one changed design file and regenerate the components whose inputs changed. Prints the files and the latency.
+    parameters:
+    path: The sv design file.
+    design_type: The design type used for every watched design.
+    output_dir: The directory the generated files are written to.
+    components: The components to generate. Defaults to all of them.
+    tb_profile: The style of the driver, monitor and scoreboard, see TB_PROFILES.
+    """
+    start = time.perf_counter()
+    try:
+        # The watcher is resident and a single design parses in far less time than the cache would save, so it is not used here
+        ir = design_ir(path, cache_dir=None)
+        written = uvm_framework_files_gen(ir.name, ir.ports, design_type, ir.interface_name,
+                                          GenerationOptions(output_dir=output_dir, verbose=False, design_file=path, components=components,
+                                                            tb_profile=tb_profile, parameters=ir.parameters))
+    except Exception as e:
+        print(f"[FAILED] {path}: {type(e).__name__}: {e}")
+        return
+    latency = (time.perf_counter() - start) * 1e3
+    print(f"[{time.strftime('%H:%M:%S')}] {path}: {len(written)} file(s) regenerated in {latency:.1f} ms"
+          + (f" ({', '.join(written)})" if written else ""))
+
+def watch_designs(targets, design_type="basic_framework", output_dir=".", interval=0.1, debounce=0.2, pattern="*.sv",
+                  components=None, tb_profile="readable", max_events=None):
+    """
+    Function that stays resident and regenerates the testbench of a design whenever its file is saved.
+    The files are polled with os.stat, a burst of saves is handled once after the file was quiet for the debounce time,
+    and only the changed files are scanned again. Runs until interrupted or until max_events bursts were handled.
+    parameters:
+    targets: The list of design files, directories and glob patterns. New files in the directories are picked up.
+    design_type: The design type used for every watched design.
+    output_dir: The directory the generated files are written to.
+    interval: The polling interval in seconds.
+    debounce: The quiet time in seconds after the last change of a file before it is regenerated.
+    pattern: The file name pattern used inside directories.
+    components: The components to generate. Defaults to all of them.
+    tb_profile: The style of the driver, monitor and scoreboard, see TB_PROFILES.
+    max_events: Stops after this many handled bursts. None watches forever.
+    """
+    # Every design is brought up to date once at the start, the manifest makes this cheap for the unchanged ones
+    snapshot = watch_snapshot(targets, pattern)
+    for path in snapshot:
+        watch_regenerate(path, design_type, output_dir, components, tb_profile)
+    print(f"Watching {len(snapshot)} design file(s). Press Ctrl+C to stop.")
+
+    pending = {}
+    events = 0
+    while max_events is None or events < max_events:
+        time.sleep(interval)
+        current = watch_snapshot(targets, pattern)
+        now = time.monotonic()
+        for path, state in current.items():
+            if snapshot.get(path) != state:
+                pending[path] = now
+        for path in snapshot.keys() - current.keys():
+            pending.pop(path, None)
+            print(f"{path} was removed.")
+        snapshot = current
+
+        # A burst of saves restarts the quiet time of the file, so it is regenerated once after the last save
+        ready = sorted(path for path, seen in pending.items() if now - seen >= debounce)
+        for path in ready:
+            del pending[path]
+            watch_regenerate(path, design_type, output_dir, components, tb_profile)
+        if ready:
+            events += 1
+
+def watch_main(argv):
+    """
+    The main function of the watch mode.
+    Usage: python generate_uvm_tb.py watch <files|directories|globs...> [-t design_type] [-o output_dir] [--debounce S]
+    parameters:
+    argv: The command line arguments following the watch keyword.
+    """
+    parser = argparse.ArgumentParser(prog="generate_uvm_tb.py watch", description="Regenerate testbenches whenever their designs are saved.")
+    parser.add_argument("targets", nargs="+", help="Design files, directories or glob patterns to watch")
+    parser.add_argument("-t", "--design-type", default="basic_framework", help="The design type used for every design")
+    parser.add_argument("-o", "--output-dir", default=".", help="Directory for the generated testbenches")
+    parser.add_argument("--interval", type=float, default=0.1, help="Polling interval in seconds")
+    parser.add_argument("--debounce", type=float, default=0.2, help="Quiet time in seconds after the last save before regenerating")
+    parser.add_argument("--pattern", default="*.sv", help="File name pattern used inside directories")
+    parser.add_argument("--only", metavar="COMPONENTS", help=f"Comma separated components to generate ({','.join(COMPONENT_GENERATORS)})")
+    parser.add_argument("--tb-profile", choices=TB_PROFILES, default=TB_PROFILES[0], help="Style of the driver, monitor and scoreboard")
+    args = parser.parse_args(argv)
+    try:
+        components = select_components(args.only)
+    except ValueError as e:
+        parser.error(str(e))
+
+    try:
+        watch_designs(args.targets, args.design_type, args.output_dir, args.interval, args.debounce, args.pattern, components, args.tb_profile)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
+def index_main(argv):
+    """
+    The main function of the design index. Scans the files of filelists and lists their modules and interfaces.
+    Usage: python generate_uvm_tb.py index <filelists|files...> [-j N] [--json FILE]
+    parameters:
+    argv: The command line arguments following the index keyword.
+    """
+    parser = argparse.ArgumentParser(prog="generate_uvm_tb.py index",
+                                     description="Index the modules and interfaces of filelists, rescanning only the changed files.")
+    parser.add_argument("targets", nargs="+", help=".f filelists or sv source files")
+    parser.add_argument("-j", "--workers", type=int, help="Worker processes for scanning many files (default: number of cores)")
+    parser.add_argument("--json", help="Write the modules and interfaces with their files and ports as JSON")
+    args = parser.parse_args(argv)
+
+    files = [path for target in args.targets for path in (read_filelist(target) if target.endswith(".f") else [target])]
+    try:
+        index = design_index(files, workers=args.workers, verbose=True)
+    except OSError as e:
+        print(e)
+        sys.exit(1)
+
+    # One line per unit, the modules with the interface the generator would pick for them
+    interfaces = [(path, unit['name']) for path, entry in index.items() for unit in entry['units'] if unit['kind'] == "interface"]
+    symbols = []
+    for path, entry in index.items():
+        for unit in entry['units']:
+            symbol = {'kind': unit['kind'], 'name': unit['name'], 'file': path, 'ports': unit['ports']}
+            if unit['kind'] == "module":
+                symbol['interface'] = resolve_interface(unit['name'], path, interfaces)
+            symbols.append(symbol)
+            print(f"  {unit['kind']:<9} {unit['name']:<24} {len(unit['ports']):>5} ports  {os.path.relpath(path)}"
+                  + (f"  (interface {symbol['interface']})" if symbol.get('interface') else ""))
+    print(f"\nIndex: {len(index)} file(s), {sum(1 for symbol in symbols if symbol['kind'] == 'module')} module(s), {len(interfaces)} interface(s)")
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(symbols, file, indent=2)
+        print(f"{args.json} has been created.")
+
+# The subcommands with their own argument parsing. Everything else is the single design usage.
+SUBCOMMANDS = {
+    'batch': batch_main,
+    'regress': regress_main,
+    'coverage': coverage_main,
+    'logs': logs_main,
+    'watch': watch_main,
+    'index': index_main,
+    'query': query_main,
+}
+
+def main():
+    """
+    The very main function that executes all the neccesary functions
+    """
+
+    # The subcommands have their own argument parsing
+    if (len(sys.argv) > 1 and sys.argv[1] in SUBCOMMANDS):
+        SUBCOMMANDS[sys.argv[1]](sys.argv[2:])
+        return
+
+    # Check for the arguments entered in the console
+    parser = argparse.ArgumentParser(
+        prog="generate_uvm_tb.py",
+        usage="python generate_uvm_tb.py <sv_module> <design_type> [--force] [--only driver,monitor,tb] [--timings [JSON]] [--profile [PSTATS]]",
+        epilog="The last argument is optional. Suppoted desgin type for this build: Adder, ALU. Use 'run' as design type to simulate. "
+               "Batch mode: python generate_uvm_tb.py batch <directory|glob|filelist> [design_type] [-j N] [-o output_dir]. "
+               "Regression: python generate_uvm_tb.py regress <sv_module> [--tests T1,T2] [--seeds N] [-j N] [--shards N [--shard K]]. "
+               "Coverage merge: python generate_uvm_tb.py coverage <reports...> [--json FILE] [--csv FILE]. "
+               "Log analysis: python generate_uvm_tb.py logs <logs...> [-j N] [--json FILE]. "
+               "Watch mode: python generate_uvm_tb.py watch <files|directories...> [-t design_type] [-o output_dir]. "
+               "Design index: python generate_uvm_tb.py index <filelists|files...> [-j N] [--json FILE]. "
+               "Results: python generate_uvm_tb.py query <runs|failures|summary|coverage|coverpoints|timings> [--design D] [--since 7d]")
+    parser.add_argument("sv_module", help="The sv design file or a .f filelist")
+    parser.add_argument("design_type", nargs="?", default="basic_framework", help="Adder, ALU or run")
+    parser.add_argument("--top", help="The top module, searched in all the files of the filelist (default: the first module)")
+    parser.add_argument("--force", action="store_true", help="Regenerate even if the testbench is up to date, with run: recompile every unit")
+    parser.add_argument("--only", metavar="COMPONENTS", help=f"Comma separated components to generate ({','.join(COMPONENT_GENERATORS)})")
+    parser.add_argument("--timings", nargs="?", const="", metavar="JSON",
+                        help="Write the wall and CPU time of every stage to a JSON report (default: <module>_timings.json)")
+    parser.add_argument("--profile", nargs="?", const="", metavar="PSTATS",
+                        help="Run under cProfile and write the statistics (default: <module>.pstats)")
+    parser.add_argument("--compile-cmd", help="Compile everything into the work library with this template ({module}) instead of "
+                                              "compiling only the changed units into a library per design")
+    parser.add_argument("--lib-cmd", default=COMPILE_LIB_CMD, help="Library command template of the incremental compile ({lib})")
+    parser.add_argument("--unit-cmd", default=COMPILE_UNIT_CMD, help="Unit command template of the incremental compile ({lib}, {source}, {module})")
+    parser.add_argument("--sim-cmd", default=SIM_SESSION_CMD, help="Simulator command template of the run path ({module}, {lib}, {do_file})")
+    parser.add_argument("--session", choices=["do", "stdin"], default="do", help="Send the simulator commands as a do script or through stdin")
+    parser.add_argument("--results-db", default=RESULTS_DB, help="Store the outcome, coverage and timings of the run path here ('' to disable)")
+    parser.add_argument("--diagram", metavar="FORMATS", default="pdf",
+                        help=f"Comma separated hierarchy diagram formats of the run path ({','.join(HIERARCHY_FORMATS)}, default: pdf)")
+    parser.add_argument("--tb-profile", choices=TB_PROFILES, default=TB_PROFILES[0],
+                        help="Style of the driver, monitor and scoreboard: readable (default) or throughput for long regressions")
+    parser.add_argument("--shared-lib", action="store_true",
+                        help=f"Write the shared {SHARED_BASE_PKG}.sv and generate the sequencer, agent, env and test as thin specializations")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--stdout", action="store_true", help="Stream the generated files to stdout instead of writing them")
+    output.add_argument("--archive", metavar="FILE", help="Write the generated files into one .tar, .tar.gz, .tgz or .zip archive")
+    parser.add_argument("--vectors", type=int, default=0, metavar="N",
+                        help="Precompute N stimulus vectors and the expected outputs with NumPy into $readmemh files")
+    parser.add_argument("--vector-seed", type=int, default=1, help="Seed of the stimulus vectors")
+    parser.add_argument("--plan-coverage", action="store_true",
+                        help="Write a near minimal directed stimulus that closes the input coverage instead of random vectors")
+    parser.add_argument("--cross", metavar="PAIRS", help="Crosses of the coverage plan: 'all' or input pairs like a:b,op1:opcode")
+    parser.add_argument("--auto-bin-max", type=int, default=COVERAGE_AUTO_BIN_MAX, help="Maximum automatic bins of a coverpoint")
+    args = parser.parse_args()
+    try:
+        components = select_components(args.only)
+        args.diagram = select_formats(args.diagram)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # The generated files own the standard output with --stdout, the messages go to the standard error then
+    messages = sys.stderr if args.stdout else sys.stdout
+    # The run path always times its stages for the results store
+    timings = [] if args.timings is not None or (args.design_type.lower() == "run" and args.results_db) else None
+    # A design without a module, an unknown --top or a width the vectors cannot resolve is reported like the argument errors
+    try:
+        if args.profile is None:
+            module_name = run_single(args, components, timings)
+        else:
+            import cProfile
+            profiler = cProfile.Profile()
+            module_name = profiler.runcall(run_single, args, components, timings)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.profile is not None:
+        pstats_file = args.profile or f"{module_name}.pstats"
+        profiler.dump_stats(pstats_file)
+        print(f"{pstats_file} has been created.", file=messages)
+
+    if args.timings is not None:
+        write_timings(args.timings or f"{module_name}_timings.json", timings, sys.argv, stream=messages)
+
+def run_single(args, components, timings):
+    """
+    Function to generate or run the testbench of a single design as requested on the command line. Returns the module name.
+    parameters:
+    args: The parsed command line arguments.
+    components: The components to generate.
+    timings: A list that collects the time of every stage, or None.
+    """
+
+    # Calling the function that will return Module name, ports with their respective width and directions, and interface name.
+    with stage_timer(timings, "parse"):
+        # A filelist or a top module goes through the index, which resolves the interface across the files
+        design_file = args.sv_module
+        if args.sv_module.endswith(".f") or args.top:
+            files = read_filelist(args.sv_module) if args.sv_module.endswith(".f") else [args.sv_module]
+            ir, design_file = index_design_ir(design_index(files), args.top)
+        else:
+            # The IR is cached next to the generated files, so running again on the same design skips the parsing
+            ir = design_ir(args.sv_module, ir_cache_dir(args.archive or "."))
+        module_name, ports, interface_name, parameters = ir.name, ir.ports, ir.interface_name, ir.parameters
+    
+    #Check for 3rd argument that takes design type. If no 3rd argument, the basic framework will be selected
+    if (args.design_type.lower() == "run"):
+        simulated = code_compilation(module_name, timings, args.compile_cmd, args.sim_cmd, args.session, args.lib_cmd, args.unit_cmd,
+                                     args.force)
+        uvm_hierarchy(module_name, timings, args.diagram)
+        # The outcome, coverage and stage timings of the run go to the results store. Logs of an earlier run are not used.
+        if args.results_db:
+            store_results(args.results_db, [run_record(module_name, f"{module_name}_test", None, None if simulated else "error",
+                                                       f"{module_name}_sim.log" if simulated else None,
+                                                       f"{module_name}_coverage_report.txt" if simulated else None, timings,
+                                                       wall_s=next((timing['wall_s'] for timing in timings if timing['stage'] == "vsim"),
+                                                                   None))])
+            print(f"Run stored in {args.results_db}")
+    else:
+        # The directed stimulus of the coverage plan replaces the random vectors
+        coverage_plan = None
+        if args.plan_coverage:
+            with stage_timer(timings, "plan"):
+                coverage_plan = plan_coverage(ports, args.design_type, args.cross, args.auto_bin_max, args.vector_seed, parameters)
+            # The report stays out of the stream of the files
+            coverage_plan_report(coverage_plan, stream=sys.stderr if args.stdout else None)
+        # The files go to the current directory unless they are streamed or archived
+        sink = StdoutSink() if args.stdout else ArchiveSink(args.archive) if args.archive else DirectorySink(".")
+        with sink:
+            if args.shared_lib and not sink.incremental:
+                sink.write(f"{SHARED_BASE_PKG}.sv", base_pkg_gen())
+            # The funntion responsible for generating UVM files
+            uvm_framework_files_gen(module_name, ports, args.design_type, interface_name,
+                                    GenerationOptions(design_file=design_file, force=args.force, components=components, timings=timings,
+                                                      vectors=args.vectors, vector_seed=args.vector_seed, parameters=parameters,
+                                                      coverage_plan=coverage_plan, tb_profile=args.tb_profile,
+                                                      shared_lib="." if args.shared_lib else None, verbose=not args.stdout, sink=sink))
+        if args.archive:
+            print(f"{args.archive} has been created.")
+    return module_name
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,488 @@
+"""
+Regression tests for generate_uvm_tb.py. Run with: python -m pytest -q
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import generate_uvm_tb as uvm
+
+def test_banner_rule_does_not_hide_failures(tmp_path):
+    # A dashed banner is not a transaction table, the messages after it must still be counted
+    log = tmp_path / "banner.log"
+    log.write_text("# ----------------------------------------\n"
+                   "UVM_ERROR tb.sv(10) @ 50: reporter [SCB] TEST FAILED\n"
+                   "TEST PASSED\n")
+    summary = uvm.analyze_sim_log(str(log))
+    assert summary['status'] == "failed"
+    assert summary['failed'] == 1
+    assert summary['passed'] == 1
+    assert summary['severities']['UVM_ERROR'] == 1
+    assert summary['first_failure']['line'] == 2
+    assert summary['first_failing_transaction'] is None
+
+def test_failure_keeps_last_transaction_table(tmp_path):
+    table = ["---------------------------------------",
+             "Name      Type          Size  Value",
+             "---------------------------------------",
+             "req       add_seq_item  -     @1",
+             "  a       integral      4     'h3",
+             "---------------------------------------"]
+    log = tmp_path / "table.log"
+    log.write_text("UVM_INFO tb.sv(5) @ 10: driver [DRV] Sent transaction to DUT\n" + "\n".join(table) + "\n"
+                   "UVM_ERROR tb.sv(10) @ 20: scoreboard [SCB] TEST FAILED\n")
+    summary = uvm.analyze_sim_log(str(log))
+    assert summary['status'] == "failed"
+    assert summary['first_failing_transaction'] == table
+    assert summary['transactions']["Sent transaction to DUT"] == 1
+
+# A clocked adder with an active low reset and its interface
+CLOCKED_ADDER = ("module add(input clk, input rst_n, input [3:0] a, input [3:0] b, output [4:0] y);\n    assign y = a + b;\nendmodule\n"
+                 "interface add_if();\n    logic clk;\n    logic rst_n;\n    logic [3:0] a;\n    logic [3:0] b;\n    logic [4:0] y;\n"
+                 "endinterface\n")
+
+def sampled_vectors(files, count):
+    """
+    A cycle model of the generated driver and monitor of a clocked design. The driver assigns item k with nonblocking assignments
+    on edge k + 1, so an edge sees the inputs of the edge before it. The monitor samples once per edge after the edges it skips.
+    Returns the index of the vector every sample of the monitor sees, None before the first drive.
+    """
+    driver, monitor = files["add_driver.sv"], files["add_monitor.sv"]
+    loop = driver[driver.index("get_next_item"):driver.index("item_done")]
+    assert loop.index("@(posedge vif.clk);") < loop.index("vif.a <= req.a;")
+    skipped = monitor[monitor.index("task run_phase"):monitor.index("forever begin")].count("@(posedge vif.clk);")
+    # Sample n is taken on edge skipped + n + 1 and sees the item driven on the edge before it
+    return [skipped + n - 1 if skipped + n >= 1 else None for n in range(count)]
+
+def check_vectors(files):
+    # Compares the expected file with the outputs of the adder for the inputs every sample sees
+    a, b, expected = ([int(value, 16) for value in files[name].split()] for name in ("add_a.hex", "add_b.hex", "add_y_exp.hex"))
+    mismatches = 0
+    for n, item in enumerate(sampled_vectors(files, len(expected))):
+        sampled = (a[item] + b[item]) & 0x1F if item is not None else None
+        mismatches += sampled != expected[n]
+    return mismatches
+
+def test_vectors_line_up_with_samples():
+    # The default readable profile drives in zero time, vector mode uses the synchronized driver and monitor instead
+    files = uvm.generate(source=CLOCKED_ADDER, design_type="Adder", vectors=8)
+    assert "#10;" not in files["add_monitor.sv"]
+    assert sampled_vectors(files, 8) == list(range(8))
+    assert check_vectors(files) == 0
+    # The active low reset is held deasserted for every vector
+    assert "req.rst_n = 1;" in files["add_sequence.sv"]
+
+def test_clocked_throughput_vectors_line_up():
+    files = uvm.generate(source=CLOCKED_ADDER, design_type="Adder", tb_profile="throughput", vectors=8)
+    assert check_vectors(files) == 0
+
+def test_throughput_top_drives_clock_and_reset():
+    # The driver and monitor block on the clock and the reset release, so the generated top has to produce both
+    files = uvm.generate(source=CLOCKED_ADDER, design_type="Adder", tb_profile="throughput")
+    top = files["add_tb.sv"]
+    assert "vif.clk = 0;" in top and "forever #5 vif.clk = ~vif.clk;" in top
+    assert top.index("vif.rst_n = 0;") < top.index("@(negedge vif.clk);") < top.index("vif.rst_n = 1;")
+    for component in ("add_driver.sv", "add_monitor.sv"):
+        assert "wait (vif.rst_n === 1'b1);" in files[component]
+    assert "vif.rst_n <=" not in files["add_driver.sv"] and "vif.clk <=" not in files["add_driver.sv"]
+    # The readable top is left as it was
+    assert "forever #5" not in uvm.generate(source=CLOCKED_ADDER, design_type="Adder")["add_tb.sv"]
+
+def test_stdout_stream_holds_only_the_files(tmp_path):
+    # The coverage plan report and the messages of --timings go to the standard error, the stream stays a clean testbench
+    design = tmp_path / "add.sv"
+    design.write_text("module add(input [3:0] a, input [3:0] b, output [4:0] y);\n    assign y = a + b;\nendmodule\n")
+    result = subprocess.run([sys.executable, os.path.abspath(uvm.__file__), "add.sv", "Adder", "--stdout", "--plan-coverage",
+                             "--timings"], cwd=tmp_path, capture_output=True, text=True, check=True)
+    assert result.stdout.startswith("// ===== ")
+    assert "Coverage plan" not in result.stdout and "has been created" not in result.stdout
+    assert "Coverage plan" in result.stderr and "add_timings.json has been created." in result.stderr
+
+def test_batch_ir_cache_next_to_output(tmp_path, monkeypatch):
+    # The workers cache the IR under the output root, nothing is written to the current directory
+    design = tmp_path / "add.sv"
+    design.write_text("module add(input [3:0] a, input [3:0] b, output [4:0] y);\n    assign y = a + b;\nendmodule\n")
+    cwd = tmp_path / "cwd"
+    cwd.mkdir()
+    monkeypatch.chdir(cwd)
+    results = uvm.batch_generate([str(design)], "Adder", str(tmp_path / "out"), workers=1)
+    assert [ok for sv_module, ok, message in results] == [True]
+    assert (tmp_path / "out" / uvm.IR_CACHE_DIR).is_dir()
+    assert not list(cwd.iterdir())
+
+def test_shared_base_pkg_resolved_from_manifest(tmp_path, monkeypatch):
+    # A batch writes the base package to the output root, the run path of a design directory finds it through the manifest
+    design = tmp_path / "add.sv"
+    design.write_text("module add(input [3:0] a, input [3:0] b, output [4:0] y);\n    assign y = a + b;\nendmodule\n")
+    monkeypatch.chdir(tmp_path)
+    uvm.batch_generate([str(design)], "Adder", "out", workers=1, shared_lib=True)
+    monkeypatch.chdir(tmp_path / "out" / "add")
+    assert uvm.compile_units("add") == [os.path.join("..", "uvmgen_base_pkg.sv"), "./add_pkg.sv", "./add_tb.sv"]
+    assert uvm.default_compile_cmd("add").startswith("vlog -sv ../uvmgen_base_pkg.sv ")
+    os.remove(tmp_path / "out" / "uvmgen_base_pkg.sv")
+    with pytest.raises(FileNotFoundError, match="uvmgen_base_pkg.sv"):
+        uvm.compile_units("add")
+
+def test_design_ir_cache_round_trip(tmp_path):
+    # The cached IR rebuilds the same plain port tuples that the parser returns
+    design = tmp_path / "alu.sv"
+    design.write_text("module alu #(parameter W = 8) (input clk, input [W-1:0] op1, input [W-1:0] op2, output [W:0] y);\n"
+                      "endmodule\ninterface alu_if();\nendinterface\n")
+    cache = tmp_path / "cache"
+    parsed = uvm.design_ir(str(design), str(cache))
+    assert len(list(cache.iterdir())) == 1
+    cached = uvm.design_ir(str(design), str(cache))
+    assert cached.ports == parsed.ports == [("input", "", "clk"), ("input", "[W-1:0]", "op1"), ("input", "[W-1:0]", "op2"),
+                                             ("output", "[W:0]", "y")]
+    assert all(type(port) is tuple for port in cached.ports)
+    assert (cached.name, cached.interface_name) == ("alu", "alu_if")
+    assert uvm.vector_ports(cached.ports, cached.parameters) == ([("op1", 8), ("op2", 8)], [("y", 9)])
+
+def test_timed_out_job_is_scheduled_first(tmp_path):
+    # A seed that timed out after 1 s ran at least that long, it must not get the 0.3 s mean of the other seeds
+    history = str(tmp_path / "history.json")
+    jobs = [{'module': "add", 'test': "add_test", 'seed': seed, 'status': status, 'attempt_s': attempt_s}
+            for seed, status, attempt_s in [(1, "passed", 0.3), (2, "failed", 0.3), (3, "timeout", 1.0), (4, "error", 0.1)]]
+    uvm.record_history(history, jobs)
+    recorded = uvm.load_history(history)
+    assert sorted(recorded) == ["add/add_test/1", "add/add_test/2", "add/add_test/3"]
+    assert recorded["add/add_test/3"]['wall_s'] >= 1.0
+    shard, = uvm.regression_jobs("add", ["add_test"], [1, 2, 3, 4], history)
+    assert shard[0]['seed'] == 3 and shard[0]['predicted_s'] >= 1.0
+
+def test_unknown_top_is_a_usage_error(tmp_path):
+    # A top module missing from the filelist and a file without a module end in the usage error, not a traceback
+    (tmp_path / "add.sv").write_text("module add(input a, output y);\nendmodule\n")
+    (tmp_path / "design.f").write_text("add.sv\n")
+    (tmp_path / "empty.sv").write_text("// no module here\n")
+    for argv in (["design.f", "Adder", "--top", "nope"], ["empty.sv", "Adder"]):
+        result = subprocess.run([sys.executable, os.path.abspath(uvm.__file__)] + argv, cwd=tmp_path, capture_output=True, text=True)
+        assert result.returncode == 2
+        assert "error:" in result.stderr and "Traceback" not in result.stderr
+
+def test_generate_takes_explicit_path_or_source(tmp_path):
+    # A path is never guessed from the text, a file name with a ";" is still a path
+    design = tmp_path / "odd;name.sv"
+    design.write_text("module add(input [3:0] a, input [3:0] b, output [4:0] y);\n    assign y = a + b;\nendmodule\n")
+    from_path = uvm.generate(design, "Adder")
+    assert from_path == uvm.generate(str(design), "Adder") == uvm.generate(source=design.read_bytes(), design_type="Adder")
+    assert "add_driver.sv" in from_path
+    for arguments in ({}, {'path': design, 'source': "module add; endmodule"}):
+        with pytest.raises(ValueError):
+            uvm.generate(**arguments)
+
+def test_generation_options_object(tmp_path):
+    # Every option travels in one GenerationOptions, only the named ones differ from the defaults
+    options = uvm.GenerationOptions(output_dir=str(tmp_path), verbose=False, components="driver,tb")
+    written = uvm.uvm_framework_files_gen("add", [("input", "[3:0]", "a"), ("output", "[3:0]", "y")], "Adder", "add_if", options)
+    assert written == ["add_driver.sv", "add_tb.sv"]
+    assert sorted(os.listdir(tmp_path)) == [uvm.MANIFEST_NAME, "add_driver.sv", "add_tb.sv"]
+    with pytest.raises(TypeError):
+        uvm.GenerationOptions(str(tmp_path))
+
+# Comments, functions, tasks, DPI imports and interface classes around the units the parser must find
+MIXED_UNITS = """// module fake(input x);
+/* module fake2(input z); */
+package p; interface class ic; endclass endpackage
+module alu #(parameter W = 8, parameter D = W*2) (input clk, input [W-1:0] a, b, output logic [W:0] y);
+  function automatic int f(input int q); return q; endfunction
+  task t(input int r); endtask
+  localparam L = 3;
+  import "DPI-C" function void c_hook(input int v);
+endmodule
+module legacy(x, y);
+  input [3:0] x;
+  output y;
+endmodule
+interface alu_if();
+  logic clk;
+  logic [7:0] a, b;
+  modport mp(input a);
+endinterface
+"""
+
+def test_single_pass_parser_units():
+    units = uvm.sv_parse_buffer(MIXED_UNITS.encode())
+    assert [(unit['kind'], unit['name']) for unit in units] == [("module", "alu"), ("module", "legacy"), ("interface", "alu_if")]
+    alu, legacy, alu_if = units
+    # The ports of the functions, tasks and DPI imports are not ports of the module
+    assert alu['ports'] == [("input", "", "clk"), ("input", "[W-1:0]", "a"), ("input", "[W-1:0]", "b"), ("output", "[W:0]", "y")]
+    assert alu['parameters'] == {'W': "8", 'D': "W*2", 'L': "3"}
+    assert legacy['ports'] == [("input", "[3:0]", "x"), ("output", "", "y")]
+    assert alu_if['signals'] == [("logic", "", "clk"), ("logic", "[7:0]", "a"), ("logic", "[7:0]", "b")]
+    # The signals are skipped on request
+    assert uvm.sv_parse_buffer(MIXED_UNITS.encode(), signals=False)[2]['signals'] == []
+
+def test_design_scan_reads_small_and_mapped_files(tmp_path, monkeypatch):
+    # The mmap path of big files gives the same result as reading the file at once
+    design = tmp_path / "alu.sv"
+    design.write_text(MIXED_UNITS)
+    scanned = uvm.design_scan(str(design))
+    monkeypatch.setattr(uvm, "SV_MMAP_THRESHOLD", 0)
+    assert uvm.design_scan(str(design)) == scanned
+    assert (scanned[0], len(scanned[1]), scanned[2]) == ("alu", 4, "alu_if")
+
+def test_manifest_skips_up_to_date_components(tmp_path):
+    # Only the components whose inputs changed or whose file is gone are rendered again
+    ports = [("input", "[3:0]", "a"), ("input", "[3:0]", "b"), ("output", "[4:0]", "y")]
+    def run(design_type="Adder", **options):
+        return uvm.uvm_framework_files_gen("add", ports, design_type, "add_if",
+                                           uvm.GenerationOptions(output_dir=str(tmp_path), verbose=False, **options))
+    assert len(run()) == len(uvm.COMPONENT_GENERATORS)
+    assert run() == []
+    os.remove(tmp_path / "add_driver.sv")
+    assert run() == ["add_driver.sv"]
+    # The sequence and scoreboard depend on the design type, the files with the same content are not rewritten
+    assert run("Subtractor") == ["add_scoreboard.sv"]
+    assert uvm.load_manifest(str(tmp_path))["add"]['inputs']['design_type'] == "Subtractor"
+    # --only renders the selected components alone and --force renders them even if they are up to date
+    assert run("Adder", components="driver,tb") == []
+    assert run("Adder", components="scoreboard,tb") == ["add_scoreboard.sv"]
+    mtime = os.stat(tmp_path / "add_tb.sv").st_mtime_ns
+    assert run("Adder", components="tb", force=True) == []
+    assert os.stat(tmp_path / "add_tb.sv").st_mtime_ns == mtime
+
+def test_force_and_only_options(tmp_path):
+    (tmp_path / "add.sv").write_text("module add(input [3:0] a, input [3:0] b, output [4:0] y);\n    assign y = a + b;\nendmodule\n")
+    def run(*argv):
+        return subprocess.run([sys.executable, os.path.abspath(uvm.__file__), "add.sv", "Adder"] + list(argv), cwd=tmp_path,
+                              capture_output=True, text=True)
+    assert run("--only", "driver,monitor").stdout.split("\n")[:2] == ["add_driver.sv has been created.", "add_monitor.sv has been created."]
+    assert "add_tb.sv" not in os.listdir(tmp_path)
+    assert "up to date" in run("--only", "driver").stdout
+    assert run("--only", "driver", "--force").stdout == "add_driver.sv is unchanged.\n"
+    result = run("--only", "nope")
+    assert result.returncode == 2 and "Unknown component(s) nope" in result.stderr
+
+def test_covering_array_covers_every_pair():
+    levels, pairs = [4, 3, 2, 5], [(0, 1), (1, 3), (2, 0)]
+    rows = uvm.covering_array(levels, pairs)
+    for i, j in pairs:
+        assert {(row[i], row[j]) for row in rows} == {(x, y) for x in range(levels[i]) for y in range(levels[j])}
+    assert all(0 <= row[param] < level for row in rows for param, level in enumerate(levels))
+    # The 3 x 5 cross is the lower bound and is reached
+    assert len(rows) == 15
+    # Without crosses every value still appears once
+    assert sorted(row[0] for row in uvm.covering_array([4, 2], [])) == [0, 1, 2, 3]
+
+def test_plan_coverage_closes_bins_with_fewer_transactions():
+    pytest.importorskip("numpy")
+    ports = [("input", "[31:0]", "a"), ("input", "[3:0]", "b"), ("output", "[32:0]", "y")]
+    plan = uvm.plan_coverage(ports, "Adder", crosses="a:b", auto_bin_max=8)
+    # A wide bus is planned on its auto_bin_max bins, never on its values
+    assert plan['coverpoints']['a']['bins'] == 8 and plan['coverpoints']['b']['bins'] == 8
+    assert plan['count'] == 64 and plan['planned_coverage'] == 100.0
+    assert plan['cross_coverage']['a:b']['hit'] == 64
+    # The expected outputs come from the golden model of the adder
+    assert list(plan['vectors']['y']) == [int(a) + int(b) for a, b in zip(plan['vectors']['a'], plan['vectors']['b'])]
+    assert plan['random_transactions'] > plan['count'] and plan['reduction'] > 1
+    with pytest.raises(ValueError):
+        uvm.plan_coverage(ports, "Adder", crosses="a:y")
+
+def coverage_report(hits_a, hits_b):
+    # A detailed text coverage report as copied from the transcript, with one type and one instance section
+    return (f"# TYPE /add_pkg/add_subscribe/cg  50.00%  100  Uncovered\n"
+            f"#     Coverpoint a  50.00%  100  Uncovered\n"
+            f"#         bin auto[0]  {hits_a}  1  Covered\n"
+            f"#         bin auto[1]  {hits_b}  1  ZERO\n"
+            f"#         ignore_bin unused  7  -  Occurred\n"
+            f"# Covergroup instance /add_pkg/add_subscribe/cg_inst  50.00%  100  Uncovered\n"
+            f"#     Coverpoint a  50.00%  100  Uncovered\n"
+            f"#         bin auto[0]  {hits_a}  1  Covered\n")
+
+def test_coverage_reports_merge_over_seeds(tmp_path):
+    import gzip
+    (tmp_path / "seed1_coverage.txt").write_text(coverage_report(3, 0))
+    with gzip.open(tmp_path / "seed2_coverage.txt.gz", 'wt') as file:
+        file.write(coverage_report(2, 0))
+    (tmp_path / "seed3_coverage.txt").write_text(coverage_report(0, 4))
+    reports = uvm.expand_paths([str(tmp_path)], "*coverage*.txt*")
+    assert len(reports) == 3
+    # The instance section is not counted twice, the hits add up over the seeds and the pool gives the same aggregate
+    coverage = uvm.merge_coverage_reports(reports)
+    assert coverage == {("/add_pkg/add_subscribe/cg", "a"): {"auto[0]": ["bin", 5, 1], "auto[1]": ["bin", 4, 1],
+                                                             "unused": ["ignore_bin", 21, 0]}}
+    assert uvm.merge_coverage_reports(reports, workers=2) == coverage
+    assert ("/add_pkg/add_subscribe/cg_inst", "a") in uvm.merge_coverage_reports(reports[:1], instances=True)
+    # The ignored bin does not count towards the coverage
+    summary = uvm.coverage_summary(uvm.merge_coverage_reports(reports[:2]), 2)
+    group = summary['covergroups']["/add_pkg/add_subscribe/cg"]
+    assert (group['covered'], group['total'], group['percent']) == (1, 2, 50.0)
+    assert uvm.coverage_summary(coverage)['covergroups']["/add_pkg/add_subscribe/cg"]['percent'] == 100.0
+
+def test_passing_log_counts_transactions_over_time(tmp_path):
+    import gzip
+    lines = [f"# UVM_INFO add_driver.sv(30) @ {10 * n} ns: uvm_test_top.env.agent.driver [DRV] Sent transaction to DUT"
+             for n in range(1, 6)]
+    lines += ["# UVM_WARNING add_tb.sv(12) @ 60 ns: reporter [TB] slow clock", "# TEST PASSED"]
+    with gzip.open(tmp_path / "sim.log.gz", 'wt') as file:
+        file.write("\n".join(lines) + "\n")
+    (tmp_path / "empty.log").write_text("")
+    summary, empty = uvm.analyze_sim_logs([str(tmp_path / "sim.log.gz"), str(tmp_path / "empty.log")], workers=2)
+    assert summary['status'] == "passed" and summary['lines'] == 7
+    assert summary['severities'] == {'UVM_INFO': 5, 'UVM_WARNING': 1, 'UVM_ERROR': 0, 'UVM_FATAL': 0}
+    assert (summary['first_time'], summary['last_time'], summary['time_unit']) == (10.0, 60.0, "ns")
+    assert summary['transactions']["Sent transaction to DUT"] == 5 and summary['transactions_per_time'] == 0.1
+    assert empty['status'] == "unknown" and empty['transactions_per_time'] is None
+
+# A stub simulator: seed 1 passes, seed 2 fails its check, seed 3 hangs and seed 4 exits with an error.
+# The log starts with the command, so the failure message is only assembled by the shell.
+STUB_SIM_CMD = "case {seed} in 1) echo 'TEST PASSED';; 2) echo TEST $(echo FAILED);; 3) sleep 10;; *) exit 3;; esac"
+
+def test_regression_runner_statuses_and_retries(tmp_path):
+    results, makespan = uvm.run_regression("add", ["add_test"], [1, 2, 3, 4], compile_cmd="true", sim_cmd=STUB_SIM_CMD, workers=4,
+                                           timeout=0.5, retries=1, log_dir=str(tmp_path / "logs"),
+                                           history_file=str(tmp_path / "history.json"))
+    jobs = {job['seed']: job for job in results}
+    assert {seed: job['status'] for seed, job in jobs.items()} == {1: "passed", 2: "failed", 3: "timeout", 4: "error"}
+    # Only simulator errors and timeouts are retried, a failing test is not
+    assert {seed: job['attempts'] for seed, job in jobs.items()} == {1: 1, 2: 1, 3: 2, 4: 2}
+    assert jobs[4]['returncode'] == 3 and jobs[3]['returncode'] is None
+    assert jobs[3]['attempt_s'] >= 0.5 and jobs[3]['wall_s'] >= 1.0
+    # The hung simulations ran concurrently with a time limit, not for 10 s each
+    assert makespan['actual_s'] < 5
+    assert "TEST FAILED" in open(jobs[2]['log']).read()
+    with pytest.raises(RuntimeError, match="Compilation failed"):
+        uvm.run_regression("add", ["add_test"], [1], compile_cmd="exit 1", sim_cmd=STUB_SIM_CMD, log_dir=str(tmp_path / "logs"),
+                           history_file=None)
+
+def test_shards_are_balanced_from_history(tmp_path):
+    history = tmp_path / "history.json"
+    times = {1: 8.0, 2: 5.0, 3: 4.0, 4: 3.0, 5: 2.0, 6: 2.0}
+    history.write_text(json.dumps({f"add/add_test/{seed}": {'wall_s': wall_s, 'runs': 1} for seed, wall_s in times.items()}))
+    shards = uvm.regression_jobs("add", ["add_test"], list(times) + [7], str(history), shards=2)
+    # Seed 7 has no history and gets the mean of the other seeds of its test
+    assert [job for shard in shards for job in shard if job['seed'] == 7][0]['predicted_s'] == 4.0
+    assert sorted(job['seed'] for shard in shards for job in shard) == list(range(1, 8))
+    assert [sum(job['predicted_s'] for job in shard) for shard in shards] == [14.0, 14.0]
+    assert all(shard[0]['predicted_s'] == max(job['predicted_s'] for job in shard) for shard in shards)
+    # Every host computes the same shards from the same history
+    assert uvm.regression_jobs("add", ["add_test"], list(times) + [7], str(history), shards=2) == shards
+
+def test_results_store_and_queries(tmp_path, monkeypatch):
+    passed_log, failed_log, report = tmp_path / "pass.log", tmp_path / "fail.log", tmp_path / "coverage.txt"
+    passed_log.write_text("# TEST PASSED\n")
+    failed_log.write_text("# UVM_ERROR add_scoreboard.sv(40) @ 30 ns: scoreboard [SCB] TEST FAILED\n")
+    report.write_text(coverage_report(3, 0))
+    records = [uvm.run_record("add", "add_test", seed, log=str(passed_log if seed != 2 else failed_log), coverage_report=str(report),
+                              source="regress", wall_s=0.5) for seed in (1, 2, 3)]
+    records.append(uvm.run_record("sub", "sub_test", 1, timings=[{'stage': "parse", 'wall_s': 0.25, 'cpu_s': 0.2}]))
+    records[0]['timestamp'] -= 10 * 86400
+    # Three transactions of two runs, the ids continue over the batches and over separate calls
+    monkeypatch.setattr(uvm, "RESULTS_BATCH", 2)
+    db = str(tmp_path / "db" / "results.sqlite")
+    uvm.store_results(db, records[:3])
+    uvm.store_results(db, records[3:])
+
+    columns, rows = uvm.query_results(db, "summary")
+    summary = [dict(zip(columns, row)) for row in rows]
+    assert [(row['design'], row['runs'], row['passed'], row['failed']) for row in summary] == [("add", 3, 2, 1), ("sub", 1, 0, 1)]
+    columns, rows = uvm.query_results(db, "failures", design="add")
+    assert [dict(zip(columns, row))['seed'] for row in rows] == [2]
+    assert dict(zip(columns, rows[0]))['uvm_errors'] == 1
+    # The run without a log is an error, the filters combine
+    assert uvm.query_results(db, "runs", status="error")[1][0][1:5] == ("sub", "sub_test", 1, "error")
+    assert len(uvm.query_results(db, "runs", design="add", since=uvm.parse_since("7d"))[1]) == 2
+    columns, rows = uvm.query_results(db, "coverpoints", design="add")
+    assert [dict(zip(columns, row)) for row in rows] == [{'design': "add", 'covergroup': "/add_pkg/add_subscribe/cg", 'coverpoint': "a",
+                                                          'runs': 3, 'mean_percent': 50.0, 'best_percent': 50.0}]
+    assert uvm.query_results(db, "timings")[1] == [("parse", 1, 0.25, 0.25, 0.2)]
+    # A query never creates a database
+    import sqlite3
+    with pytest.raises(sqlite3.OperationalError):
+        uvm.query_results(str(tmp_path / "missing.sqlite"), "runs")
+    assert not (tmp_path / "missing.sqlite").exists()
+
+def test_output_sinks_hold_the_same_files(tmp_path, capsys):
+    import tarfile
+    import zipfile
+    ports = [("input", "[3:0]", "a"), ("input", "[3:0]", "b"), ("output", "[4:0]", "y")]
+    def render(sink):
+        with sink:
+            uvm.uvm_framework_files_gen("add", ports, "Adder", "add_if", uvm.GenerationOptions(output_dir=str(tmp_path), verbose=False,
+                                                                                                 sink=sink))
+        return sink
+    files = render(uvm.MemorySink()).files
+    assert len(files) == len(uvm.COMPONENT_GENERATORS)
+    with tarfile.open(render(uvm.ArchiveSink(str(tmp_path / "tb.tar.gz"))).filename) as archive:
+        assert {member.name: archive.extractfile(member).read().decode() for member in archive} == files
+    with zipfile.ZipFile(render(uvm.ArchiveSink(str(tmp_path / "tb.zip"))).filename) as archive:
+        assert {name: archive.read(name).decode() for name in archive.namelist()} == files
+    # Only the archives are left behind, without a manifest or a temporary file
+    assert sorted(os.listdir(tmp_path)) == ["tb.tar.gz", "tb.zip"]
+    render(uvm.StdoutSink())
+    assert capsys.readouterr().out == "".join(f"// ===== {name} =====\n{content}" for name, content in files.items())
+    with pytest.raises(ValueError):
+        uvm.ArchiveSink(str(tmp_path / "tb.rar"))
+
+def test_failed_archive_is_not_published(tmp_path):
+    with pytest.raises(RuntimeError):
+        with uvm.ArchiveSink(str(tmp_path / "tb.tar")) as sink:
+            sink.write("add/add_driver.sv", "class add_driver;\nendclass\n")
+            raise RuntimeError("worker failed")
+    assert os.listdir(tmp_path) == []
+
+def test_batch_archive_groups_files_per_design(tmp_path, monkeypatch):
+    import zipfile
+    for name in ("add", "sub"):
+        (tmp_path / f"{name}.sv").write_text(f"module {name}(input [3:0] a, input [3:0] b, output [4:0] y);\nendmodule\n")
+    monkeypatch.chdir(tmp_path)
+    results = uvm.batch_generate(["add.sv", "sub.sv"], "Adder", "out", workers=1, archive="tb.zip")
+    assert [ok for sv_module, ok, message in results] == [True, True]
+    with zipfile.ZipFile("tb.zip") as archive:
+        names = archive.namelist()
+    assert "add/add_driver.sv" in names and "sub/sub_tb.sv" in names
+    assert not os.path.exists("out")
+
+def test_generate_has_no_side_effects(tmp_path, monkeypatch, capsys):
+    from concurrent.futures import ThreadPoolExecutor
+    design = tmp_path / "add.sv"
+    design.write_text("module add(input [3:0] a, input [3:0] b, output [4:0] y);\n    assign y = a + b;\nendmodule\n")
+    monkeypatch.chdir(tmp_path)
+    files = uvm.generate("add.sv", "Adder")
+    assert sorted(files) == sorted(f"add_{name}.sv" for name in uvm.COMPONENT_GENERATORS)
+    # Nothing is printed and nothing but the design is on disk, the calls are repeatable and safe from many threads
+    assert capsys.readouterr() == ("", "")
+    assert os.listdir(tmp_path) == ["add.sv"]
+    with ThreadPoolExecutor(4) as pool:
+        assert all(result == files for result in pool.map(lambda _: uvm.generate("add.sv", "Adder"), range(8)))
+    # The shared base package is returned with the files, the shared components are not
+    shared = uvm.generate("add.sv", "Adder", shared_lib=True)
+    assert f"{uvm.SHARED_BASE_PKG}.sv" in shared and "add_sequencer.sv" not in shared
+    assert sorted(uvm.generate("add.sv", "Adder", components=["tb", "driver"])) == ["add_driver.sv", "add_tb.sv"]
+    assert os.listdir(tmp_path) == ["add.sv"]
+
+def test_filelist_index_resolves_across_files(tmp_path, monkeypatch, capsys):
+    rtl = tmp_path / "rtl"
+    rtl.mkdir()
+    (rtl / "alu.sv").write_text("module alu(input [7:0] a, output [7:0] y);\nendmodule\ninterface bus();\nendinterface\n")
+    (rtl / "alu_if.sv").write_text("interface alu_if();\n    logic [7:0] a;\nendinterface\n")
+    (rtl / "lib.v").write_text("module cell(input a, output y);\nendmodule\n")
+    (rtl / "rtl.f").write_text("+incdir+inc\n-y libdir\nalu_if.sv // the interface\n${RTL_TOP}.sv\n-v lib.v\n-f ../top.f\n")
+    # The nested filelists include each other and list a file twice
+    (tmp_path / "top.f").write_text("# the top filelist\n-f rtl/rtl.f\nrtl/alu.sv\n")
+    monkeypatch.setenv("RTL_TOP", "alu")
+    files = uvm.read_filelist(str(tmp_path / "top.f"))
+    assert files == [os.path.normpath(str(rtl / name)) for name in ("alu_if.sv", "alu.sv", "lib.v")]
+
+    # The interface named after the module wins over the one of the same file
+    index_file = str(tmp_path / "cache" / "index.json")
+    index = uvm.design_index(files, index_file, workers=1, verbose=True)
+    ir, path = uvm.index_design_ir(index, "alu")
+    assert (ir.name, ir.interface_name, path) == ("alu", "alu_if", str(rtl / "alu.sv"))
+    assert uvm.index_design_ir(index)[0].name == "alu" and uvm.index_design_ir(index, "cell")[0].interface_name is None
+    with pytest.raises(ValueError, match="Module nope not found"):
+        uvm.index_design_ir(index, "nope")
+
+    # Only changed files are scanned again, a touched file with the same content is not
+    uvm.design_index(files, index_file, workers=1, verbose=True)
+    os.utime(rtl / "lib.v", ns=(1, 1))
+    uvm.design_index(files, index_file, workers=1, verbose=True)
+    (rtl / "lib.v").write_text("module cell2(input a, output y);\nendmodule\n")
+    index = uvm.design_index(files, index_file, workers=1, verbose=True)
+    assert capsys.readouterr().out.split("\n")[:4] == ["3 of 3 files scanned.", "0 of 3 files scanned.", "0 of 3 files scanned.",
+                                                       "1 of 3 files scanned."]
+    assert uvm.index_design_ir(index, "cell2")[1] == str(rtl / "lib.v")